@@ -1,24 +1,26 @@
-import requests
+import http_client
+import aiohttp
+import asyncio
 import pandas as pd
 import pandas_ta as ta
 from datetime import datetime
 import time
+import os
+from resample import resample_many, resample_candles
+from symbol_registry import registry
+from rate_limit import limiter
+from sharding import shard
+from coalesce import Coalescer
+import notifier
 
 # === TELEGRAM CONFIGURATION ===
-TELEGRAM_TOKEN = ("TOKEN")
-CHAT_ID = ("TELEGRAM_CHAT_ID")
+TELEGRAM_TOKEN = os.getenv("TOKEN")
+CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+notify = notifier.telegram(CHAT_ID, TELEGRAM_TOKEN, parse_mode="Markdown")
 
 def send_telegram_alert(message):
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": CHAT_ID,
-        "text": message,
-        "parse_mode": "Markdown"
-    }
-    try:
-        requests.post(url, data=payload)
-    except Exception as e:
-        print(f"Telegram Error: {e}")
+    # Queue mein daal do; 429 pe retry_after ke baad dobara, scan nahi rukta
+    notify.send(message)
 
 # === BITGET API CONFIG ===
 BITGET_API_URL = "https://api.bitget.com/api/v2/market/candles"
@@ -26,7 +28,7 @@ ALL_SYMBOLS_URL = "https://api.bitget.com/api/v2/market/tickers?productType=umcb
 
 def get_all_futures_symbols():
     try:
-        response = requests.get(ALL_SYMBOLS_URL)
+        response = http_client.get(ALL_SYMBOLS_URL)
         print("Raw response:", response.text)  # Debug ke liye
         data = response.json()
         symbols = [item["symbol"] for item in data["data"]]
@@ -34,32 +36,92 @@ def get_all_futures_symbols():
     except Exception as e:
         print("Symbol fetch error:", e)
         return []
-def fetch_klines(symbol: str, interval: str, limit=100):
+
+# === ASYNC SCAN CONFIG ===
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", 20))  # Ek waqt mein kitni requests
+REQUEST_TIMEOUT = 10
+CANDLE_LIMIT = 100
+BASE_LIMIT = 4 * CANDLE_LIMIT  # 1H ki itni candles se 100 4H candles banti hain
+KLINE_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume", "turnover"]
+requests_in_flight = Coalescer()  # Same (symbol, interval, limit) ki ek hi request, sync aur async dono
+
+def rows_to_df(rows):
+    df = pd.DataFrame(rows, columns=KLINE_COLUMNS)
+    df["close"] = df["close"].astype(float)
+    df["timestamp"] = pd.to_datetime(pd.to_numeric(df["timestamp"]), unit='ms')
+    return df.sort_values("timestamp").reset_index(drop=True)
+
+def klines_to_df(res):
+    if "data" in res:
+        return rows_to_df(res['data'])
+    return pd.DataFrame()
+
+def split_timeframes(res_1h):
+    # 4H candles 1H se hi banti hain, dono ek hi snapshot se
+    rows = res_1h.get("data") or []
+    if not rows:
+        return pd.DataFrame(), pd.DataFrame()
+    frames = resample_many(rows, "1H", ["1H", "4H"], limit=CANDLE_LIMIT)
+    return rows_to_df(frames["1H"]), rows_to_df(frames["4H"])
+
+def fetch_raw_klines(symbol: str, interval: str, limit=CANDLE_LIMIT):
+    return requests_in_flight.get((symbol, interval, limit), lambda: request_raw_klines(symbol, interval, limit))
+
+def request_raw_klines(symbol, interval, limit):
     try:
         params = {
             "symbol": symbol,
             "granularity": interval,
             "limit": limit
         }
-        res = requests.get(BITGET_API_URL, params=params).json()
-        if "data" in res:
-            df = pd.DataFrame(res['data'], columns=[
-                "timestamp", "open", "high", "low", "close", "volume", "turnover"
-            ])
-            df["close"] = df["close"].astype(float)
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit='ms')
-            return df[::-1].reset_index(drop=True)
-        return pd.DataFrame()
+        return http_client.get(BITGET_API_URL, params=params).json()
     except Exception as e:
         print(f"Error fetching {symbol} - {e}")
-        return pd.DataFrame()
+        return {}
 
-def analyze_symbol(symbol):
+def fetch_klines(symbol: str, interval: str, limit=CANDLE_LIMIT):
+    return klines_to_df(fetch_raw_klines(symbol, interval, limit))
+
+async def fetch_raw_klines_async(session, semaphore, symbol: str, interval: str, limit=CANDLE_LIMIT):
+    return await requests_in_flight.get_async(
+        (symbol, interval, limit), lambda: request_raw_klines_async(session, semaphore, symbol, interval, limit))
+
+async def request_raw_klines_async(session, semaphore, symbol, interval, limit):
+    params = {
+        "symbol": symbol,
+        "granularity": interval,
+        "limit": limit
+    }
     try:
-        df_1h = fetch_klines(symbol, "1H")
-        df_4h = fetch_klines(symbol, "4H")
-        df_3m = fetch_klines(symbol, "3m")
+        async with semaphore:
+            if limiter is not None:
+                await limiter.acquire_async(BITGET_API_URL, params)  # Bitget 20 req/s per endpoint
+            async with session.get(BITGET_API_URL, params=params) as response:
+                data = await response.json(content_type=None)
+                if limiter is not None:
+                    code = data.get("code") if isinstance(data, dict) else None
+                    limiter.feedback(BITGET_API_URL, response.status, code, response.headers.get("Retry-After"))
+                return data
+    except Exception as e:
+        print(f"Error fetching {symbol} - {e}")
+        return {}
 
+def analyze_symbol(symbol):
+    df_1h, df_4h = split_timeframes(fetch_raw_klines(symbol, "1H", BASE_LIMIT))
+    df_3m = fetch_klines(symbol, "3m")
+    evaluate_symbol(symbol, df_1h, df_4h, df_3m)
+
+async def analyze_symbol_async(session, semaphore, symbol):
+    # 1H (4H isi se banti hai) aur 3m ek saath fetch karo
+    res_1h, res_3m = await asyncio.gather(
+        fetch_raw_klines_async(session, semaphore, symbol, "1H", BASE_LIMIT),
+        fetch_raw_klines_async(session, semaphore, symbol, "3m"),
+    )
+    df_1h, df_4h = split_timeframes(res_1h)
+    evaluate_symbol(symbol, df_1h, df_4h, klines_to_df(res_3m))
+
+def evaluate_symbol(symbol, df_1h, df_4h, df_3m):
+    try:
         if df_1h.empty or df_4h.empty or df_3m.empty:
             return
 
@@ -98,11 +160,32 @@ def analyze_symbol(symbol):
     except Exception as e:
         print(f"Error analyzing {symbol}: {e}")
 
+async def main_async(symbols):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        await asyncio.gather(*[
+            analyze_symbol_async(session, semaphore, symbol) for symbol in symbols
+        ])
+
 def main():
-    symbols = get_all_futures_symbols()
-    for symbol in symbols:
-        analyze_symbol(symbol)
-        time.sleep(0.8)  # Respect API rate limits
+    symbols = shard.mine(get_all_futures_symbols())  # Sirf is worker ke symbols
+    start = time.time()
+    asyncio.run(main_async(symbols))
+    print(f"Scanned {len(symbols)} symbols in {time.time() - start:.1f}s")
+
+# === RUNTIME PLUGIN (runtime.py) ===
+SERIES = {"1H": ("bitget", "futures", "1H", BASE_LIMIT), "3m": ("bitget", "futures", "3m", CANDLE_LIMIT)}
+EVERY = 900
+
+def universe():
+    return registry.names("bitget", "futures")
+
+def evaluate(symbol, series):
+    base = series["1H"]
+    df_4h = resample_candles(base, "1H", "4H").tail(CANDLE_LIMIT).to_frame()
+    evaluate_symbol(symbol, base.tail(CANDLE_LIMIT).to_frame(), df_4h, series["3m"].to_frame())
 
 if __name__ == "__main__":
     main()
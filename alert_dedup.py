@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from state_store import STATE_DIR
+from resample import interval_ms
+
+# === ALERT DEDUP / COOLDOWN ===
+# Ek (strategy, symbol, direction, timeframe) ka alert ek dafa bhejne ke baad
+# cooldown tak dobara nahi jata, chahe condition har scan pe sach rahe.
+# Direction ya timeframe alag ho to woh alag key hai, is liye naya signal nahi rukta.
+# Cooldown default: timeframe ki ALERT_COOLDOWN_BARS candles (5m -> 20 min), ya
+# ALERT_COOLDOWN seconds sab ke liye. Memory mein max ALERT_DEDUP_MAX keys (LRU),
+# expired keys TTL pe nikal jati hain. ALERT_DEDUP_PERSIST=1 pe STATE_DIR mein JSON,
+# taake restart ke baad purane alerts dobara na aayen.
+ALERT_COOLDOWN = os.getenv("ALERT_COOLDOWN")
+COOLDOWN_BARS = int(os.getenv("ALERT_COOLDOWN_BARS", 4))
+DEFAULT_COOLDOWN = 3600  # Timeframe na ho / samajh na aaye to
+MAX_KEYS = int(os.getenv("ALERT_DEDUP_MAX", 10000))
+PERSIST = os.getenv("ALERT_DEDUP_PERSIST", "1") != "0"
+DEDUP_FILE = os.getenv("ALERT_DEDUP_FILE", os.path.join(STATE_DIR, "alert_dedup.json"))
+SAVE_INTERVAL = 5  # Seconds, har alert pe file nahi likhte
+
+def cooldown_for(timeframe):
+    if ALERT_COOLDOWN is not None:
+        return float(ALERT_COOLDOWN)
+    try:
+        return COOLDOWN_BARS * interval_ms(timeframe) / 1000
+    except ValueError:
+        return DEFAULT_COOLDOWN
+
+class AlertDedup:
+    def __init__(self, path=DEDUP_FILE if PERSIST else None, max_keys=MAX_KEYS):
+        self.path = path
+        self.max_keys = max_keys
+        self.expires = OrderedDict()  # "strategy|symbol|direction|tf" -> expiry (epoch seconds)
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.saved_at = 0.0
+        self.suppressed = 0
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    @staticmethod
+    def key(strategy, symbol, direction, timeframe):
+        return f"{strategy}|{symbol}|{direction}|{timeframe}"
+
+    def allow(self, strategy, symbol, direction, timeframe, cooldown=None):
+        # True = bhejo (aur cooldown shuru), False = abhi cooldown mein hai
+        key = self.key(strategy, symbol, direction, timeframe)
+        now = time.time()
+        with self.lock:
+            expires = self.expires.get(key)
+            if expires is not None and expires > now:
+                self.suppressed += 1
+                return False
+            self.expires[key] = now + (cooldown if cooldown is not None else cooldown_for(timeframe))
+            self.expires.move_to_end(key)
+            self.evict(now)
+            self.dirty = True
+        self.maybe_save(now)
+        return True
+
+    def reset(self, strategy, symbol, direction, timeframe):
+        with self.lock:
+            if self.expires.pop(self.key(strategy, symbol, direction, timeframe), None) is not None:
+                self.dirty = True
+
+    def evict(self, now):
+        # Purani (expired) keys aage hoti hain; phir bhi zyada hon to LRU
+        while self.expires:
+            key, expires = next(iter(self.expires.items()))
+            if expires > now and len(self.expires) <= self.max_keys:
+                break
+            self.expires.popitem(last=False)
+
+    def __len__(self):
+        return len(self.expires)
+
+    # --- Persistence ---
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Alert dedup load error: {e}")
+            return
+        now = time.time()
+        for key, expires in sorted(saved.items(), key=lambda item: item[1]):
+            if expires > now:
+                self.expires[key] = expires
+        self.evict(now)
+
+    def maybe_save(self, now):
+        if self.path and now - self.saved_at >= SAVE_INTERVAL:
+            self.save()
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        with self.lock:
+            snapshot = dict(self.expires)
+            self.dirty = False
+        self.saved_at = now = time.time()
+        try:
+            # Doosre scanner processes bhi isi file mein likhte hain, un ki keys mat mitao
+            try:
+                with open(self.path) as f:
+                    saved = json.load(f)
+            except (OSError, ValueError):
+                saved = {}
+            for key, expires in snapshot.items():
+                saved[key] = max(expires, saved.get(key, 0))
+            snapshot = {key: expires for key, expires in saved.items() if expires > now}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"Alert dedup save error: {e}")
+
+dedup = AlertDedup()
@@ -0,0 +1,203 @@
+import os
+import time
+import queue
+import atexit
+import threading
+import http_client
+from rate_limit import TokenBucket
+
+# === TELEGRAM ALERT QUEUE ===
+# Scanner alert bhej kar ruk-ta nahi: message queue mein jata hai aur background
+# sender threads Telegram ko bhejte hain. Telegram limits ke hisaab se do token buckets:
+# poore bot ka ~30 msg/s aur har chat ka ~1 msg/s. 429 aaye to `retry_after` tak
+# us chat ka bucket ruk jata hai aur message dobara queue mein. Metrics har
+# ALERT_METRICS_INTERVAL pe print (queue depth, latency, 429s, drops).
+# Exit pe flush utna intezar karta hai jitna sab se bhari chat ka backlog CHAT_RATE pe
+# lega (1 msg/s pe 600 alerts = 10 min), kam se kam ALERT_FLUSH_TIMEOUT aur zyada se
+# zyada ALERT_FLUSH_MAX. Is se bara backlog ek chat pe ho to scanner ko Digest use karna chahiye.
+TELEGRAM_API = "https://api.telegram.org/bot{token}/sendMessage"
+ALERT_WORKERS = int(os.getenv("ALERT_WORKERS", 4))
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", 10000))
+GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", 30))   # msg/s poore bot ke liye
+CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", 1))        # msg/s har chat
+MAX_ATTEMPTS = int(os.getenv("ALERT_MAX_ATTEMPTS", 5))
+FLUSH_TIMEOUT = float(os.getenv("ALERT_FLUSH_TIMEOUT", 300))  # Exit pe queue khali hone ka kam se kam intezar
+FLUSH_MAX = float(os.getenv("ALERT_FLUSH_MAX", 3600))  # Backlog kitna bhi ho, exit pe is se zyada nahi
+METRICS_INTERVAL = int(os.getenv("ALERT_METRICS_INTERVAL", 60))
+SEND_TIMEOUT = 10
+
+class Alert:
+    __slots__ = ("token", "chat_id", "text", "parse_mode", "queued_at", "attempts")
+
+    def __init__(self, token, chat_id, text, parse_mode=None):
+        self.token = token
+        self.chat_id = chat_id
+        self.text = text
+        self.parse_mode = parse_mode
+        self.queued_at = time.monotonic()
+        self.attempts = 0
+
+class AlertQueue:
+    def __init__(self, token=None, workers=ALERT_WORKERS, size=ALERT_QUEUE_SIZE):
+        self.token = token or os.getenv("TOKEN")
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=size)
+        self.global_bucket = TokenBucket(GLOBAL_RATE, GLOBAL_RATE)
+        self.chat_buckets = {}
+        self.pending = {}  # chat_id -> queue mein (ya bhejte hue) messages
+        self.lock = threading.Lock()
+        self.threads = []
+        self.metrics = dict(queued=0, sent=0, retried=0, rate_limited=0, failed=0, dropped=0,
+                            max_depth=0, latency_total=0.0)
+        self.reported_at = time.monotonic()
+
+    # --- Producer side (scanner) ---
+
+    def send(self, chat_id, text, parse_mode=None, token=None):
+        # Non-blocking; queue bhari ho to message drop (scan kabhi nahi rukta)
+        self.start()
+        try:
+            self.queue.put_nowait(Alert(token or self.token, chat_id, text, parse_mode))
+        except queue.Full:
+            self.count("dropped")
+            print(f"[alerts] Queue full ({self.queue.maxsize}), alert dropped: {text[:60]!r}")
+            return False
+        with self.lock:
+            self.pending[chat_id] = self.pending.get(chat_id, 0) + 1
+        self.count("queued")
+        depth = self.queue.qsize()
+        if depth > self.metrics["max_depth"]:
+            self.metrics["max_depth"] = depth
+        return True
+
+    def start(self):
+        if self.threads:
+            return
+        with self.lock:
+            if self.threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self.worker, name=f"alert-sender-{i}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+            atexit.register(self.flush)
+
+    def drain_time(self):
+        # Per-chat bucket CHAT_RATE pe, is liye sab se bhari chat hi waqt tay karti hai
+        with self.lock:
+            backlog = max(self.pending.values(), default=0)
+        return backlog / CHAT_RATE if CHAT_RATE > 0 else 0.0
+
+    def flush(self, timeout=FLUSH_TIMEOUT, max_wait=FLUSH_MAX):
+        # Short scripts (fetch_bitget) exit se pehle pending alerts bhej den
+        start = time.monotonic()
+        wait = min(max(timeout, self.drain_time()), max_wait)
+        if wait > timeout:
+            print(f"[alerts] Exit: waiting up to {wait:.0f}s for {self.queue.unfinished_tasks} queued alerts")
+        while self.queue.unfinished_tasks and time.monotonic() - start < wait:
+            time.sleep(0.1)
+        if self.queue.unfinished_tasks:
+            print(f"[alerts] Exit: {self.queue.unfinished_tasks} alerts unsent after {wait:.0f}s")
+        self.report(force=True)
+
+    # --- Sender threads ---
+
+    def chat_bucket(self, chat_id):
+        with self.lock:
+            if chat_id not in self.chat_buckets:
+                self.chat_buckets[chat_id] = TokenBucket(CHAT_RATE, 1)
+            return self.chat_buckets[chat_id]
+
+    def worker(self):
+        while True:
+            alert = self.queue.get()
+            requeued = False
+            try:
+                requeued = self.deliver(alert)  # True = retry ke liye wapas queue mein
+            except Exception as e:
+                self.count("failed")
+                print(f"[alerts] Sender error: {e}")
+            finally:
+                if not requeued:
+                    with self.lock:
+                        self.pending[alert.chat_id] -= 1
+                self.queue.task_done()
+            self.report()
+
+    def deliver(self, alert):
+        bucket = self.chat_bucket(alert.chat_id)
+        bucket.acquire()
+        self.global_bucket.acquire()
+        alert.attempts += 1
+        payload = {"chat_id": alert.chat_id, "text": alert.text}
+        if alert.parse_mode:
+            payload["parse_mode"] = alert.parse_mode
+        try:
+            response = http_client.post(TELEGRAM_API.format(token=alert.token), data=payload, timeout=SEND_TIMEOUT)
+            status = response.status_code
+        except Exception as e:
+            response, status = None, None
+            print(f"[alerts] Telegram request error: {e}")
+
+        if status == 200:
+            self.count("sent")
+            self.count("latency_total", time.monotonic() - alert.queued_at)
+            bucket.ok()
+            return
+        if status == 429:
+            # Telegram batata hai kitne seconds rukna hai; us chat ka bucket utni der band
+            self.count("rate_limited")
+            bucket.limited(retry_after(response))
+        elif status is not None and status < 500:
+            self.count("failed")
+            print(f"[alerts] Telegram rejected message ({status}): {response.text[:200]}")
+            return
+        if alert.attempts >= MAX_ATTEMPTS:
+            self.count("failed")
+            print(f"[alerts] Giving up after {alert.attempts} attempts: {alert.text[:60]!r}")
+            return
+        if status != 429:
+            time.sleep(min(30, 2 ** alert.attempts))
+        self.count("retried")
+        return self.requeue(alert)
+
+    def requeue(self, alert):
+        try:
+            self.queue.put_nowait(alert)
+            return True
+        except queue.Full:
+            self.count("dropped")
+            return False
+
+    # --- Metrics ---
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.metrics[name] += value
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.metrics)
+        stats["depth"] = self.queue.qsize()
+        stats["avg_latency"] = stats.pop("latency_total") / stats["sent"] if stats["sent"] else 0.0
+        return stats
+
+    def report(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.reported_at < METRICS_INTERVAL:
+            return
+        self.reported_at = now
+        s = self.stats()
+        if s["queued"]:
+            print(f"[alerts] depth {s['depth']} (max {s['max_depth']}), sent {s['sent']}/{s['queued']}, "
+                  f"avg latency {s['avg_latency']:.1f}s, 429s {s['rate_limited']}, retried {s['retried']}, "
+                  f"failed {s['failed']}, dropped {s['dropped']}")
+
+def retry_after(response):
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        value = response.headers.get("Retry-After")
+        return float(value) if value and value.replace(".", "", 1).isdigit() else None
+
+alerts = AlertQueue()
@@ -0,0 +1,372 @@
+import sys
+import time
+import argparse
+import numpy as np
+
+import indicators
+from candle_store import CandleStore, CANDLE_DIR
+from resample import interval_ms, resample_candles
+
+# === VECTORIZED BACKTEST ===
+# Stored candles (candle_store) ko scanners ke signal rules se replay karta hai.
+# Har rule (symbols x bars) matrices pe poori history ek saath evaluate hota hai,
+# phir har signal ka fixed TP/SL agli `horizon` candles pe simulate hota hai.
+#
+#   python backtest.py                                   (saare rules, un ka default exchange/interval)
+#   python backtest.py --rules liq_atr --interval 5m --source-interval 1m
+#   python backtest.py --synthetic 500x100000            (speed check, random walk)
+#
+# Indicators poori history pe chalte hain; scripts sirf aakhri 100 candles lete hain,
+# is liye warmup ke pehle bars pe thora farq ho sakta hai (bench_indicators dekho).
+#
+# Known limitation: 500 symbols x 100k bars pe ek core par har rule ~5-30s leta hai
+# (--synthetic mein random walk banana bhi shamil), "seconds" nahi. Waqt zyada tar
+# indicators (RSI/KDJ ke recursive filters, rolling windows) mein jata hai; TP/SL ka
+# first-hit simulate pehle hi horizon windows pe vectorized hai (any/argmax, bar-by-bar loop
+# nahi) aur kul waqt ka ~10% hai. Is se tez ke liye batches processes mein baantne honge.
+HORIZON = 12          # TP/SL na lage to itni candles baad close pe exit
+BATCH_SYMBOLS = 32    # Ek matrix mein kitne symbols (memory limit)
+TRADE_CHUNK = 500_000 # Ek waqt mein kitne signals simulate
+PERIOD = 14
+
+# --- Rules ---
+# features(c) -> dict: params pe depend na karne wale indicators, ek dafa calculate.
+# signals(c, f, p) -> [(label, entries mask, direction, tp, sl), ...] legs.
+# direction: +1 LONG, -1 SHORT. tp/sl fraction mein, None = nahi hai.
+
+def previous_volume_mean(volume, window=99):
+    # df['volume'].iloc[:-1].mean() jaisa: current candle ke pehle `window` bars ka average
+    return indicators.shift(indicators.rolling(volume, window, np.mean))
+
+def features_rsi_j(c):
+    return {
+        "rsi": indicators.rsi(c["close"], PERIOD),
+        "j": indicators.kdj(c["high"], c["low"], c["close"], PERIOD)[2],
+        "avg_volume": previous_volume_mean(c["volume"]),
+    }
+
+def volume_filter(c, f, p):
+    if not p["volume_ratio"]:
+        return True
+    return c["volume"] > p["volume_ratio"] * f["avg_volume"]
+
+def signals_rsi_kdj(c, f, p):
+    with np.errstate(invalid="ignore"):
+        entries = (f["rsi"] > p["rsi_min"]) & (f["j"] > p["j_min"]) & volume_filter(c, f, p)
+    return [("short", entries, -1, p["tp"], p["sl"])]
+
+def signals_scalp_rsi(c, f, p):
+    with np.errstate(invalid="ignore"):
+        entries = (f["rsi"] >= p["rsi_min"]) & (f["j"] > p["j_min"]) & volume_filter(c, f, p)
+    return [("short", entries, -1, p["tp"], p["sl"])]
+
+def features_liq_atr(c):
+    # liq_atr.calculate_atr candle[1]/candle[2] (open/high) ko high/low ki jagah leta hai, wahi replay
+    tr = indicators.true_range(c["open"], c["high"], c["close"])
+    return {
+        "rsi": np.round(indicators.rsi_sma(c["close"], PERIOD), 2),
+        "atr": np.round(indicators.rolling(tr, PERIOD, np.mean), 6),
+        "avg_volume": previous_volume_mean(c["volume"], 9),
+        "body_size": np.abs(c["open"] - c["high"]),  # liq_atr jaisa hi (candles[-1][1] - candles[-1][2])
+    }
+
+def signals_liq_atr(c, f, p):
+    with np.errstate(invalid="ignore"):
+        common = (c["volume"] > f["avg_volume"] * p["volume_multiplier"]) & (f["body_size"] > f["atr"] * p["atr_multiplier"])
+        short = common & (f["rsi"] >= p["rsi_overbought"])
+        long = common & (f["rsi"] <= p["rsi_oversold"])
+    liq = 0.98 / p["leverage"]  # Liquidation price tak ka fasla = stop
+    return [("short", short, -1, None, liq), ("long", long, 1, None, liq)]
+
+def features_low_short(c):
+    wick = (c["high"] - np.fmax(c["open"], c["close"])) / c["close"] * 100
+    return {
+        "rsi": indicators.rsi_sma(c["close"], PERIOD),
+        "prev_wick": indicators.shift(wick),  # Script pichli completed candle ka wick dekhta hai
+    }
+
+def signals_low_short(c, f, p):
+    with np.errstate(invalid="ignore"):
+        entries = (f["rsi"] >= p["rsi_min"]) & (f["prev_wick"] >= p["wick_min"]) & (f["prev_wick"] <= p["wick_max"])
+    return [("short", entries, -1, p["tp"], p["sl"])]
+
+def forming_macd(ts, close, target_ms, fast=12, slow=26):
+    # Har 1H bar pe 4H MACD jaisa API ki forming 4H candle ke saath dikhta:
+    # pichli completed 4H EMA + current close se ek step
+    rows, bars = close.shape
+    out = np.full((rows, bars), np.nan)
+    a_fast, a_slow = 2 / (fast + 1), 2 / (slow + 1)
+    for r in range(rows):
+        valid = ~np.isnan(close[r])
+        if not valid.any():
+            continue
+        t, x = ts[r, valid].astype(np.int64), close[r, valid]
+        bucket = t - t % target_ms
+        last_in_bucket = np.r_[np.diff(bucket) != 0, True]
+        completed = x[last_in_bucket]
+        ema_fast = indicators.ema(completed, fast)
+        ema_slow = indicators.ema(completed, slow)
+        prev = np.cumsum(last_in_bucket) - last_in_bucket - 1  # Pichli completed 4H candle ka index
+        ok = prev >= 0
+        line = np.full(len(x), np.nan)
+        pf, ps = ema_fast[prev[ok]], ema_slow[prev[ok]]
+        line[ok] = (pf + a_fast * (x[ok] - pf)) - (ps + a_slow * (x[ok] - ps))
+        out[r, valid] = line
+    return out
+
+def features_ashu(c):
+    return {
+        "rsi": np.round(indicators.rsi(c["close"], PERIOD), 2),
+        "macd_1h": indicators.macd(c["close"])[0],
+        "macd_4h": forming_macd(c["ts"], c["close"], interval_ms("4H")),
+    }
+
+def signals_ashu(c, f, p):
+    with np.errstate(invalid="ignore"):
+        long = (f["rsi"] < p["rsi_long"]) & (f["macd_1h"] > 0)
+        short = ~long & (f["rsi"] > p["rsi_short"]) & (f["macd_4h"] < 0)
+    return [("long", long, 1, p["tp"], p["sl"]), ("short", short, -1, p["tp"], p["sl"])]
+
+def features_trade_spike(c, interval="15m"):
+    # 24h ticker ka (high - low) / low; direction ka koi signal nahi is liye
+    # backtest move ke saath chalta hai (close 24h pehle se upar = LONG)
+    window = max(1, 86_400_000 // interval_ms(interval))
+    high = indicators.rolling(c["high"], window, np.max)
+    low = indicators.rolling(c["low"], window, np.min)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (high - low) / low * 100
+        rising = c["close"] > indicators.shift(c["close"], window) if c["close"].shape[1] > window else np.zeros_like(c["close"], dtype=bool)
+    return {"change": change, "rising": rising}
+
+def signals_trade_spike(c, f, p):
+    with np.errstate(invalid="ignore"):
+        spike = f["change"] >= p["price_change_threshold"]
+    return [("long", spike & f["rising"], 1, p["tp"], p["sl"]), ("short", spike & ~f["rising"], -1, p["tp"], p["sl"])]
+
+RULES = {
+    "rsi_kdj": {
+        "features": features_rsi_j, "signals": signals_rsi_kdj, "exchange": "mexc", "interval": "5m",
+        "params": {"rsi_min": 30, "j_min": 5, "volume_ratio": 0, "tp": 0.005, "sl": 0.005},
+    },
+    "scalp_rsi": {
+        "features": features_rsi_j, "signals": signals_scalp_rsi, "exchange": "mexc", "interval": "5m",
+        "params": {"rsi_min": 80, "j_min": 90, "volume_ratio": 0, "tp": 0.005, "sl": 0.005},
+    },
+    "liq_atr": {
+        "features": features_liq_atr, "signals": signals_liq_atr, "exchange": "bitget", "interval": "1m",
+        # liq_atr ke constants; module import nahi karte (notifier, dedup, candle store side effects)
+        "params": {
+            "rsi_overbought": 85, "rsi_oversold": 15,
+            "atr_multiplier": 1.5, "volume_multiplier": 2,
+            "leverage": 50,
+        },
+    },
+    "low_short": {
+        "features": features_low_short, "signals": signals_low_short, "exchange": "mexc", "interval": "5m",
+        "params": {"rsi_min": 75, "wick_min": 0.5, "wick_max": 1.5, "tp": None, "sl": None},
+    },
+    "ashu": {
+        "features": features_ashu, "signals": signals_ashu, "exchange": "bitget", "interval": "1H",
+        "params": {"rsi_long": 20, "rsi_short": 80, "tp": None, "sl": None},
+    },
+    "trade_spike": {
+        "features": features_trade_spike, "signals": signals_trade_spike, "exchange": "mexc", "interval": "15m",
+        "params": {"price_change_threshold": 2.5, "tp": None, "sl": None},  # trade_spike.PRICE_CHANGE_THRESHOLD
+    },
+}
+
+def rule_features(name, c, interval):
+    func = RULES[name]["features"]
+    return func(c, interval) if func is features_trade_spike else func(c)
+
+# --- Simulation ---
+
+def resolve(entry, future_high, future_low, exit_close, direction, tp, sl, horizon):
+    # future_*: (..., horizon) entry ke baad wali candles. Ek hi candle mein TP aur
+    # SL dono lagen to SL maante hain. Return: (pnl fractions, outcome: 1 TP, -1 SL, 0 horizon exit)
+    entry_ = entry[..., None]
+    never = np.full(entry.shape, horizon)
+    tp_at = sl_at = never
+    if tp is not None:
+        hit = future_high >= entry_ * (1 + tp) if direction > 0 else future_low <= entry_ * (1 - tp)
+        tp_at = np.where(hit.any(axis=-1), hit.argmax(axis=-1), horizon)
+    if sl is not None:
+        hit = future_low <= entry_ * (1 - sl) if direction > 0 else future_high >= entry_ * (1 + sl)
+        sl_at = np.where(hit.any(axis=-1), hit.argmax(axis=-1), horizon)
+
+    with np.errstate(invalid="ignore"):
+        pnl = direction * (exit_close / entry - 1)
+    outcome = np.zeros(entry.shape, dtype=np.int8)
+    stopped = (sl_at < horizon) & (sl_at <= tp_at)
+    took = (tp_at < horizon) & ~stopped
+    if sl is not None:
+        pnl[stopped] = -sl
+    if tp is not None:
+        pnl[took] = tp
+    outcome[stopped], outcome[took] = -1, 1
+    return pnl, outcome
+
+def future_windows(high, low, horizon):
+    high_w = np.lib.stride_tricks.sliding_window_view(high, horizon, axis=1)
+    low_w = np.lib.stride_tricks.sliding_window_view(low, horizon, axis=1)
+    return high_w, low_w
+
+def simulate(high, low, close, entries, direction, tp=None, sl=None, horizon=HORIZON, fee=0.0):
+    # Sirf signal wali candles; entry signal candle ke close pe
+    bars = close.shape[1]
+    if bars <= horizon:
+        return np.empty(0), np.empty(0, dtype=np.int8)
+    rows, cols = np.nonzero(entries[:, :bars - horizon])
+    high_w, low_w = future_windows(high, low, horizon)
+
+    pnl = np.empty(len(rows))
+    outcome = np.zeros(len(rows), dtype=np.int8)
+    for start in range(0, len(rows), TRADE_CHUNK):
+        r, t = rows[start:start + TRADE_CHUNK], cols[start:start + TRADE_CHUNK]
+        chunk_pnl, chunk_outcome = resolve(close[r, t], high_w[r, t + 1], low_w[r, t + 1],
+                                           close[r, t + horizon], direction, tp, sl, horizon)
+        pnl[start:start + len(r)] = chunk_pnl - 2 * fee
+        outcome[start:start + len(r)] = chunk_outcome
+    return pnl, outcome
+
+def bar_outcomes(high, low, close, direction, tp=None, sl=None, horizon=HORIZON, fee=0.0):
+    # Har candle pe entry maan ke (symbols x bars) pnl/outcome; sweep mein ek hi
+    # (direction, tp, sl) ke saare threshold combos isi ko mask karte hain.
+    # Jin candles ke baad `horizon` bars nahi hain un ka pnl NaN.
+    rows, bars = close.shape
+    pnl = np.full((rows, bars), np.nan)
+    outcome = np.zeros((rows, bars), dtype=np.int8)
+    if bars <= horizon:
+        return pnl, outcome
+    high_w, low_w = future_windows(high, low, horizon)
+    step = max(1, TRADE_CHUNK // max(1, rows))
+    for start in range(0, bars - horizon, step):
+        t = slice(start, min(start + step, bars - horizon))
+        f = slice(t.start + 1, t.stop + 1)
+        e = slice(t.start + horizon, t.stop + horizon)
+        chunk_pnl, chunk_outcome = resolve(close[:, t], high_w[:, f], low_w[:, f], close[:, e],
+                                           direction, tp, sl, horizon)
+        pnl[:, t] = chunk_pnl - 2 * fee
+        outcome[:, t] = chunk_outcome
+    return pnl, outcome
+
+# --- Data ---
+
+def load_batches(store, exchange, interval, source_interval, symbols, batch=BATCH_SYMBOLS):
+    for i in range(0, len(symbols), batch):
+        names, series = [], []
+        for symbol in symbols[i:i + batch]:
+            candles = store.read(exchange, symbol, source_interval)
+            if source_interval != interval:
+                candles = resample_candles(candles, source_interval, interval)
+            if len(candles) > PERIOD:
+                names.append(symbol)
+                series.append(candles)
+        if series:
+            yield names, columns_for(series)
+
+def columns_for(series):
+    length = max(len(c) for c in series)
+    return {name: indicators.stack([getattr(c, name) for c in series], length)
+            for name in ("ts", "open", "high", "low", "close", "volume")}
+
+def synthetic_batches(symbols, bars, interval, batch=BATCH_SYMBOLS, seed=7):
+    rng = np.random.default_rng(seed)
+    step = interval_ms(interval)
+    for i in range(0, symbols, batch):
+        n = min(batch, symbols - i)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, (n, bars)), axis=1))
+        spread = np.abs(rng.normal(0, 0.003, (n, bars)))
+        open_ = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+        yield [f"SYN{i + k}" for k in range(n)], {
+            "ts": np.broadcast_to(np.arange(bars, dtype=np.float64) * step, (n, bars)),
+            "open": open_,
+            "high": np.fmax(open_, close) * (1 + spread),
+            "low": np.fmin(open_, close) * (1 - spread),
+            "close": close,
+            "volume": rng.lognormal(8, 1, (n, bars)),
+        }
+
+# --- Report ---
+
+class Tally:
+    def __init__(self):
+        self.pnl, self.outcome = [], []
+        self.symbol_days = 0.0
+
+    def add(self, pnl, outcome):
+        self.pnl.append(pnl)
+        self.outcome.append(outcome)
+
+    def summary(self):
+        pnl = np.concatenate(self.pnl) if self.pnl else np.empty(0)
+        outcome = np.concatenate(self.outcome) if self.outcome else np.empty(0)
+        n = len(pnl)
+        return {
+            "signals": n,
+            "per_symbol_day": n / self.symbol_days if self.symbol_days else 0.0,
+            "hit_rate": float((pnl > 0).mean()) if n else float("nan"),
+            "tp": int((outcome == 1).sum()),
+            "sl": int((outcome == -1).sum()),
+            "timeout": int((outcome == 0).sum()),
+            "avg_pnl": float(pnl.mean()) if n else float("nan"),
+            "total_pnl": float(pnl.sum()),
+        }
+
+def run_rule(name, batches, interval, params=None, horizon=HORIZON, fee=0.0):
+    p = dict(RULES[name]["params"], **(params or {}))
+    tallies = {}
+    day_fraction = interval_ms(interval) / 86_400_000
+    for names, c in batches:
+        symbol_days = np.count_nonzero(~np.isnan(c["close"])) * day_fraction
+        f = rule_features(name, c, interval)
+        for leg, entries, direction, tp, sl in RULES[name]["signals"](c, f, p):
+            tally = tallies.setdefault(leg, Tally())
+            tally.symbol_days += symbol_days
+            tally.add(*simulate(c["high"], c["low"], c["close"], entries, direction, tp, sl, horizon, fee))
+    return {leg: tally.summary() for leg, tally in tallies.items()}
+
+def print_report(name, exchange, interval, results, elapsed):
+    print(f"\n[{name}] {exchange} {interval}  ({elapsed:.2f}s)")
+    for leg, r in results.items():
+        print(f"  {leg:<6} signals {r['signals']:>10,}  {r['per_symbol_day']:>8.2f}/symbol/day  "
+              f"hit {r['hit_rate'] * 100:>6.2f}%  TP {r['tp']:>9,}  SL {r['sl']:>9,}  timeout {r['timeout']:>9,}  "
+              f"avg {r['avg_pnl'] * 100:>7.3f}%  total {r['total_pnl'] * 100:>12.2f}%")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay stored candles through the scanner signal rules")
+    parser.add_argument("--rules", default=",".join(RULES), help="Comma separated: " + ", ".join(RULES))
+    parser.add_argument("--exchange", help="Override rule default exchange")
+    parser.add_argument("--interval", help="Override rule default interval")
+    parser.add_argument("--source-interval", help="Stored interval to resample from (default: --interval)")
+    parser.add_argument("--symbols", help="Comma separated, default: sab stored symbols")
+    parser.add_argument("--horizon", type=int, default=HORIZON, help="Bars before exit when TP/SL not hit")
+    parser.add_argument("--fee", type=float, default=0.0, help="Per side fee fraction, e.g. 0.0006")
+    parser.add_argument("--store", default=CANDLE_DIR, help="Candle store directory")
+    parser.add_argument("--synthetic", help="SYMBOLSxBARS random walk instead of the store, e.g. 500x100000")
+    args = parser.parse_args(argv)
+
+    store = CandleStore(args.store)
+    for name in (r for r in args.rules.split(",") if r):
+        if name not in RULES:
+            print(f"Unknown rule: {name}")
+            continue
+        exchange = args.exchange or RULES[name]["exchange"]
+        interval = args.interval or RULES[name]["interval"]
+        source = args.source_interval or interval
+        if args.synthetic:
+            count, bars = (int(x) for x in args.synthetic.lower().split("x"))
+            batches = synthetic_batches(count, bars, interval)
+        else:
+            symbols = args.symbols.split(",") if args.symbols else store.symbols(exchange, source)
+            if not symbols:
+                print(f"\n[{name}] No stored {exchange} {source} candles in {args.store}")
+                continue
+            batches = load_batches(store, exchange, interval, source, symbols)
+
+        start = time.perf_counter()
+        results = run_rule(name, batches, interval, horizon=args.horizon, fee=args.fee)
+        print_report(name, exchange, interval, results, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,191 @@
+import sys
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+import indicators
+import streaming_indicators
+
+# === INDICATOR CONFORMANCE + SPEED BENCHMARK ===
+# Repo ke saare RSI / KDJ implementations ko same candles pe chalata hai,
+# throughput aur peak memory report karta hai, aur reference se farq flag karta hai.
+# RSI reference: classic Wilder (SMA seed), KDJ reference: rsi_kdj.calculate_kdj.
+#
+#   python bench_indicators.py --sizes 100,10000,1000000
+#   python bench_indicators.py --csv candles.csv   (columns: open,high,low,close,volume)
+DEFAULT_SIZES = "100,1000,10000,100000,1000000"
+PERIOD = 14
+WARMUP = 100          # Is ke baad wale bars pe "tail" divergence
+TOLERANCE = 0.01      # Is se zyada tail farq = DIVERGES
+SLOW_MAX_BARS = 100_000  # Per-bar Python loops isse bare series pe skip
+WARMUP_BARS = 200     # Timing se pehle chhoti series pe ek run: scanner module import / first-call cost bahar
+math_nan = float("nan")
+
+def reference_rsi(closes, period=PERIOD):
+    out = [math_nan] * len(closes)
+    if len(closes) <= period:
+        return np.array(out)
+    gains = losses = 0.0
+    for i in range(1, period + 1):
+        change = closes[i] - closes[i - 1]
+        gains += max(change, 0.0)
+        losses += max(-change, 0.0)
+    avg_gain, avg_loss = gains / period, losses / period
+    out[period] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+    for i in range(period + 1, len(closes)):
+        change = closes[i] - closes[i - 1]
+        avg_gain = (avg_gain * (period - 1) + max(change, 0.0)) / period
+        avg_loss = (avg_loss * (period - 1) + max(-change, 0.0)) / period
+        out[i] = 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.array(out)
+
+# --- RSI implementations: har ek poori series return karta hai ---
+
+def rsi_liq_atr(candles):
+    import liq_atr
+    closes = candles["close"].tolist()
+    # liq_atr sirf aakhri value deta hai, is liye har bar pe window de kar series banate hain
+    out = [math_nan] * len(closes)
+    for i in range(PERIOD, len(closes)):
+        out[i] = liq_atr.calculate_rsi(closes[i - PERIOD:i + 1], PERIOD)
+    return np.array(out, dtype=float)
+
+def rsi_low_short(candles):
+    import low_short
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return low_short.calculate_rsi(candles["close"].to_numpy(), PERIOD)
+
+def rsi_ta(candles):
+    import ta
+    return ta.momentum.RSIIndicator(close=candles["close"], window=PERIOD).rsi().to_numpy()
+
+def rsi_pandas_ta(candles):
+    import pandas_ta
+    return pandas_ta.rsi(candles["close"], length=PERIOD).to_numpy()
+
+def rsi_batched(candles):
+    return indicators.rsi(candles["close"].to_numpy(), PERIOD)
+
+def rsi_streaming(candles):
+    rsi = streaming_indicators.RSI(PERIOD)
+    return np.array([math_nan if v is None else v for v in map(rsi.update, candles["close"].tolist())])
+
+# --- KDJ implementations (J line) ---
+
+def kdj_rsi_kdj(candles):
+    import rsi_kdj
+    return rsi_kdj.calculate_kdj(candles, PERIOD).to_numpy()
+
+def kdj_scalp_rsi(candles):
+    import scalp_rsi
+    return scalp_rsi.calculate_kdj(candles, PERIOD).to_numpy()
+
+def kdj_batched(candles):
+    return indicators.kdj(candles["high"].to_numpy(), candles["low"].to_numpy(), candles["close"].to_numpy(), PERIOD)[2]
+
+def kdj_streaming(candles):
+    kdj = streaming_indicators.KDJ(PERIOD)
+    out = []
+    for high, low, close in zip(candles["high"].tolist(), candles["low"].tolist(), candles["close"].tolist()):
+        value = kdj.update(high, low, close)
+        out.append(math_nan if value is None else value[2])
+    return np.array(out)
+
+RSI_IMPLEMENTATIONS = [
+    ("liq_atr.calculate_rsi", rsi_liq_atr, SLOW_MAX_BARS),
+    ("low_short.calculate_rsi", rsi_low_short, None),
+    ("ta RSIIndicator", rsi_ta, None),
+    ("pandas_ta.rsi", rsi_pandas_ta, None),
+    ("indicators.rsi", rsi_batched, None),
+    ("streaming RSI", rsi_streaming, None),
+]
+KDJ_IMPLEMENTATIONS = [
+    ("rsi_kdj.calculate_kdj", kdj_rsi_kdj, None),
+    ("scalp_rsi.calculate_kdj", kdj_scalp_rsi, None),
+    ("indicators.kdj", kdj_batched, None),
+    ("streaming KDJ", kdj_streaming, None),
+]
+
+def synthetic_candles(bars, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, bars)))
+    spread = np.abs(rng.normal(0, 0.003, bars))
+    return pd.DataFrame({
+        "open": np.concatenate(([close[0]], close[:-1])),
+        "high": close * (1 + spread),
+        "low": close * (1 - spread),
+        "close": close,
+        "volume": rng.lognormal(8, 1, bars),
+    })
+
+def load_csv(path):
+    df = pd.read_csv(path)
+    return df[["open", "high", "low", "close", "volume"]].astype(float).reset_index(drop=True)
+
+def measure(func, candles):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(candles)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return np.asarray(result, dtype=float), elapsed, peak
+
+def divergence(result, reference):
+    both = ~np.isnan(result) & ~np.isnan(reference)
+    if not both.any():
+        return math_nan, math_nan
+    diff = np.abs(result - reference)
+    tail = both.copy()
+    tail[:min(WARMUP, len(result) // 2)] = False
+    return float(diff[both].max()), (float(diff[tail].max()) if tail.any() else math_nan)
+
+def run_suite(name, implementations, candles, reference):
+    rows = []
+    for label, func, max_bars in implementations:
+        if max_bars and len(candles) > max_bars:
+            rows.append((label, "skipped (too slow)"))
+            continue
+        try:
+            func(candles.head(WARMUP_BARS))
+            result, elapsed, peak = measure(func, candles)
+        except ImportError as e:
+            rows.append((label, f"skipped ({e.name} not installed)"))
+            continue
+        max_diff, tail_diff = divergence(result, reference)
+        flag = "DIVERGES" if not tail_diff <= TOLERANCE else "ok"
+        rows.append((label, f"{len(candles) / elapsed:>14,.0f} bars/s  {peak / 1024:>10,.0f} KiB  "
+                            f"max diff {max_diff:>9.4f}  tail diff {tail_diff:>9.4f}  {flag}"))
+
+    print(f"\n[{name}] {len(candles):,} bars")
+    for label, text in rows:
+        print(f"  {label:<26} {text}")
+
+def run(candles):
+    reference_rsi_values = reference_rsi(candles["close"].tolist())
+    run_suite("RSI vs Wilder reference", RSI_IMPLEMENTATIONS, candles, reference_rsi_values)
+
+    reference_j = kdj_batched(candles)
+    try:
+        reference_j = kdj_rsi_kdj(candles)
+    except ImportError:
+        pass
+    run_suite("KDJ (J) vs rsi_kdj", KDJ_IMPLEMENTATIONS, candles, reference_j)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Indicator conformance and speed benchmark")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Synthetic series lengths, comma separated")
+    parser.add_argument("--csv", action="append", default=[], help="Recorded candles CSV (repeatable)")
+    args = parser.parse_args(argv)
+
+    for path in args.csv:
+        print(f"\n=== Recorded: {path}")
+        run(load_csv(path))
+    for size in (int(s) for s in args.sizes.split(",") if s):
+        print("\n=== Synthetic random walk")
+        run(synthetic_candles(size))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,125 @@
+import os
+import numpy as np
+from candles import COLUMNS, Candles
+from resample import interval_ms
+from state_store import STATE_DIR
+
+# === ON-DISK CANDLE HISTORY ===
+# Har (exchange, symbol, interval) ki closed candles append-only files mein:
+#   <CANDLE_DIR>/<exchange>/<symbol>/<interval>/ts.i8, open.f8, ... volume.f8
+# Har column alag file hai, read np.memmap se hota hai (koi copy nahi), is liye
+# restart ke baad scanner disk se pehle hi cycle mein poora lookback le leta hai.
+CANDLE_DIR = os.getenv("CANDLE_DIR", os.path.join(STATE_DIR, "candles"))
+CANDLE_STORE = os.getenv("CANDLE_STORE", "1") != "0"
+DTYPES = {name: (np.int64 if name == "ts" else np.float64) for name in COLUMNS}
+REPAIR_PAGES = 20
+
+class CandleStore:
+    def __init__(self, root=CANDLE_DIR):
+        self.root = root
+        self.last = {}  # Partition -> aakhri stored timestamp
+
+    def path(self, exchange, symbol, interval):
+        return os.path.join(self.root, exchange, symbol, interval)
+
+    def column_path(self, folder, name):
+        return os.path.join(folder, f"{name}.{'i8' if name == 'ts' else 'f8'}")
+
+    def length(self, folder):
+        # Crash append ke beech ho to columns ki length alag ho sakti hai, sab se chhoti valid
+        sizes = []
+        for name in COLUMNS:
+            path = self.column_path(folder, name)
+            sizes.append(os.path.getsize(path) // 8 if os.path.exists(path) else 0)
+        return min(sizes)
+
+    def read(self, exchange, symbol, interval, limit=None):
+        folder = self.path(exchange, symbol, interval)
+        n = self.length(folder)
+        if not n:
+            return Candles.empty()
+        start = max(0, n - limit) if limit else 0
+        arrays = [np.memmap(self.column_path(folder, name), dtype=DTYPES[name], mode="r", shape=(n,))[start:]
+                  for name in COLUMNS]
+        return Candles(*arrays)
+
+    def symbols(self, exchange, interval):
+        folder = os.path.join(self.root, exchange)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(s for s in os.listdir(folder) if os.path.isdir(os.path.join(folder, s, interval)))
+
+    def last_timestamp(self, exchange, symbol, interval):
+        key = (exchange, symbol, interval)
+        if key not in self.last:
+            candles = self.read(exchange, symbol, interval, limit=1)
+            self.last[key] = int(candles.ts[-1]) if len(candles) else None
+        return self.last[key]
+
+    def append(self, exchange, symbol, interval, candles):
+        # Sirf closed candles do; store ke aakhri timestamp se purani/barabar wali skip
+        if not isinstance(candles, Candles):
+            candles = Candles.from_rows(candles)
+        last = self.last_timestamp(exchange, symbol, interval)
+        if last is not None:
+            candles = candles[int(np.searchsorted(candles.ts, last, side="right")):]
+        if not len(candles):
+            return 0
+
+        folder = self.path(exchange, symbol, interval)
+        os.makedirs(folder, exist_ok=True)
+        n = self.length(folder)
+        for name in COLUMNS:
+            path = self.column_path(folder, name)
+            with open(path, "ab") as f:
+                f.truncate(n * 8)  # Adhoori pichli append ka kachra hatao
+                getattr(candles, name).astype(DTYPES[name]).tofile(f)
+        self.last[(exchange, symbol, interval)] = int(candles.ts[-1])
+        return len(candles)
+
+    def rewrite(self, exchange, symbol, interval, candles):
+        folder = self.path(exchange, symbol, interval)
+        os.makedirs(folder, exist_ok=True)
+        for name in COLUMNS:
+            path = self.column_path(folder, name)
+            tmp = path + ".tmp"
+            getattr(candles, name).astype(DTYPES[name]).tofile(tmp)
+            os.replace(tmp, path)
+        self.last[(exchange, symbol, interval)] = int(candles.ts[-1]) if len(candles) else None
+
+    def find_gaps(self, exchange, symbol, interval):
+        # [(pehla missing ts, agla maujood ts), ...]
+        ts = self.read(exchange, symbol, interval).ts
+        step = interval_ms(interval)
+        holes = np.flatnonzero(np.diff(ts) > step)
+        return [(int(ts[i]) + step, int(ts[i + 1])) for i in holes]
+
+    def repair(self, exchange, symbol, interval, fetch, max_pages=REPAIR_PAGES):
+        # fetch(start) -> rows jin ka timestamp >= start ho (KlineCache wala hi contract).
+        # Har gap ko pages mein bharte hain, phir partition ek dafa rewrite.
+        gaps = self.find_gaps(exchange, symbol, interval)
+        if not gaps:
+            return 0
+        stored = self.read(exchange, symbol, interval)
+        parts = [stored.matrix()]
+        filled = 0
+        for start, end in gaps:
+            for _ in range(max_pages):
+                rows = fetch(start)
+                if not rows:
+                    break
+                got = Candles.from_rows(rows)
+                got = got[:int(np.searchsorted(got.ts, end))]
+                got = got[int(np.searchsorted(got.ts, start)):]
+                if not len(got):
+                    break
+                parts.append(got.matrix())
+                filled += len(got)
+                start = int(got.ts[-1]) + interval_ms(interval)
+                if start >= end:
+                    break
+        if filled:
+            self.rewrite(exchange, symbol, interval, Candles.from_matrix(np.vstack(parts)))
+        return filled
+
+store = CandleStore() if CANDLE_STORE else None
@@ -0,0 +1,107 @@
+import json
+import numpy as np
+
+# === COLUMNAR CANDLES ===
+# Har column ek contiguous array (timestamp int64 ms, baaki float64), koi
+# per-row Python object nahi. Parsers exchange ka JSON seedha arrays mein
+# convert karte hain (ek hi np.array call), DataFrame ke baghair.
+COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+
+class Candles:
+    __slots__ = COLUMNS
+
+    def __init__(self, ts, open, high, low, close, volume):
+        self.ts = np.ascontiguousarray(ts, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+
+    @classmethod
+    def empty(cls):
+        return cls(*(np.empty(0) for _ in COLUMNS))
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        # matrix: (bars x 6) float64 -> purani se nayi candle order mein
+        if len(matrix) > 1 and not np.all(np.diff(matrix[:, 0]) > 0):
+            order = np.argsort(matrix[:, 0], kind="stable")
+            matrix = matrix[order]
+            keep = np.r_[np.diff(matrix[:, 0]) != 0, True]  # Duplicate timestamp pe aakhri wali
+            matrix = matrix[keep]
+        return cls(matrix[:, 0], matrix[:, 1], matrix[:, 2], matrix[:, 3], matrix[:, 4], matrix[:, 5])
+
+    @classmethod
+    def from_rows(cls, rows):
+        # [[ts, o, h, l, c, v, ...], ...] strings ya numbers, pehle 6 columns
+        if not len(rows):
+            return cls.empty()
+        return cls.from_matrix(np.array([row[:6] for row in rows], dtype=np.float64))
+
+    def __len__(self):
+        return len(self.ts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return Candles(*(getattr(self, name)[i] for name in COLUMNS))
+        return (int(self.ts[i]), float(self.open[i]), float(self.high[i]),
+                float(self.low[i]), float(self.close[i]), float(self.volume[i]))
+
+    def __repr__(self):
+        return f"Candles({len(self)} bars)"
+
+    def tail(self, n):
+        return self[-n:] if n else self
+
+    def rows(self):
+        return [list(self[i]) for i in range(len(self))]
+
+    def matrix(self):
+        return np.column_stack([getattr(self, name) for name in COLUMNS])
+
+    def append(self, other):
+        if not len(self):
+            return other
+        return Candles.from_matrix(np.vstack([self.matrix(), other.matrix()]))
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(self.ts, unit="ms"),
+            "open": self.open, "high": self.high, "low": self.low,
+            "close": self.close, "volume": self.volume,
+        })
+
+def load(payload):
+    if isinstance(payload, (bytes, str)):
+        return json.loads(payload)
+    return payload
+
+def parse_bitget(payload):
+    # {"code": "00000", "data": [[ts, o, h, l, c, baseVol, quoteVol], ...]}
+    data = load(payload)
+    return Candles.from_rows(data.get("data") or [] if isinstance(data, dict) else data)
+
+def parse_mexc_spot(payload):
+    # [[openTime, o, h, l, c, v, closeTime, quoteVol], ...]
+    data = load(payload)
+    return Candles.from_rows(data if isinstance(data, list) else [])
+
+def parse_mexc_contract(payload):
+    # {"data": {"time": [...sec], "open": [...], ...}} ya rows wali list
+    data = load(payload)
+    data = data.get("data") if isinstance(data, dict) else data
+    if isinstance(data, dict):
+        if not data.get("time"):
+            return Candles.empty()
+        matrix = np.column_stack([
+            np.asarray(data["time"], dtype=np.float64) * 1000,
+            np.asarray(data["open"], dtype=np.float64),
+            np.asarray(data["high"], dtype=np.float64),
+            np.asarray(data["low"], dtype=np.float64),
+            np.asarray(data["close"], dtype=np.float64),
+            np.asarray(data["vol"], dtype=np.float64),
+        ])
+        return Candles.from_matrix(matrix)
+    return Candles.from_rows(data or [])
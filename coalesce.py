@@ -0,0 +1,97 @@
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import Future
+
+# === IN-FLIGHT REQUEST COALESCING ===
+# Ek hi key (exchange, symbol, interval ...) ki fetch pehle se chal rahi ho to
+# doosra caller nayi request nahi bhejta, usi ka Future share karta hai.
+# Kamiyab result COALESCE_TTL seconds tak fresh rehta hai, us dauran aane wale
+# callers ko bhi wohi milta hai. None / khali result (fail) cache nahi hota.
+COALESCE_TTL = float(os.getenv("COALESCE_TTL", 2))
+MAX_ENTRIES = 4096
+
+class Coalescer:
+    def __init__(self, ttl=COALESCE_TTL, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.results = {}   # key -> (stored_at, value)
+        self.inflight = {}  # key -> concurrent Future
+        self.pending = {}   # key -> asyncio Future (event loop wale callers)
+        self.lock = threading.Lock()
+        self.shared = 0     # Kitni requests bachi
+
+    def fresh(self, key):
+        hit = self.results.get(key)
+        if hit is not None and time.monotonic() - hit[0] < self.ttl:
+            return hit
+        return None
+
+    def store(self, key, value):
+        if value is None or not len(value) or self.ttl <= 0:
+            return
+        now = time.monotonic()
+        self.results[key] = (now, value)
+        if len(self.results) > self.max_entries:
+            # Expired entries hatao, phir bhi zyada hon to sab se purani
+            for k in [k for k, (ts, _) in self.results.items() if now - ts >= self.ttl]:
+                del self.results[k]
+            while len(self.results) > self.max_entries:
+                del self.results[next(iter(self.results))]
+
+    def get(self, key, fetch):
+        with self.lock:
+            hit = self.fresh(key)
+            if hit is not None:
+                self.shared += 1
+                return hit[1]
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+            else:
+                self.shared += 1
+        if not owner:
+            return future.result()
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self.lock:
+                self.inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self.lock:
+            self.inflight.pop(key, None)
+            self.store(key, value)
+        future.set_result(value)
+        return value
+
+    async def get_async(self, key, fetch):
+        # fetch() -> coroutine; ek hi event loop ke callers ek Future share karte hain
+        with self.lock:
+            hit = self.fresh(key)
+            if hit is not None:
+                self.shared += 1
+                return hit[1]
+        future = self.pending.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+        future = self.pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fetch()
+        except BaseException as e:
+            self.pending.pop(key, None)
+            future.set_exception(e)
+            future.exception()  # Koi waiter na ho to "never retrieved" warning nahi
+            raise
+        self.pending.pop(key, None)
+        with self.lock:
+            self.store(key, value)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.results.clear()
@@ -0,0 +1,59 @@
+import os
+from datetime import datetime
+
+# === PER-CYCLE ALERT DIGEST ===
+# Ek scan cycle ke saare signals jama karke strength ke hisaab se sort, phir
+# Telegram ki 4096 character limit ke andar chand messages mein bhej do.
+# Har symbol ka alag message (sau se zyada API calls) ki jagah 1-3 messages.
+# ALERT_DIGEST=0 ho to purana tareeqa: har signal apna poora message foran.
+ALERT_DIGEST = os.getenv("ALERT_DIGEST", "1") != "0"
+DIGEST_TOP = int(os.getenv("DIGEST_TOP", 60))  # Is se zyada signals ho to baaki sirf ginti mein
+MAX_MESSAGE = 4096
+
+class Digest:
+    def __init__(self, title, send, top=DIGEST_TOP, enabled=ALERT_DIGEST):
+        self.title = title
+        self.send = send
+        self.top = top
+        self.enabled = enabled
+        self.items = []
+
+    def add(self, score, line, message=None):
+        # score: bara = zyada strong; message: digest band ho to yeh (ya line) akela bhejo
+        if not self.enabled:
+            self.send(message or line)
+            return
+        self.items.append((score, line))
+
+    def __len__(self):
+        return len(self.items)
+
+    def messages(self):
+        items = sorted(self.items, key=lambda item: item[0], reverse=True)
+        lines = [line for _, line in items[:self.top]]
+        if len(items) > self.top:
+            lines.append(f"... +{len(items) - self.top} more")
+        header = f"{self.title} | {len(items)} signals | {datetime.utcnow().strftime('%Y-%m-%d %H:%M')} UTC"
+        room = MAX_MESSAGE - len(header) - 16  # " (12/12)" aur newlines ki jagah
+        chunks, chunk, size = [], [], 0
+        for line in lines:
+            line = line if len(line) <= room else line[:room - 3] + "..."
+            if chunk and size + len(line) + 1 > room:
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(line)
+            size += len(line) + 1
+        if chunk:
+            chunks.append(chunk)
+        if len(chunks) == 1:
+            return [header + "\n\n" + "\n".join(chunks[0])]
+        return [f"{header} ({i}/{len(chunks)})\n\n" + "\n".join(c) for i, c in enumerate(chunks, 1)]
+
+    def flush(self):
+        if not self.items:
+            return 0
+        messages = self.messages()
+        self.items = []
+        for message in messages:
+            self.send(message)
+        return len(messages)
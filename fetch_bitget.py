@@ -1,10 +1,14 @@
-import requests
+import http_client
 import time
 import os
 import hmac
 import hashlib
 import base64
-import telebot
+from symbol_registry import registry
+from state_store import open_store
+import market_stream
+import notifier
+from digest import Digest
 from datetime import datetime, timedelta
 
 # 🔑 Bitget API Keys (Render ke environment variables se le raha hai)
@@ -14,7 +18,10 @@ PASSPHRASE = os.getenv("BITGET_PASSPHRASE")
 TELEGRAM_TOKEN = os.getenv("TOKEN")
 CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-bot = telebot.TeleBot(TELEGRAM_TOKEN)
+notify = notifier.telegram(CHAT_ID, TELEGRAM_TOKEN)  # Queue + pooled session, rate limits ke saath
+
+MARKET_DATA_MODE = os.getenv("MARKET_DATA_MODE", "rest")  # "rest" ya "stream"
+STREAM_WINDOW = int(os.getenv("STREAM_WINDOW", 60))
 
 # 🛠️ Signature generation function (v2)
 def generate_signature(timestamp, method, request_path, body=""):
@@ -34,7 +41,7 @@ def fetch_order_book(market_type, symbol, limit=5):
         return None
 
     params = {"symbol": symbol, "limit": limit}
-    response = requests.get(base_url, params=params)
+    response = http_client.get(base_url, params=params)
 
     if response.status_code == 200:
         return response.json()
@@ -42,73 +49,126 @@ def fetch_order_book(market_type, symbol, limit=5):
         print(f"Error fetching {market_type} order book:", response.text)
         return None
 
-# 🔍 Function to get all trading pairs using correct API URLs
+# 🔍 Trading pairs registry se (TTL cache, har run pe API call nahi)
 def get_all_trading_pairs(market_type):
-    if market_type == "spot":
-        url = "https://api.bitget.com/api/spot/v1/public/symbols"
-    elif market_type == "futures":
-        url = "https://api.bitget.com/api/mix/v1/market/contracts?productType=umcbl"
-    else:
-        return []
-
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        if market_type == "spot":
-            return [pair["symbol"].replace("_SPBL", "") for pair in data["data"]]
-        else:
-            return [pair["symbol"].replace("_UMCBL", "") for pair in data["data"]]
-    else:
-        print(f"Error fetching {market_type} trading pairs:", response.text)
+    if market_type not in ("spot", "futures"):
         return []
+    return registry.names("bitget", market_type)
 
-# 🔔 Send alerts to Telegram
+# 🔔 Send alerts to Telegram (queue mein, background threads rate limit ke saath bhejte hain)
 def send_telegram_alert(message):
-    bot.send_message(CHAT_ID, message)
+    notify.send(message)
 
 # 📅 Calculate time to alert 5 minutes before trade execution
 def get_alert_time():
     return (datetime.utcnow() + timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M:%S')
 
+# 📊 Spike message (None agar spike nahi)
+def spike_message(symbol, prev_price, best_bid):
+    price_change = ((best_bid - prev_price) / prev_price) * 100
+    if price_change >= 0.5:
+        return f"🚀 {symbol} Bullish spike detected!"
+    elif price_change <= -0.5:
+        return f"⚠️ {symbol} Bearish spike detected!"
+    return None
+
+# 📊 Spike Trading Alert Check (True return karta hai agar spike mila)
+def check_spike(symbol, prev_price, best_bid):
+    message = spike_message(symbol, prev_price, best_bid)
+    if message:
+        send_telegram_alert(message)
+        return True
+    return False
+
+def alert_symbol(symbol, market, best_bid, store, digest=None):
+    # digest diya ho to har symbol ka alag message nahi, us ki ek line (sab se bara move pehle)
+    key = f"{market}:{symbol}"  # Dono markets mein same symbol alag track ho
+    previous = store.get(key)
+    stop_loss = round(best_bid * 0.995, 4)  # 🔻 0.5% Neeche Stop Loss
+    take_profit = round(best_bid * 1.005, 4)  # 🔺 0.5% Upar Take Profit
+
+    # Define entry position based on trend (short or long)
+    entry_position = "Short" if previous and best_bid < previous[0] else "Long"
+    
+    # Format message as seen in image
+    alert_msg = (
+        f"Coin Name: {symbol}\n"
+        f"Entry Position: {entry_position}\n"
+        f"Coin Value: {best_bid}\n"
+        f"Date and Time: {get_alert_time()}\n"
+        f"Note: Manage your risk; any trade can fail. Bitnode coordinate 888'12''65\n"
+    )
+    if digest is None:
+        send_telegram_alert(alert_msg)
+        if previous:
+            check_spike(symbol, previous[0], best_bid)
+    else:
+        change = (best_bid - previous[0]) / previous[0] * 100 if previous else 0.0
+        spike = spike_message(symbol, previous[0], best_bid) if previous else None
+        line = f"{symbol} ({market}) {entry_position} @ {best_bid} | {change:+.2f}%"
+        digest.add(abs(change), f"{spike.split()[0]} {line}" if spike else line, alert_msg)
+        if spike and not digest.enabled:
+            send_telegram_alert(spike)
+
+    store.set(key, best_bid)  # 🔄 Update previous price
+
 # 🚀 Fetch & Send Alerts
 def check_and_alert():
-    spot_pairs = get_all_trading_pairs("spot")
-    futures_pairs = get_all_trading_pairs("futures")
+    store = open_store("fetch_bitget")  # 📌 Previous prices, runs ke beech save rehti hain
+    # 📨 Hazaron symbols, per-chat ~1 msg/s: ek run ka ek digest, warna queue exit se pehle khali nahi hoti
+    digest = Digest(f"📊 Bitget alerts | {get_alert_time()}", send_telegram_alert)
 
-    previous_prices = {}  # 📌 Store previous prices for spike alerts
-
-    for symbol in spot_pairs + futures_pairs:
-        market = "spot" if symbol in spot_pairs else "futures"
+    for market, symbol in registry.listings("bitget", ("spot", "futures")):
         data = fetch_order_book(market, symbol)
 
         if data:
             best_bid = float(data["data"]["bids"][0][0])  # ✅ Best buy price
-            stop_loss = round(best_bid * 0.995, 4)  # 🔻 0.5% Neeche Stop Loss
-            take_profit = round(best_bid * 1.005, 4)  # 🔺 0.5% Upar Take Profit
-
-            # Define entry position based on trend (short or long)
-            entry_position = "Short" if best_bid < previous_prices.get(symbol, best_bid) else "Long"
-            
-            # Format message as seen in image
-            alert_msg = (
-                f"Coin Name: {symbol}\n"
-                f"Entry Position: {entry_position}\n"
-                f"Coin Value: {best_bid}\n"
-                f"Date and Time: {get_alert_time()}\n"
-                f"Note: Manage your risk; any trade can fail. Bitnode coordinate 888'12''65\n"
-            )
-            send_telegram_alert(alert_msg)
-
-            # 📊 Spike Trading Alert Check
-            if symbol in previous_prices:
-                price_change = ((best_bid - previous_prices[symbol]) / previous_prices[symbol]) * 100
-                if price_change >= 0.5:
-                    send_telegram_alert(f"🚀 {symbol} Bullish spike detected!")
-                elif price_change <= -0.5:
-                    send_telegram_alert(f"⚠️ {symbol} Bearish spike detected!")
-
-            previous_prices[symbol] = best_bid  # 🔄 Update previous price
+            alert_symbol(symbol, market, best_bid, store, digest)
+    store.flush()
+    digest.flush()
+
+# 📡 WebSocket mode: depth pushes se spike turant, baaki alerts har STREAM_WINDOW pe
+def run_stream():
+    spot_pairs = get_all_trading_pairs("spot")
+    futures_pairs = get_all_trading_pairs("futures")
+
+    store = open_store("fetch_bitget")
+    latest = {}     # (market, symbol) -> abhi ka best bid
+    baseline = {}   # (market, symbol) -> window shuru hone pe best bid
+
+    def on_depth(event):
+        bids = event.data["bids"]
+        if not bids:
+            return
+        key = (event.market, event.symbol)
+        best_bid = bids[0][0]
+        latest[key] = best_bid
+        if key in baseline and check_spike(event.symbol, baseline[key], best_bid):
+            # Ek spike pe ek hi alert, window wala check bhi isi price se chale
+            baseline[key] = best_bid
+            store.set(f"{event.market}:{event.symbol}", best_bid)
+        baseline.setdefault(key, best_bid)
+
+    def on_window():
+        # Sirf woh symbols jin ka bid window mein badla, aur sab ek digest mein
+        digest = Digest(f"📊 Bitget alerts ({STREAM_WINDOW}s window) | {get_alert_time()}", send_telegram_alert)
+        for (market, symbol), best_bid in list(latest.items()):
+            previous = store.get(f"{market}:{symbol}")
+            if previous and previous[0] == best_bid:
+                continue
+            alert_symbol(symbol, market, best_bid, store, digest)
+        store.flush()
+        digest.flush()
+        baseline.clear()
+        baseline.update(latest)
+
+    subs = (market_stream.subscriptions_for("depth", "spot", spot_pairs)
+            + market_stream.subscriptions_for("depth", "futures", futures_pairs))
+    market_stream.run_stream(market_stream.BitgetProtocol(), subs, on_depth, tick=on_window, tick_interval=STREAM_WINDOW)
 
 # ✅ Run the function
 if __name__ == "__main__":
-    check_and_alert()
+    if MARKET_DATA_MODE == "stream":
+        run_stream()
+    else:
+        check_and_alert()
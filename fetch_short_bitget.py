@@ -1,10 +1,13 @@
-import requests
+import http_client
 import time
 import hmac
 import hashlib
 import os
 import base64
-import telebot
+from symbol_registry import registry
+from state_store import open_store
+from digest import Digest
+import notifier
 from datetime import datetime, timedelta
 
 # 🔑 Bitget API Keys (Render ke environment variables se le raha hai)
@@ -14,7 +17,7 @@ PASSPHRASE = os.getenv("BITGET_PASSPHRASE")  # Futures trading ke liye zaroori h
 TELEGRAM_TOKEN = os.getenv("TOKEN")
 CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-bot = telebot.TeleBot(TELEGRAM_TOKEN)
+notify = notifier.telegram(CHAT_ID, TELEGRAM_TOKEN)
 
 # 🛠️ Signature generation function (v2)
 def generate_signature(timestamp, method, request_path, body=""):
@@ -34,7 +37,7 @@ def fetch_order_book(market_type, symbol, limit=5):
         return None
 
     params = {"symbol": symbol, "limit": limit}
-    response = requests.get(base_url, params=params)
+    response = http_client.get(base_url, params=params)
 
     if response.status_code == 200:
         return response.json()
@@ -42,29 +45,15 @@ def fetch_order_book(market_type, symbol, limit=5):
         print(f"Error fetching {market_type} order book:", response.text)
         return None
 
-# 🔍 Function to get all trading pairs using correct API URLs
+# 🔍 Trading pairs registry se (TTL cache, har run pe API call nahi)
 def get_all_trading_pairs(market_type):
-    if market_type == "spot":
-        url = "https://api.bitget.com/api/spot/v1/public/symbols"
-    elif market_type == "futures":
-        url = "https://api.bitget.com/api/mix/v1/market/contracts?productType=umcbl"
-    else:
-        return []
-
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        if market_type == "spot":
-            return [pair["symbol"].replace("_SPBL", "") for pair in data["data"]]
-        else:
-            return [pair["symbol"].replace("_UMCBL", "") for pair in data["data"]]
-    else:
-        print(f"Error fetching {market_type} trading pairs:", response.text)
+    if market_type not in ("spot", "futures"):
         return []
+    return registry.names("bitget", market_type)
 
 # 🔔 Send alerts to Telegram
 def send_telegram_alert(message):
-    bot.send_message(CHAT_ID, message)
+    notify.send(message)
 
 # 📅 Calculate time to alert 5 minutes before trade execution
 def get_alert_time():
@@ -72,13 +61,11 @@ def get_alert_time():
 
 # 🚀 Fetch & Send Alerts for SHORT trades
 def check_and_alert_short():
-    spot_pairs = get_all_trading_pairs("spot")
-    futures_pairs = get_all_trading_pairs("futures")
-
-    previous_prices = {}  # 📌 Store previous prices for spike alerts
+    store = open_store("fetch_short_bitget")  # 📌 Previous prices, runs ke beech save rehti hain
+    # 📨 Har symbol ka alag message nahi, poori run ka ek digest (pichli run se sab se zyada upar gaye pehle)
+    digest = Digest(f"⚡ 5-Minute SHORT Trade Signals | Alert for: {get_alert_time()}", send_telegram_alert)
 
-    for symbol in spot_pairs + futures_pairs:
-        market = "spot" if symbol in spot_pairs else "futures"
+    for market, symbol in registry.listings("bitget", ("spot", "futures")):
         data = fetch_order_book(market, symbol)
 
         if data:
@@ -93,17 +80,25 @@ def check_and_alert_short():
                 f"📉 Stop Loss: {stop_loss}\n"
                 f"📈 Take Profit: {take_profit}"
             )
-            send_telegram_alert(alert_msg)
 
             # 📊 Spike Trading Alert Check
-            if symbol in previous_prices:
-                price_change = ((best_bid - previous_prices[symbol]) / previous_prices[symbol]) * 100
-                if price_change >= 0.5:
-                    send_telegram_alert(f"🚀 {symbol} Bullish spike detected!")
-                elif price_change <= -0.5:
-                    send_telegram_alert(f"⚠️ {symbol} Bearish spike detected!")
-
-            previous_prices[symbol] = best_bid  # 🔄 Update previous price
+            key = f"{market}:{symbol}"  # Dono markets mein same symbol alag track ho
+            previous = store.get(key)
+            price_change = ((best_bid - previous[0]) / previous[0]) * 100 if previous else 0.0
+            spike = ""
+            if price_change >= 0.5:
+                spike = f"🚀 {symbol} Bullish spike detected!"
+            elif price_change <= -0.5:
+                spike = f"⚠️ {symbol} Bearish spike detected!"
+
+            line = f"{symbol} ({market.upper()}) {best_bid} | SL {stop_loss} TP {take_profit} | {price_change:+.2f}%"
+            digest.add(price_change, f"{spike.split()[0]} {line}" if spike else line, alert_msg)
+            if spike and not digest.enabled:
+                send_telegram_alert(spike)
+
+            store.set(key, best_bid)  # 🔄 Update previous price
+    store.flush()
+    digest.flush()
 
 # ✅ Run the function for SHORT trades
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
-import requests
+import http_client
 import os
-import telebot
-from datetime import datetime, timedelta
+import time
+import numpy as np
+from symbol_registry import registry, normalize_symbol
+from state_store import open_store
+import market_stream
+import notifier
 
 # 🔑 Bitget API Keys (Render ke environment variables se le raha hai)
 API_KEY = os.getenv("BITGET_API_KEY")
@@ -10,7 +14,27 @@ PASSPHRASE = os.getenv("BITGET_PASSPHRASE")  # Futures trading ke liye zaroori h
 TELEGRAM_TOKEN = os.getenv("TOKEN")
 CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-bot = telebot.TeleBot(TELEGRAM_TOKEN)
+MARKET_DATA_MODE = os.getenv("MARKET_DATA_MODE", "rest")  # "rest", "stream" ya "bulk"
+STREAM_WINDOW = int(os.getenv("STREAM_WINDOW", 60))
+BULK_INTERVAL = int(os.getenv("BULK_INTERVAL", 60))
+
+# Spike threshold: Price change ≥ 3% and Volume increase ≥ 50%
+PRICE_SPIKE_PCT = 3
+VOLUME_SPIKE_PCT = 50
+
+# 📦 Poore market ke tickers ek call mein (price = best bid, volume = 24h base volume).
+# 24h rolling total ek interval mein 50% nahi barhta, is liye do scans ke total ka farq
+# (is interval mein trade hua volume) pichle interval se compare hota hai
+BULK_TICKER_URLS = {
+    "spot": "https://api.bitget.com/api/spot/v1/market/tickers",
+    "futures": "https://api.bitget.com/api/mix/v1/market/tickers?productType=umcbl",
+}
+BULK_TICKER_FIELDS = {
+    "spot": ("buyOne", "baseVol"),
+    "futures": ("bestBid", "baseVolume"),
+}
+
+notify = notifier.telegram(CHAT_ID, TELEGRAM_TOKEN)
 
 # 📊 Function to fetch order book (Spot & Futures)
 def fetch_order_book(market_type, symbol, limit=5):
@@ -24,7 +48,7 @@ def fetch_order_book(market_type, symbol, limit=5):
         return None
 
     params = {"symbol": symbol, "limit": limit}
-    response = requests.get(base_url, params=params)
+    response = http_client.get(base_url, params=params)
 
     if response.status_code == 200:
         return response.json()
@@ -32,76 +56,158 @@ def fetch_order_book(market_type, symbol, limit=5):
         print(f"Error fetching {market_type} order book:", response.text)
         return None
 
-# 🔍 Function to get all trading pairs using correct API URLs
+# 🔍 Trading pairs registry se (TTL cache, har run pe API call nahi)
 def get_all_trading_pairs(market_type):
-    if market_type == "spot":
-        url = "https://api.bitget.com/api/spot/v1/public/symbols"
-    elif market_type == "futures":
-        url = "https://api.bitget.com/api/mix/v1/market/contracts?productType=umcbl"
-    else:
-        return []
-
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        if market_type == "spot":
-            return [pair["symbol"].replace("_SPBL", "") for pair in data["data"]]
-        else:
-            return [pair["symbol"].replace("_UMCBL", "") for pair in data["data"]]
-    else:
-        print(f"Error fetching {market_type} trading pairs:", response.text)
+    if market_type not in ("spot", "futures"):
         return []
+    return registry.names("bitget", market_type)
 
 # 🔔 Send alerts to Telegram
 def send_telegram_alert(message):
-    bot.send_message(CHAT_ID, message)
+    notify.send(message)
+
+def send_spike_alert(symbol, market, price_change, volume_change, volume_label="Volume Change"):
+    trend = "Increase" if volume_change >= 0 else "Decrease"
+    direction = "Bullish" if price_change > 0 else "Bearish"
+    position = "Long" if price_change > 0 else "Short"  # 🟢 Add Long/Short based on price movement
+    alert_msg = (
+        f"🚨 {symbol} ({market.upper()}) Spike Detected:\n"
+        f"📊 Price Change: {round(price_change, 2)}% {direction} Move!\n"
+        f"📈 {volume_label}: {round(volume_change, 2)}% {trend}!\n"
+        f"🟩 Position: {position} Signal"  # 🟩 Position Alert: Long/Short
+    )
+    send_telegram_alert(alert_msg)
 
 # 📊 Function to check for spike alerts based on price change and volume increase
 def check_spike_alert(symbol, market, prev_price, current_price, prev_volume, current_volume):
     price_change = ((current_price - prev_price) / prev_price) * 100
     volume_change = ((current_volume - prev_volume) / prev_volume) * 100 if prev_volume != 0 else 0
 
-    # Spike threshold: Price change ≥ 3% and Volume increase ≥ 50%
-    if abs(price_change) >= 3 and volume_change >= 50:
-        direction = "Bullish" if price_change > 0 else "Bearish"
-        position = "Long" if price_change > 0 else "Short"  # 🟢 Add Long/Short based on price movement
-        alert_msg = (
-            f"🚨 {symbol} ({market.upper()}) Spike Detected:\n"
-            f"📊 Price Change: {round(price_change, 2)}% {direction} Move!\n"
-            f"📈 Volume Change: {round(volume_change, 2)}% Increase!\n"
-            f"🟩 Position: {position} Signal"  # 🟩 Position Alert: Long/Short
-        )
-        send_telegram_alert(alert_msg)
-
-# 🛠️ Function to generate current time + 5 minutes for alerts
-def get_alert_time():
-    return (datetime.utcnow() + timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M:%S')
+    if abs(price_change) >= PRICE_SPIKE_PCT and volume_change >= VOLUME_SPIKE_PCT:
+        send_spike_alert(symbol, market, price_change, volume_change)
+        return True
+    return False
+
+# 📊 Wahi thresholds, lekin saare symbols ke arrays pe ek saath
+def find_spikes(prev_prices, prices, prev_volumes, volumes):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price_change = (prices - prev_prices) / prev_prices * 100
+        volume_change = np.where(prev_volumes != 0, (volumes - prev_volumes) / prev_volumes * 100, 0)
+    mask = (np.abs(price_change) >= PRICE_SPIKE_PCT) & (volume_change >= VOLUME_SPIKE_PCT)
+    return mask & np.isfinite(price_change), price_change, volume_change
+
+def fetch_all_tickers(market_type):
+    response = http_client.get(BULK_TICKER_URLS[market_type])
+    if response.status_code != 200:
+        print(f"Error fetching {market_type} tickers:", response.text)
+        return [], np.empty(0), np.empty(0)
+
+    price_field, volume_field = BULK_TICKER_FIELDS[market_type]
+    symbols, prices, volumes = [], [], []
+    for item in response.json().get("data") or []:
+        try:
+            price, volume = float(item[price_field]), float(item[volume_field])
+        except (KeyError, TypeError, ValueError):
+            continue
+        symbols.append(normalize_symbol(item["symbol"]))
+        prices.append(price)
+        volumes.append(volume)
+    return symbols, np.array(prices), np.array(volumes)
+
+# 📊 24h total ka farq = pichle scan se ab tak trade hua volume, BULK_INTERVAL ke hisaab se scale.
+# Purana volume window se nikalta hai to farq minus ho sakta hai, us ko 0 maano
+def interval_volumes(prev_totals, totals, elapsed):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.clip(totals - prev_totals, 0, None) / elapsed * BULK_INTERVAL
+
+# 🚀 Bulk mode: har market ke liye ek call, phir ek vectorized pass.
+# traded: key -> pichle interval ka traded volume (memory mein, restart ke baad ek scan mein wapas)
+def check_and_alert_bulk(store, traded):
+    for market in ("spot", "futures"):
+        symbols, prices, totals = fetch_all_tickers(market)
+        if not symbols:
+            continue
+        keys = [f"{market}:{symbol}" for symbol in symbols]
+        rows = store.rows_for(keys)
+        prev_prices, prev_totals = store.previous(rows)  # STATE_MAX_AGE se purani values NaN
+        volumes = interval_volumes(prev_totals, totals, store.age(rows))
+        prev_volumes = np.array([traded.get(key, np.nan) for key in keys])
+        mask, price_change, volume_change = find_spikes(prev_prices, prices, prev_volumes, volumes)
+        for i in np.flatnonzero(mask & ~np.isnan(prev_prices)):
+            send_spike_alert(symbols[i], market, price_change[i], volume_change[i], "Traded Volume Change")
+        traded.update(zip(keys, volumes.tolist()))
+        store.set_many(rows, prices, totals)
+    store.flush()
+
+def run_bulk():
+    # Bulk mein volume column 24h base volume hai, order book wale volume se alag, is liye alag file
+    store = open_store("fetch_spike_bitget_bulk")
+    traded = {}
+    while True:
+        try:
+            check_and_alert_bulk(store, traded)
+        except Exception as e:
+            print(f"Bulk scan error: {e}")
+        time.sleep(BULK_INTERVAL)
 
 # 🚀 Fetch & Send Spike Alerts
 def check_and_alert():
-    spot_pairs = get_all_trading_pairs("spot")
-    futures_pairs = get_all_trading_pairs("futures")
-
-    previous_prices = {}  # 📌 Store previous prices for spike alerts
-    previous_volumes = {}  # 📌 Store previous volumes
+    store = open_store("fetch_spike_bitget")  # 📌 Previous prices/volumes, runs ke beech save
 
-    for symbol in spot_pairs + futures_pairs:
-        market = "spot" if symbol in spot_pairs else "futures"
+    for market, symbol in registry.listings("bitget", ("spot", "futures")):
         data = fetch_order_book(market, symbol)
 
         if data and "data" in data and data["data"]["bids"] and data["data"]["asks"]:  # 🛡️ Check if bids/asks list is not empty
             best_bid = float(data["data"]["bids"][0][0])  # ✅ Best buy price
             volume = sum(float(order[1]) for order in data["data"]["bids"])  # Calculate total volume from bids
 
-            if symbol in previous_prices and symbol in previous_volumes:
-                check_spike_alert(symbol, market, previous_prices[symbol], best_bid, previous_volumes[symbol], volume)
+            key = f"{market}:{symbol}"  # Dono markets mein same symbol alag track ho
+            previous = store.get(key)
+            if previous:
+                check_spike_alert(symbol, market, previous[0], best_bid, previous[1], volume)
 
             # 🔄 Update previous price and volume
-            previous_prices[symbol] = best_bid
-            previous_volumes[symbol] = volume
+            store.set(key, best_bid, volume)
         else:
             print(f"No valid data for {symbol} in {market}, skipping...")
+    store.flush()
+
+# 📡 WebSocket mode: har depth push ko window ke shuru wale snapshot se compare karo
+def run_stream():
+    spot_pairs = get_all_trading_pairs("spot")
+    futures_pairs = get_all_trading_pairs("futures")
+
+    latest = {}     # (market, symbol) -> (best_bid, volume)
+    baseline = {}   # (market, symbol) -> window shuru hone pe (best_bid, volume)
+
+    def on_depth(event):
+        bids = event.data["bids"]
+        if not bids or not event.data["asks"]:
+            return
+        key = (event.market, event.symbol)
+        best_bid = bids[0][0]
+        volume = sum(size for _, size in bids)
+        latest[key] = (best_bid, volume)
+        if key in baseline:
+            prev_price, prev_volume = baseline[key]
+            if check_spike_alert(event.symbol, event.market, prev_price, best_bid, prev_volume, volume):
+                baseline[key] = (best_bid, volume)  # Ek spike pe ek hi alert
+        else:
+            baseline[key] = (best_bid, volume)
+
+    def on_window():
+        baseline.clear()
+        baseline.update(latest)
+
+    subs = (market_stream.subscriptions_for("depth", "spot", spot_pairs)
+            + market_stream.subscriptions_for("depth", "futures", futures_pairs))
+    market_stream.run_stream(market_stream.BitgetProtocol(), subs, on_depth, tick=on_window, tick_interval=STREAM_WINDOW)
 
 # ✅ Run the function
 if __name__ == "__main__":
-    check_and_alert()
+    if MARKET_DATA_MODE == "stream":
+        run_stream()
+    elif MARKET_DATA_MODE == "bulk":
+        run_bulk()
+    else:
+        check_and_alert()
@@ -0,0 +1,49 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from rate_limit import limiter, body_code
+
+# === SHARED HTTP CLIENT ===
+# Sab scanners isi session ko use karte hain taake har host ka TCP/TLS
+# connection keep-alive se reuse ho, har request pe naya handshake na ho.
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", 10))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+POOL_CONNECTIONS = 10  # Kitne hosts ke pools cache karne hain
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))  # Har host pe kitne connections
+
+def build_session():
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=("GET",),  # POST (alerts) dobara bhejna duplicate message banata hai
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+session = build_session()
+
+def request(method, url, timeout=None, **kwargs):
+    if limiter is None:
+        return session.request(method, url, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+    # Exchange ke token bucket se ijazat lo; rate limit pe (sirf GET) bucket ke pause ke baad dobara
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire(url, kwargs.get("params"))
+        response = session.request(method, url, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+        limited = limiter.feedback(url, response.status_code, body_code(response), response.headers.get("Retry-After"))
+        if not limited or method != "GET" or attempt == MAX_RETRIES:
+            return response
+    return response
+
+def get(url, params=None, timeout=None, **kwargs):
+    return request("GET", url, params=params, timeout=timeout, **kwargs)
+
+def post(url, data=None, timeout=None, **kwargs):
+    return request("POST", url, data=data, timeout=timeout, **kwargs)
@@ -0,0 +1,189 @@
+import numpy as np
+
+# === BATCHED INDICATOR ENGINE ===
+# Saare functions (symbols x bars) matrix lete hain aur har symbol ke liye ek
+# saath calculate karte hain. 1-D array do to 1-D wapas milta hai.
+# Chhoti history wale symbols ko stack() left side pe NaN se pad karta hai.
+
+def stack(series_list, length=None):
+    length = length or max((len(s) for s in series_list), default=0)
+    out = np.full((len(series_list), length), np.nan)
+    for i, s in enumerate(series_list):
+        s = np.asarray(s, dtype=np.float64)[-length:]
+        if len(s):
+            out[i, length - len(s):] = s
+    return out
+
+def as_matrix(x):
+    x = np.asarray(x, dtype=np.float64)
+    return (x[None, :], True) if x.ndim == 1 else (x, False)
+
+def restore(out, was_1d):
+    return out[0] if was_1d else out
+
+def shift(x, n=1):
+    out = np.full_like(x, np.nan)
+    out[:, n:] = x[:, :-n]
+    return out
+
+def linear_filter(u, decay):
+    # s[t] = decay * s[t-1] + u[t], poori matrix pe. Chunks mein closed form:
+    # s = decay^j * (decay * s_prev + cumsum(u / decay^j)), chunk itna chhota
+    # rakhte hain ke decay^-j overflow na kare.
+    rows, bars = u.shape
+    out = np.empty((rows, bars))
+    chunk = max(1, min(bars, int(200 / -np.log(decay)))) if 0 < decay < 1 else 1
+    powers = decay ** np.arange(chunk)
+    prev = np.zeros(rows)
+    for start in range(0, bars, chunk):
+        block = u[:, start:start + chunk]
+        w = powers[:block.shape[1]]
+        out[:, start:start + block.shape[1]] = w * (decay * prev[:, None] + np.cumsum(block / w, axis=1))
+        prev = out[:, start + block.shape[1] - 1]
+    return out
+
+def seeded_ema(x, period, alpha):
+    # Pehli `period` valid values ka SMA seed, phir recursive smoothing.
+    # alpha = 1/period -> Wilder (RMA), alpha = 2/(period+1) -> normal EMA
+    rows, bars = x.shape
+    valid = ~np.isnan(x)
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), bars)
+    gaps = (np.cumsum(valid[:, ::-1], axis=1)[:, ::-1] > 0) & ~valid
+    gaps &= np.arange(bars) > first[:, None]
+    if gaps.any():
+        return seeded_ema_loop(x, period, alpha)
+
+    # Seed bar pe seed inject karo, us ke baad alpha * x
+    seed_at = first + period - 1
+    u = np.where(np.arange(bars) > seed_at[:, None], alpha * np.nan_to_num(x), 0.0)
+    ok = seed_at < bars
+    csum = np.cumsum(np.nan_to_num(x), axis=1)
+    u[ok, seed_at[ok]] = csum[ok, seed_at[ok]] / period
+    out = linear_filter(u, 1 - alpha)
+    out[np.arange(bars) < seed_at[:, None]] = np.nan
+    out[~valid] = np.nan
+    return out
+
+def seeded_ema_loop(x, period, alpha):
+    # Beech mein NaN wali series ke liye bar-by-bar version (NaN skip hota hai)
+    rows, bars = x.shape
+    out = np.full((rows, bars), np.nan)
+    count = np.zeros(rows, dtype=np.int64)
+    total = np.zeros(rows)
+    state = np.full(rows, np.nan)
+    for t in range(bars):
+        v = x[:, t]
+        valid = ~np.isnan(v)
+        count += valid
+        seeding = valid & (count <= period)
+        total[seeding] += v[seeding]
+        seeded = valid & (count == period)
+        state[seeded] = total[seeded] / period
+        rolling = valid & (count > period)
+        state[rolling] += alpha * (v[rolling] - state[rolling])
+        out[:, t] = np.where(valid & (count >= period), state, np.nan)
+    return out
+
+def pandas_ewm(x, com):
+    # pandas ewm(com=com, adjust=True).mean() jaisa hi: weighted sum / weights,
+    # NaN pe dono decay hote hain is liye pichli value hi rehti hai
+    decay = 1 - 1 / (1 + com)
+    observed = ~np.isnan(x)
+    numerator = linear_filter(np.where(observed, x, 0.0), decay)
+    weights = linear_filter(observed.astype(np.float64), decay)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(weights > 0, numerator / weights, np.nan)
+
+def ema(x, period):
+    x, was_1d = as_matrix(x)
+    return restore(seeded_ema(x, period, 2 / (period + 1)), was_1d)
+
+def rsi(close, period=14):
+    close, was_1d = as_matrix(close)
+    delta = close - shift(close)
+    with np.errstate(invalid="ignore"):
+        gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0))
+        loss = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0))
+    avg_gain = seeded_ema(gain, period, 1 / period)
+    avg_loss = seeded_ema(loss, period, 1 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    out[np.isnan(avg_gain)] = np.nan
+    return restore(out, was_1d)
+
+def rsi_sma(close, period=14):
+    # liq_atr / low_short wala RSI: pichle `period` changes ka simple average (Cutler)
+    close, was_1d = as_matrix(close)
+    delta = close - shift(close)
+    with np.errstate(invalid="ignore"):
+        avg_gain = rolling(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0)), period, np.mean)
+        avg_loss = rolling(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0)), period, np.mean)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    out[np.isnan(avg_gain)] = np.nan
+    return restore(out, was_1d)
+
+def macd(close, fast=12, slow=26, signal=9):
+    close, was_1d = as_matrix(close)
+    line = seeded_ema(close, fast, 2 / (fast + 1)) - seeded_ema(close, slow, 2 / (slow + 1))
+    signal_line = seeded_ema(line, signal, 2 / (signal + 1))
+    hist = line - signal_line
+    return restore(line, was_1d), restore(signal_line, was_1d), restore(hist, was_1d)
+
+def true_range(high, low, close):
+    prev_close = shift(close)
+    with np.errstate(invalid="ignore"):
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return tr
+
+def atr(high, low, close, period=14):
+    high, was_1d = as_matrix(high)
+    low, _ = as_matrix(low)
+    close, _ = as_matrix(close)
+    return restore(seeded_ema(true_range(high, low, close), period, 1 / period), was_1d)
+
+# mean/sum/min/max ke liye har window dobara scan nahi: power-of-two blocks (O(bars * log length))
+ROLLING_UFUNCS = {np.mean: np.add, np.sum: np.add, np.min: np.minimum, np.max: np.maximum}
+
+def rolling_reduce(x, length, ufunc):
+    # out[:, i] = ufunc.reduce(x[:, i:i + length]); block[i] = x[i:i + size] ka reduce,
+    # length ke binary bits wale blocks jod kar window banti hai. NaN window mein ho to NaN.
+    count = x.shape[1] - length + 1
+    result, block, size, offset, rem = None, x, 1, 0, length
+    while True:
+        if rem & 1:
+            piece = block[:, offset:offset + count]
+            result = piece.copy() if result is None else ufunc(result, piece)
+            offset += size
+        rem >>= 1
+        if not rem:
+            return result
+        block = ufunc(block[:, :-size], block[:, size:])
+        size *= 2
+
+def rolling(x, length, func):
+    out = np.full_like(x, np.nan)
+    if x.shape[1] >= length:
+        ufunc = ROLLING_UFUNCS.get(func)
+        if ufunc is not None:
+            out[:, length - 1:] = rolling_reduce(x, length, ufunc)
+            if func is np.mean:
+                out /= length
+        else:
+            windows = np.lib.stride_tricks.sliding_window_view(x, length, axis=1)
+            out[:, length - 1:] = func(windows, axis=-1)
+    return out
+
+def kdj(high, low, close, length=14, com=2):
+    # rsi_kdj / scalp_rsi wala KDJ: rolling min/max, phir pandas ewm(com=2)
+    high, was_1d = as_matrix(high)
+    low, _ = as_matrix(low)
+    close, _ = as_matrix(close)
+    low_min = rolling(low, length, np.min)
+    high_max = rolling(high, length, np.max)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsv = (close - low_min) / (high_max - low_min) * 100
+    k = pandas_ewm(rsv, com)
+    d = pandas_ewm(k, com)
+    j = 3 * k - 2 * d
+    return restore(k, was_1d), restore(d, was_1d), restore(j, was_1d)
@@ -0,0 +1,95 @@
+import time
+from collections import deque
+from candle_store import store as candle_store
+from coalesce import Coalescer
+
+# === INCREMENTAL KLINE CACHE ===
+# Har (exchange, symbol, interval) ke liye aakhri `size` candles ek ring buffer
+# (deque maxlen) mein rakhte hain. Har cycle sirf last cached candle se aage
+# wali candles mangwate hain aur abhi ban rahi (forming) candle ko replace karte hain.
+# Store diya ho to khali buffer disk se warm start hota hai aur closed candles
+# wahan append hoti hain.
+# Same key ke saath-saath aane wale callers (threads / strategies) ek hi fetch share
+# karte hain, aur COALESCE_TTL tak result dobara fetch nahi hota.
+DEFAULT_SIZE = 100
+
+class KlineCache:
+    def __init__(self, size=DEFAULT_SIZE, store=candle_store):
+        self.size = size
+        self.store = store
+        self.buffers = {}
+        self.coalescer = Coalescer()
+
+    def last_timestamp(self, exchange, symbol, interval):
+        buf = self.buffers.get((exchange, symbol, interval))
+        return int(buf[-1][0]) if buf else None
+
+    def is_stale(self, buf):
+        # Agar process itni der ruka raha ke gap poore buffer se bara hai to full refetch
+        if len(buf) < 2:
+            return True
+        spacing = int(buf[-1][0]) - int(buf[-2][0])
+        return time.time() * 1000 - int(buf[-1][0]) > spacing * (self.size - 1)
+
+    def get(self, exchange, symbol, interval, fetch):
+        # fetch(start) -> candles (purani se nayi) jin ka timestamp >= start ho,
+        # start None ho to poora lookback. Fail hone pe None return kare.
+        key = (exchange, symbol, interval)
+        return self.coalescer.get(key, lambda: self.refresh(key, fetch))
+
+    def refresh(self, key, fetch):
+        buf = self.buffers.get(key)
+        if buf is None and self.store is not None:
+            buf = self.warm_start(key)
+        if buf is not None and self.is_stale(buf):
+            buf = None
+
+        rows = fetch(int(buf[-1][0]) if buf else None)
+        if rows is None:
+            return None
+
+        if buf is None:
+            buf = deque(maxlen=self.size)
+            self.buffers[key] = buf
+        self.merge(buf, rows)
+        if self.store is not None and len(buf) > 1:
+            self.persist(key, buf)
+        return list(buf)
+
+    def warm_start(self, key):
+        stored = self.store.read(*key, limit=self.size)
+        if not len(stored):
+            return None
+        buf = deque(stored.rows(), maxlen=self.size)
+        self.buffers[key] = buf
+        return buf
+
+    def persist(self, key, buf):
+        # Aakhri candle abhi ban rahi hai, sirf us se pehle wali closed candles save
+        last = self.store.last_timestamp(*key)
+        closed = [row for row in list(buf)[:-1] if last is None or int(row[0]) > last]
+        if closed:
+            try:
+                self.store.append(*key, closed)
+            except (OSError, ValueError) as e:
+                print(f"Candle store error for {key}: {e}")
+
+    def merge(self, buf, rows):
+        for row in rows:
+            ts = int(row[0])
+            if buf:
+                last_ts = int(buf[-1][0])
+                if ts < last_ts:
+                    continue
+                if ts == last_ts:
+                    buf[-1] = row  # Forming candle update
+                    continue
+            buf.append(row)
+
+    def clear(self, exchange=None):
+        self.coalescer.clear()
+        if exchange is None:
+            self.buffers.clear()
+        else:
+            for key in [k for k in self.buffers if k[0] == exchange]:
+                del self.buffers[key]
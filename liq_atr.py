@@ -1,8 +1,17 @@
 import requests
+import http_client
 import time
 import datetime
 import os
 from statistics import mean
+from symbol_registry import registry
+from resample import resample_candles
+from candles import parse_bitget
+import market_data
+from scheduler import LastBars, closed_candles, spread, wait_for_close
+from sharding import shard
+from alert_dedup import dedup
+import notifier
 
 # Telegram config
 BOT_TOKEN = os.getenv("TOKEN")
@@ -14,35 +23,29 @@ RSI_OVERBOUGHT = 85
 RSI_OVERSOLD = 15
 ATR_MULTIPLIER = 1.5
 VOLUME_SPIKE_MULTIPLIER = 2
+BASE_LIMIT = 500  # 1m candles, in se 100 5m candles banti hain
+
+last_bars = LastBars()
+notify = notifier.telegram(CHAT_ID, BOT_TOKEN)
 
 def send_telegram_alert(msg):
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-    data = {"chat_id": CHAT_ID, "text": msg}
-    try:
-        requests.post(url, data=data)
-    except Exception as e:
-        print("Telegram error:", e)
+    notify.send(msg)
 
 def get_usdt_pairs():
-    url = "https://api.bitget.com/api/v2/mix/market/tickers?productType=USDT-FUTURES"
-    try:
-        res = requests.get(url, timeout=10)
-        data = res.json()
-        return [x['symbol'] for x in data.get('data', [])]
-    except Exception as e:
-        print("Error fetching pairs:", e)
-        return []
+    return registry.names("bitget", "futures")  # USDT-M perpetuals, TTL cache
 
-def get_kline_v3(symbol, interval, limit=100):
+def get_kline_v3(symbol, interval, limit=100, start=None):
     url = f"https://api.bitget.com/api/v3/mix/market/candles"  # Bitget V3 API URL
     params = {
         "symbol": symbol,
         "granularity": interval,
         "limit": limit
     }
+    if start is not None:
+        params["startTime"] = start  # Sirf last cached candle se aage
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()  # Raises an error for bad responses
         data = response.json()
 
@@ -51,27 +54,14 @@ def get_kline_v3(symbol, interval, limit=100):
             print(f"API Error for {symbol}: {data.get('msg')}")
             return []
 
-        # Assuming the expected structure of the response data
-        if 'data' in data and isinstance(data['data'], list):
-            candles = []
-            for x in data['data']:
-                if len(x) >= 7:  # Validate the length of the data
-                    try:
-                        timestamp = int(x[0])
-                        open_price = float(x[1])
-                        high_price = float(x[2])
-                        low_price = float(x[3])
-                        close_price = float(x[4])
-                        volume = float(x[5])
-
-                        candles.append([timestamp, open_price, high_price, low_price, close_price, volume])
-                    except ValueError as ve:
-                        print(f"Conversion error for data: {x}, error: {ve}")
-            return candles
-        else:
+        # Seedha columnar arrays mein parse, per-row float() loop ke baghair
+        candles = parse_bitget(data)
+        if not len(candles):
             print("No valid data found for symbol:", symbol)
-            return []
-    
+        return candles
+    except ValueError as e:
+        print(f"Kline parse error for {symbol}: {e}")
+        return []
     except requests.exceptions.RequestException as e:
         print(f"Kline request error for {symbol}: {e}")
         return []
@@ -117,24 +107,33 @@ def calculate_liquidation(entry, side):
     else:
         return round(entry + ((entry / LEVERAGE) * 0.98), 6)
 
-def analyze(symbol):
+def analyze(symbol, base=None):
     tf_map = {'1m': 60, '3m': 180, '5m': 300}
+    # Sirf 1m mangwao, 3m aur 5m usi snapshot se local banti hain
+    if base is None:
+        # Poori 500 ki 1m history runtime wale cache ("bitget-futures") mein, har cycle sirf nayi candles
+        base = market_data.fetch_klines("bitget", "futures", symbol, "1m", BASE_LIMIT)
+        if base is None:
+            return
     for tf, sec in tf_map.items():
-        candles = get_kline(symbol, sec, 100)
-        if not candles:
+        # Sirf band ho chuki candles; is tf ki koi nayi bar band nahi hui to skip
+        candles = closed_candles(resample_candles(base, "1m", tf), "bitget", tf).tail(100)
+        if not len(candles) or not last_bars.fresh((symbol, tf), candles.ts[-1]):
             continue
 
-        closes = [x[4] for x in candles]
-        volumes = [x[5] for x in candles]
+        closes = candles.close.tolist()
+        volumes = candles.volume.tolist()
         atr = calculate_atr(candles)
         rsi = calculate_rsi(closes)
         last_volume = volumes[-1]
         avg_volume = mean(volumes[-10:-1])
         body_size = abs(candles[-1][1] - candles[-1][2])
         entry = closes[-1]
-        alert_time = datetime.datetime.utcfromtimestamp(candles[-1][5]/1000 + sec).strftime("%H:%M:%S")
+        alert_time = datetime.datetime.utcfromtimestamp(candles[-1][0]/1000 + sec).strftime("%H:%M:%S")
 
         if rsi >= RSI_OVERBOUGHT and last_volume > avg_volume * VOLUME_SPIKE_MULTIPLIER and body_size > atr * ATR_MULTIPLIER:
+            if not dedup.allow("liq_atr", symbol, "short", tf):
+                continue  # Is tf ka cooldown, baaki tfs phir bhi check
             liq = calculate_liquidation(entry, "SHORT")
             msg = (
                 f"⚠️ {symbol} SHORT Signal ({tf}):\n"
@@ -148,6 +147,8 @@ def analyze(symbol):
             return
 
         if rsi <= RSI_OVERSOLD and last_volume > avg_volume * VOLUME_SPIKE_MULTIPLIER and body_size > atr * ATR_MULTIPLIER:
+            if not dedup.allow("liq_atr", symbol, "long", tf):
+                continue
             liq = calculate_liquidation(entry, "LONG")
             msg = (
                 f"⚡ {symbol} LONG Signal ({tf}):\n"
@@ -163,14 +164,24 @@ def analyze(symbol):
 def main():
     while True:
         try:
+            wait_for_close("bitget", "1m")  # 1m band hote hi (3m/5m bhi isi boundary pe band hoti hain)
             print("⏳ Scanning Bitget Futures...")
-            coins = get_usdt_pairs()
-            for coin in coins:
+            coins = shard.mine(get_usdt_pairs())  # Sirf is worker ke coins
+            for coin in spread(coins):
                 analyze(coin)
-            time.sleep(60)
         except Exception as e:
             print("Main error:", e)
             time.sleep(10)
 
+# === RUNTIME PLUGIN (runtime.py) ===
+SERIES = {"base": ("bitget", "futures", "1m", BASE_LIMIT)}
+EVERY = 60
+
+def universe():
+    return get_usdt_pairs()
+
+def evaluate(symbol, series):
+    analyze(symbol, series["base"])
+
 if __name__ == "__main__":
     main()
@@ -1,13 +1,16 @@
 import os
-import requests
+import http_client
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import time
+from scheduler import spread, wait_for_close
+from sharding import shard
+import notifier
 
 # Telegram Bot config (from environment variables)
 TELEGRAM_TOKEN = os.getenv("TOKEN")
 CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+notify = notifier.telegram(CHAT_ID, TELEGRAM_TOKEN)
 
 # MEXC Futures API endpoint
 BASE_URL = "https://contract.mexc.com/api/v1/contract/kline"
@@ -16,13 +19,11 @@ BASE_URL = "https://contract.mexc.com/api/v1/contract/kline"
 symbols = ['BTC_USDT', 'ETH_USDT', 'XRP_USDT']  # Add/remove as needed
 
 def send_telegram_message(message):
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    payload = {'chat_id': TELEGRAM_CHAT_ID, 'text': message}
-    requests.post(url, data=payload)
+    notify.send(message)
 
 def get_klines(symbol, interval="5m", limit=20):
     params = {"symbol": symbol, "interval": interval, "limit": limit}
-    response = requests.get(BASE_URL, params=params)
+    response = http_client.get(BASE_URL, params=params)
     if response.status_code == 200:
         return response.json()['data']
     return []
@@ -51,27 +52,43 @@ def check_short_signal(candle, rsi_value):
     return False, upper_wick
 
 def run_scanner():
-    for symbol in symbols:
+    for symbol in spread(shard.mine(symbols)):
         klines = get_klines(symbol)
         if len(klines) < 15:
             continue
 
         close_prices = [float(k['close']) for k in klines]
-        rsi_values = calculate_rsi(close_prices)
-
-        last_rsi = rsi_values[-1]
-        last_candle = klines[-2]  # last completed candle
-
-        signal, wick_size = check_short_signal(last_candle, last_rsi)
-        if signal:
-            message = (f"🔴 SHORT Signal Alert!\n"
-                       f"Symbol: {symbol}\n"
-                       f"RSI: {last_rsi:.2f}\n"
-                       f"Upper Wick: {wick_size:.2f}%\n"
-                       f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
-            send_telegram_message(message)
-
-# Run the scanner loop every 5 mins
-while True:
-    run_scanner()
-    time.sleep(300)
+        analyze(symbol, close_prices, klines[-2])  # last completed candle
+
+def analyze(symbol, close_prices, last_candle):
+    rsi_values = calculate_rsi(close_prices)
+    last_rsi = rsi_values[-1]
+
+    signal, wick_size = check_short_signal(last_candle, last_rsi)
+    if signal:
+        message = (f"🔴 SHORT Signal Alert!\n"
+                   f"Symbol: {symbol}\n"
+                   f"RSI: {last_rsi:.2f}\n"
+                   f"Upper Wick: {wick_size:.2f}%\n"
+                   f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        send_telegram_message(message)
+
+# === RUNTIME PLUGIN (runtime.py) ===
+SERIES = {"klines": ("mexc", "futures", "5m", 20)}
+EVERY = 300
+
+def universe():
+    return symbols
+
+def evaluate(symbol, series):
+    candles = series["klines"]
+    if len(candles) < 15:
+        return
+    _, open_price, high_price, _, close_price, _ = candles[-1]  # Runtime sirf band candles deta hai, aakhri hi abhi band hui
+    analyze(symbol, candles.close.tolist(), {'open': open_price, 'high': high_price, 'close': close_price})
+
+# Run the scanner on every 5m candle close
+if __name__ == "__main__":
+    while True:
+        wait_for_close("mexc", "5m")  # 5m candle band hote hi, klines[-2] abhi abhi band hui
+        run_scanner()
@@ -0,0 +1,90 @@
+import http_client
+from candles import Candles, parse_bitget, parse_mexc_spot, parse_mexc_contract
+from kline_cache import KlineCache, DEFAULT_SIZE
+
+# === SHARED MARKET DATA ===
+# Ek (exchange, market, symbol, interval) ki candles ek hi jagah se, Candles ki shakal mein.
+# Har series ka apna incremental KlineCache (disk warm start ke saath), is liye
+# jitni bhi strategies same series maangen, API se sirf nayi candles aati hain.
+MEXC_SPOT_URL = "https://api.mexc.com/api/v3/klines"
+MEXC_CONTRACT_URL = "https://contract.mexc.com/api/v1/contract/kline/{symbol}"
+BITGET_MIX_URL = "https://api.bitget.com/api/v2/mix/market/candles"
+BITGET_SPOT_URL = "https://api.bitget.com/api/v2/spot/market/candles"
+REQUEST_TIMEOUT = 10
+
+MEXC_CONTRACT_INTERVALS = {"1m": "Min1", "5m": "Min5", "15m": "Min15", "30m": "Min30",
+                           "1h": "Min60", "1H": "Min60", "4h": "Hour4", "4H": "Hour4", "1d": "Day1", "1D": "Day1"}
+MEXC_SPOT_INTERVALS = {"1H": "60m", "1h": "60m", "4H": "4h", "1D": "1d"}
+BITGET_SPOT_INTERVALS = {"1m": "1min", "3m": "3min", "5m": "5min", "15m": "15min", "30m": "30min",
+                         "1H": "1h", "4H": "4h", "1D": "1day"}
+
+def fetch_mexc_spot(symbol, interval, limit, start=None):
+    params = {"symbol": symbol, "interval": MEXC_SPOT_INTERVALS.get(interval, interval), "limit": limit}
+    if start is not None:
+        params["startTime"] = start
+    response = http_client.get(MEXC_SPOT_URL, params=params, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        return None
+    return parse_mexc_spot(response.content)
+
+def fetch_mexc_futures(symbol, interval, limit, start=None):
+    params = {"interval": MEXC_CONTRACT_INTERVALS.get(interval, interval)}
+    if start is not None:
+        params["start"] = start // 1000  # Contract API seconds mein start leta hai
+    response = http_client.get(MEXC_CONTRACT_URL.format(symbol=symbol), params=params, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        return None
+    return parse_mexc_contract(response.content).tail(limit)
+
+def fetch_bitget(url, params, start=None):
+    if start is not None:
+        params["startTime"] = start
+    response = http_client.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    if data.get("code") != "00000":
+        print(f"Bitget kline error for {params['symbol']}: {data.get('msg')}")
+        return None
+    return parse_bitget(data)
+
+def fetch_bitget_futures(symbol, interval, limit, start=None):
+    params = {"symbol": symbol, "productType": "usdt-futures", "granularity": interval, "limit": limit}
+    return fetch_bitget(BITGET_MIX_URL, params, start)
+
+def fetch_bitget_spot(symbol, interval, limit, start=None):
+    params = {"symbol": symbol, "granularity": BITGET_SPOT_INTERVALS.get(interval, interval), "limit": limit}
+    return fetch_bitget(BITGET_SPOT_URL, params, start)
+
+FETCHERS = {
+    ("mexc", "spot"): fetch_mexc_spot,
+    ("mexc", "futures"): fetch_mexc_futures,
+    ("bitget", "futures"): fetch_bitget_futures,
+    ("bitget", "spot"): fetch_bitget_spot,
+}
+
+caches = {}  # limit -> KlineCache
+
+def cache_for(limit):
+    size = max(limit, DEFAULT_SIZE)
+    if size not in caches:
+        caches[size] = KlineCache(size=size)
+    return caches[size]
+
+def fetch_klines(exchange, market, symbol, interval, limit=DEFAULT_SIZE):
+    # Purani se nayi candles (aakhri abhi ban rahi ho sakti hai), fail pe None
+    fetch = FETCHERS[(exchange, market)]
+
+    def fetch_rows(start):
+        candles = fetch(symbol, interval, limit, start)
+        return candles.rows() if candles is not None and len(candles) else None
+
+    try:
+        # Cache key mein market bhi, spot aur futures ka same naam ho sakta hai
+        rows = cache_for(limit).get(f"{exchange}-{market}", symbol, interval, fetch_rows)
+    except Exception as e:
+        print(f"Kline fetch error ({exchange} {market} {symbol} {interval}): {e}")
+        return None
+    if not rows:
+        return None
+    return Candles.from_rows(rows).tail(limit)
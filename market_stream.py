@@ -0,0 +1,230 @@
+import os
+import json
+import asyncio
+import websockets
+
+# === WEBSOCKET MARKET DATA ===
+# REST polling ki jagah ticker, candle aur depth channels subscribe karte hain.
+# URLs env se override ho sakte hain taake local stand-in server pe test ho sake.
+BITGET_WS_URL = os.getenv("BITGET_WS_URL", "wss://ws.bitget.com/v2/ws/public")
+MEXC_WS_URL = os.getenv("MEXC_WS_URL", "wss://wbs.mexc.com/ws")
+SUBSCRIBE_BATCH = int(os.getenv("WS_SUBSCRIBE_BATCH", 50))  # Ek subscribe message mein kitne channels
+PING_INTERVAL = 20
+RECONNECT_MAX_DELAY = 60
+
+class Subscription:
+    __slots__ = ("channel", "market", "symbol")
+
+    def __init__(self, channel, market, symbol):
+        self.channel = channel  # "ticker", "depth" ya "candle1m" / "candle5m" ...
+        self.market = market    # "spot" ya "futures"
+        self.symbol = symbol
+
+class Event:
+    __slots__ = ("kind", "exchange", "market", "symbol", "data")
+
+    def __init__(self, kind, exchange, market, symbol, data):
+        self.kind = kind
+        self.exchange = exchange
+        self.market = market
+        self.symbol = symbol
+        self.data = data
+
+    def __repr__(self):
+        return f"Event({self.kind}, {self.exchange}, {self.market}, {self.symbol}, {self.data})"
+
+def to_float_levels(levels):
+    return [[float(level[0]), float(level[1])] for level in levels]
+
+# 🟦 Bitget v2 public channels
+class BitgetProtocol:
+    name = "bitget"
+    max_per_connection = 500  # Bitget 1000 channels/connection allow karta hai, aadhe pe rakhte hain
+    ping_message = "ping"
+    inst_types = {"spot": "SPOT", "futures": "USDT-FUTURES"}
+    markets = {"SPOT": "spot", "USDT-FUTURES": "futures"}
+
+    def __init__(self, url=None):
+        self.url = url or BITGET_WS_URL
+
+    def channel_name(self, sub):
+        if sub.channel == "depth":
+            return "books5"
+        return sub.channel
+
+    def subscribe_messages(self, subs):
+        for i in range(0, len(subs), SUBSCRIBE_BATCH):
+            args = [{
+                "instType": self.inst_types[sub.market],
+                "channel": self.channel_name(sub),
+                "instId": sub.symbol,
+            } for sub in subs[i:i + SUBSCRIBE_BATCH]]
+            yield json.dumps({"op": "subscribe", "args": args})
+
+    def parse(self, raw):
+        if raw == "pong":
+            return []
+        msg = json.loads(raw)
+        arg = msg.get("arg")
+        if not arg or "data" not in msg:
+            if msg.get("event") == "error":
+                print(f"Bitget WS error: {msg}")
+            return []
+
+        market = self.markets.get(arg.get("instType"), "spot")
+        symbol = arg.get("instId")
+        channel = arg.get("channel", "")
+        events = []
+        for item in msg["data"]:
+            if channel == "ticker":
+                events.append(Event("ticker", self.name, market, symbol, {
+                    "price": float(item["lastPr"]),
+                    "bid": float(item.get("bidPr") or 0),
+                    "ask": float(item.get("askPr") or 0),
+                    "volume": float(item.get("baseVolume") or 0),
+                    "ts": int(item.get("ts") or 0),
+                }))
+            elif channel.startswith("books"):
+                events.append(Event("depth", self.name, market, symbol, {
+                    "bids": to_float_levels(item.get("bids", [])),
+                    "asks": to_float_levels(item.get("asks", [])),
+                    "ts": int(item.get("ts") or 0),
+                }))
+            elif channel.startswith("candle"):
+                events.append(Event(channel, self.name, market, symbol, {
+                    "row": [int(item[0])] + [float(x) for x in item[1:6]],
+                }))
+        return events
+
+# 🟩 MEXC spot channels (sirf spot, 30 subscriptions per connection)
+class MexcProtocol:
+    name = "mexc"
+    max_per_connection = 30
+    ping_message = json.dumps({"method": "PING"})
+    intervals = {"candle1m": "Min1", "candle5m": "Min5", "candle15m": "Min15", "candle1h": "Min60"}
+
+    def __init__(self, url=None):
+        self.url = url or MEXC_WS_URL
+
+    def channel_name(self, sub):
+        if sub.channel == "ticker":
+            return f"spot@public.bookTicker.v3.api@{sub.symbol}"
+        if sub.channel == "depth":
+            return f"spot@public.limit.depth.v3.api@{sub.symbol}@5"
+        return f"spot@public.kline.v3.api@{sub.symbol}@{self.intervals[sub.channel]}"
+
+    def subscribe_messages(self, subs):
+        for i in range(0, len(subs), SUBSCRIBE_BATCH):
+            params = [self.channel_name(sub) for sub in subs[i:i + SUBSCRIBE_BATCH]]
+            yield json.dumps({"method": "SUBSCRIPTION", "params": params})
+
+    def parse(self, raw):
+        msg = json.loads(raw)
+        channel = msg.get("c")
+        data = msg.get("d")
+        if not channel or data is None:
+            return []
+
+        symbol = msg.get("s") or channel.split("@")[2]
+        ts = int(msg.get("t") or 0)
+        if "bookTicker" in channel:
+            bid, ask = float(data["b"]), float(data["a"])
+            return [Event("ticker", self.name, "spot", symbol, {
+                "price": (bid + ask) / 2, "bid": bid, "ask": ask, "volume": 0.0, "ts": ts,
+            })]
+        if "depth" in channel:
+            return [Event("depth", self.name, "spot", symbol, {
+                "bids": [[float(b["p"]), float(b["v"])] for b in data.get("bids", [])],
+                "asks": [[float(a["p"]), float(a["v"])] for a in data.get("asks", [])],
+                "ts": ts,
+            })]
+        if "kline" in channel:
+            k = data["k"]
+            kind = {v: k_ for k_, v in self.intervals.items()}.get(k.get("i"), "candle")
+            return [Event(kind, self.name, "spot", symbol, {
+                "row": [int(k["t"]) * 1000, float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]), float(k["v"])],
+            })]
+        return []
+
+class MarketStream:
+    def __init__(self, protocol, subscriptions, handler, tick=None, tick_interval=60):
+        self.protocol = protocol
+        self.subscriptions = list(subscriptions)
+        self.handler = handler          # handler(event) har push pe
+        self.tick = tick                # tick() har tick_interval seconds pe
+        self.tick_interval = tick_interval
+        self.running = False
+
+    def chunks(self):
+        size = self.protocol.max_per_connection
+        return [self.subscriptions[i:i + size] for i in range(0, len(self.subscriptions), size)]
+
+    async def run(self):
+        self.running = True
+        tasks = [asyncio.create_task(self.connection_loop(chunk)) for chunk in self.chunks()]
+        if self.tick:
+            tasks.append(asyncio.create_task(self.tick_loop()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stop(self):
+        self.running = False
+
+    async def tick_loop(self):
+        while self.running:
+            await asyncio.sleep(self.tick_interval)
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Stream tick error: {e}")
+
+    async def connection_loop(self, subs):
+        delay = 1
+        while self.running:
+            try:
+                async with websockets.connect(self.protocol.url, ping_interval=None) as ws:
+                    delay = 1
+                    # 🔄 Har (re)connect pe batches mein resubscribe
+                    for message in self.protocol.subscribe_messages(subs):
+                        await ws.send(message)
+                        await asyncio.sleep(0.1)  # Exchanges ~10 messages/sec allow karte hain
+                    pinger = asyncio.create_task(self.ping_loop(ws))
+                    try:
+                        async for raw in ws:
+                            if not self.running:
+                                break
+                            self.dispatch(raw)
+                    finally:
+                        pinger.cancel()
+            except (OSError, websockets.WebSocketException) as e:
+                print(f"{self.protocol.name} WS disconnected: {e}, reconnecting in {delay}s")
+            if self.running:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def ping_loop(self, ws):
+        while True:
+            await asyncio.sleep(PING_INTERVAL)
+            await ws.send(self.protocol.ping_message)
+
+    def dispatch(self, raw):
+        try:
+            events = self.protocol.parse(raw)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            print(f"{self.protocol.name} WS parse error: {e}")
+            return
+        for event in events:
+            try:
+                self.handler(event)
+            except Exception as e:
+                print(f"Stream handler error for {event.symbol}: {e}")
+
+def subscriptions_for(channel, market, symbols):
+    return [Subscription(channel, market, symbol) for symbol in symbols]
+
+def run_stream(protocol, subscriptions, handler, tick=None, tick_interval=60):
+    stream = MarketStream(protocol, subscriptions, handler, tick, tick_interval)
+    asyncio.run(stream.run())
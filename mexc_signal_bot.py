@@ -1,69 +1,97 @@
-import requests
+import os
+import http_client
 import time
-from telegram import Bot
+import market_stream
+from coalesce import Coalescer
+import notifier
 
-MEXC API Endpoint for order book and market data
+# MEXC API Endpoint for order book and market data
 
-MEXC_ORDER_BOOK_URL = "https://api.mexc.com/api/v3/depth" 
+MEXC_ORDER_BOOK_URL = "https://api.mexc.com/api/v3/depth"
 MEXC_TICKER_URL = "https://api.mexc.com/api/v3/ticker/price"
 
-Telegram Bot Setup
+# Telegram Bot Setup
 
-TELEGRAM_BOT_TOKEN = "Token"
-TELEGRAM_CHAT_ID = "your_chat_id" 
-bot = Bot(token=TELEGRAM_BOT_TOKEN)
+TELEGRAM_BOT_TOKEN = os.getenv("TOKEN")
+TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+notify = notifier.telegram(TELEGRAM_CHAT_ID, TELEGRAM_BOT_TOKEN, parse_mode="Markdown")
 
-def fetch_order_book(symbol): 
-params = {"symbol": symbol, "limit": 50}  # Fetch top 50 orders
-response = requests.get(MEXC_ORDER_BOOK_URL, params=params) 
-if response.status_code == 200:
-return response.json() 
-return None
+MARKET_DATA_MODE = os.getenv("MARKET_DATA_MODE", "rest")  # "rest" ya "stream"
+SIGNAL_COOLDOWN = 60  # Stream mode mein ek coin pe 1 min mein ek hi signal
 
-def fetch_price(symbol): 
-params = {"symbol": symbol} 
-response = requests.get(MEXC_TICKER_URL, params=params) 
-if response.status_code == 200: 
-return float(response.json()["price"]) 
-return None
+order_books = Coalescer()  # Same coin ki depth ek waqt mein ek hi request
 
-def analyze_trade(symbol): 
-order_book = fetch_order_book(symbol) 
-if not order_book: 
-return None
+def fetch_raw_order_book(symbol):
+    params = {"symbol": symbol, "limit": 50}  # Fetch top 50 orders
+    response = http_client.get(MEXC_ORDER_BOOK_URL, params=params)
+    if response.status_code == 200:
+        return response.json()
+    return None
 
-bids = order_book["bids"]  # Buy orders
-asks = order_book["asks"]  # Sell orders
+def fetch_order_book(symbol):
+    return order_books.get(("mexc", "depth", symbol), lambda: fetch_raw_order_book(symbol))
 
-if not bids or not asks:
+def fetch_price(symbol):
+    params = {"symbol": symbol}
+    response = http_client.get(MEXC_TICKER_URL, params=params)
+    if response.status_code == 200:
+        return float(response.json()["price"])
     return None
 
-highest_bid = float(bids[0][0])
-lowest_ask = float(asks[0][0])
-spread = abs(highest_bid - lowest_ask)
+def analyze_trade(symbol):
+    order_book = fetch_order_book(symbol)
+    if not order_book:
+        return None
+    return analyze_order_book(symbol, order_book["bids"], order_book["asks"])
+
+def analyze_order_book(symbol, bids, asks):
+    # bids = Buy orders, asks = Sell orders
+    if not bids or not asks:
+        return None
 
-if spread > 0.5 * highest_bid / 100:  # Large spread, possible move
-    direction = "Short" if highest_bid > lowest_ask else "Long"
-    expected_move = round(spread / highest_bid * 100, 2)  # % move prediction
-    return symbol, direction, highest_bid, expected_move
+    highest_bid = float(bids[0][0])
+    lowest_ask = float(asks[0][0])
+    spread = abs(highest_bid - lowest_ask)
 
-return None
+    if spread > 0.5 * highest_bid / 100:  # Large spread, possible move
+        direction = "Short" if highest_bid > lowest_ask else "Long"
+        expected_move = round(spread / highest_bid * 100, 2)  # % move prediction
+        return symbol, direction, highest_bid, expected_move
+
+    return None
 
 def send_signal(symbol, direction, entry_price, expected_move):
-message = (f"🚀 Trade Alert 🚀\n"
-           f"🔹 Coin: {symbol}\n" 
-           f"📉 Trade Type: {direction}\n" 
-           f"💰 Entry Price: {entry_price}\n" 
-           f"📊 Expected Move: {expected_move}%\n") 
-bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message, parse_mode="Markdown")
-
-def main(): altcoins = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]  # Add more as needed 
-while True:
-for coin in altcoins: 
-trade_signal = analyze_trade(coin) 
-if trade_signal:
-send_signal(*trade_signal) 
-time.sleep(60)  # Check every 1 min
-
-if __name__ == "__main__": 
-main()
+    message = (f"🚀 Trade Alert 🚀\n"
+               f"🔹 Coin: {symbol}\n"
+               f"📉 Trade Type: {direction}\n"
+               f"💰 Entry Price: {entry_price}\n"
+               f"📊 Expected Move: {expected_move}%\n")
+    notify.send(message)
+
+def run_stream(altcoins):
+    last_signal = {}
+
+    def on_depth(event):
+        trade_signal = analyze_order_book(event.symbol, event.data["bids"], event.data["asks"])
+        now = time.time()
+        if trade_signal and now - last_signal.get(event.symbol, 0) >= SIGNAL_COOLDOWN:
+            last_signal[event.symbol] = now
+            send_signal(*trade_signal)
+
+    subs = market_stream.subscriptions_for("depth", "spot", altcoins)
+    market_stream.run_stream(market_stream.MexcProtocol(), subs, on_depth)
+
+def main():
+    altcoins = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"]  # Add more as needed
+    if MARKET_DATA_MODE == "stream":
+        run_stream(altcoins)
+        return
+    while True:
+        for coin in altcoins:
+            trade_signal = analyze_trade(coin)
+            if trade_signal:
+                send_signal(*trade_signal)
+        time.sleep(60)  # Check every 1 min
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,53 @@
-import requests
-import time
-import pandas as pd
+import http_client
 from ta.momentum import RSIIndicator
 from datetime import datetime
 import pytz
-import telebot
 import os
+from symbol_registry import registry
+from resample import resample_candles
+from candles import parse_mexc_spot
+from scheduler import closed_candles, spread, wait_for_close
+from priority import PriorityTiers
+from sharding import shard
+from alert_dedup import dedup
+import notifier
 
 # --- CONFIG ---
 API_URL = "https://api.mexc.com"
-TELEGRAM_TOKEN = "TOKEN"
-CHAT_ID = "TELEGRAM_CHAT_ID"
+TELEGRAM_TOKEN = os.getenv("TOKEN")
+CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 INTERVAL_15M = "15m"
 INTERVAL_1H = "1h"
+BASE_LIMIT = 400  # 15m candles, in se 100 1h candles banti hain
 
-bot = telebot.TeleBot(TOKEN)
+notify = notifier.telegram(CHAT_ID, TELEGRAM_TOKEN)
+priority = PriorityTiers("mexc", "spot-ticker")  # Liquid / volatile coins har cycle, baaki kabhi kabhi
 
 def send_alert(message):
-    bot.send_message(CHAT_ID, message)
+    notify.send(message)
 
 def fetch_symbols():
-    url = f"{API_URL}/api/v3/exchangeInfo"
-    data = requests.get(url).json()
-    symbols = [s['symbol'] for s in data['symbols'] if s['quoteAsset'] == 'USDT' and s['status'] == 'TRADING']
-    return symbols
-
-def fetch_ohlcv(symbol, interval, limit=100):
-    url = f"{API_URL}/api/v3/klines?symbol={symbol}&interval={interval}&limit={limit}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        return pd.DataFrame(data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'number_of_trades',
-            'taker_buy_base', 'taker_buy_quote', 'ignore'
-        ])
-    return None
-
-def analyze_symbol(symbol):
-    candles_15m = fetch_ohlcv(symbol, INTERVAL_15M)
-    candles_1h = fetch_ohlcv(symbol, INTERVAL_1H)
+    return registry.symbols("mexc", "spot", where=lambda s: s['status'] == 'TRADING')
+
+def fetch_timeframes(symbol):
+    # Sirf 15m mangwao, 1h usi snapshot se local banti hai
+    url = f"{API_URL}/api/v3/klines?symbol={symbol}&interval={INTERVAL_15M}&limit={BASE_LIMIT}"
+    response = http_client.get(url)
+    if response.status_code != 200:
+        return None, None
+    return split_timeframes(closed_candles(parse_mexc_spot(response.content), "mexc", INTERVAL_15M))
+
+def split_timeframes(base):
+    if not len(base):
+        return None, None
+    hourly = resample_candles(base, INTERVAL_15M, INTERVAL_1H)
+    return base.tail(100).to_frame(), hourly.tail(100).to_frame()
+
+def analyze_symbol(symbol, base=None):
+    if base is None:
+        candles_15m, candles_1h = fetch_timeframes(symbol)
+    else:
+        candles_15m, candles_1h = split_timeframes(base)
 
     if candles_15m is None or candles_1h is None or len(candles_15m) < 20 or len(candles_1h) < 20:
         return
@@ -58,6 +66,8 @@ def analyze_symbol(symbol):
     take_profit = round(entry_price * 1.01, 4)     # 1% TP
 
     if 20 <= last_rsi_15m <= 25:
+        if not dedup.allow("mexc_spot", symbol, "long", INTERVAL_15M):
+            return  # Cooldown mein, dobara alert nahi
         confirmations = []
 
         if last_rsi_1h < 30:
@@ -85,13 +95,24 @@ def main():
     print(f"[INFO] {len(symbols)} coins loaded.")
     
     while True:
-        for symbol in symbols:
-            if symbol.endswith("USDT"):
-                try:
-                    analyze_symbol(symbol)
-                except Exception as e:
-                    print(f"[ERROR] {symbol}: {e}")
-        time.sleep(60)
+        wait_for_close("mexc", INTERVAL_15M)  # 15m candle band hote hi
+        symbols = shard.mine(universe())  # Symbols TTL pe refresh, tiers ticker refresh pe
+        print(f"[INFO] Scanning {len(symbols)} coins ({priority.summary()})")
+        for symbol in spread(symbols):
+            try:
+                analyze_symbol(symbol)
+            except Exception as e:
+                print(f"[ERROR] {symbol}: {e}")
+
+# === RUNTIME PLUGIN (runtime.py) ===
+SERIES = {"base": ("mexc", "spot", INTERVAL_15M, BASE_LIMIT)}
+EVERY = 900
+
+def universe():
+    return priority.due([symbol for symbol in fetch_symbols() if symbol.endswith("USDT")])
+
+def evaluate(symbol, series):
+    analyze_symbol(symbol, series["base"])
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,6 @@
 import os
-import smtplib
 import requests
-import telebot
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import notifier
 
 # Environment Variables Load karna
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
@@ -13,8 +10,9 @@ TO_EMAIL = os.getenv("TO_EMAIL")
 TELEGRAM_BOT_TOKEN = os.getenv("TOKEN-2")  # New bot ka token use ho raha hai
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-# Telegram Bot Initialize karna
-bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN)
+# Telegram aur Email notifiers (pooled session, ek hi SMTP login)
+telegram_notify = notifier.telegram(TELEGRAM_CHAT_ID, TELEGRAM_BOT_TOKEN)
+email_notify = notifier.email(EMAIL_USER, EMAIL_PASSWORD, TO_EMAIL)
 
 # News Fetch Karne Ka Function
 def get_latest_news():
@@ -38,29 +36,13 @@ def analyze_impact(title):
 
 # Email Send Karne Ka Function
 def send_email(subject, body):
-    msg = MIMEMultipart()
-    msg["From"] = EMAIL_USER
-    msg["To"] = TO_EMAIL
-    msg["Subject"] = subject
-    msg.attach(MIMEText(body, "plain"))
-
-    try:
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(EMAIL_USER, EMAIL_PASSWORD)
-        server.sendmail(EMAIL_USER, TO_EMAIL, msg.as_string())
-        server.quit()
+    if email_notify.send(body, subject):
         print("Email Sent Successfully!")
-    except Exception as e:
-        print("Email Sending Error:", str(e))
 
 # Telegram Message Send Karne Ka Function
 def send_telegram_message(message):
-    try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
-        print("Telegram Alert Sent!")
-    except Exception as e:
-        print("Telegram Error:", str(e))
+    if telegram_notify.send(message):
+        print("Telegram Alert Queued!")
 
 # Main Execution
 news = get_latest_news()
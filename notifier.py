@@ -0,0 +1,150 @@
+import os
+import time
+import atexit
+import smtplib
+import threading
+from email.mime.text import MIMEText
+import http_client
+from alert_queue import alerts, TELEGRAM_API, retry_after
+
+# === UNIFIED NOTIFIER ===
+# Saare scanners alerts isi se bhejte hain (telebot / telegram.Bot / raw requests.post /
+# har email pe naya smtplib connection ki jagah). Sink koi bhi object jis mein
+# send(text, subject=None) ho (koi base class nahi):
+#   TelegramSink  http_client ke pooled keep-alive session pe; default alert_queue ke
+#                 through (rate limits, 429 retry), NOTIFY_QUEUE=0 pe seedha request
+#   SMTPSink      ek hi login kiya hua SMTP connection, toot jaye to khud dobara connect
+#   PrintSink     sirf console
+# Har alert ab sirf ek request hai, har dafa TLS handshake / SMTP login nahi.
+NOTIFY_QUEUE = os.getenv("NOTIFY_QUEUE", "1") != "0"
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SMTP_TIMEOUT = 20
+SMTP_IDLE = 60  # Itni der idle connection ko bhejne se pehle NOOP se check karo
+SEND_TIMEOUT = 10
+
+class PrintSink:
+    def send(self, text, subject=None):
+        print(f"{subject}\n{text}" if subject else text)
+        return True
+
+class TelegramSink:
+    def __init__(self, chat_id=None, token=None, parse_mode=None, queued=NOTIFY_QUEUE):
+        self.chat_id = chat_id or os.getenv("TELEGRAM_CHAT_ID")
+        self.token = token or os.getenv("TOKEN")
+        self.parse_mode = parse_mode
+        self.queued = queued
+
+    def send(self, text, subject=None):
+        if subject:
+            text = f"{subject}\n{text}"
+        if self.queued:
+            return alerts.send(self.chat_id, text, parse_mode=self.parse_mode, token=self.token)
+        payload = {"chat_id": self.chat_id, "text": text}
+        if self.parse_mode:
+            payload["parse_mode"] = self.parse_mode
+        url = TELEGRAM_API.format(token=self.token)
+        for attempt in range(2):
+            response = http_client.post(url, data=payload, timeout=SEND_TIMEOUT)
+            if response.status_code == 429 and attempt == 0:
+                time.sleep(retry_after(response) or 1)  # Telegram ka retry_after, ek dafa dobara
+                continue
+            break
+        if response.status_code != 200:
+            print(f"Telegram send failed ({response.status_code}): {response.text[:200]}")
+            return False
+        return True
+
+class SMTPSink:
+    def __init__(self, user=None, password=None, to=None, sender=None, host=SMTP_HOST, port=SMTP_PORT,
+                 subject="Alert"):
+        self.user = user
+        self.password = password
+        self.to = to or user
+        self.sender = sender or user
+        self.host = host
+        self.port = port
+        self.subject = subject
+        self.server = None
+        self.used_at = 0.0
+        self.lock = threading.Lock()
+        atexit.register(self.close)
+
+    def connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+        server.starttls()
+        if self.user:
+            server.login(self.user, self.password)
+        self.server = server
+
+    def alive(self):
+        if self.server is None:
+            return False
+        if time.time() - self.used_at < SMTP_IDLE:
+            return True
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.server = None
+
+    def send(self, text, subject=None):
+        msg = MIMEText(text, "plain", "utf-8")
+        msg["From"] = self.sender
+        msg["To"] = self.to
+        msg["Subject"] = subject or self.subject
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    if not self.alive():
+                        self.close()
+                        self.connect()
+                    self.server.sendmail(self.sender, [self.to], msg.as_string())
+                    self.used_at = time.time()
+                    return True
+                except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError) as e:
+                    # Server ne idle connection band kar diya; ek dafa naya connection
+                    self.server = None
+                    if attempt:
+                        print(f"Email Sending Error: {e}")
+                except smtplib.SMTPException as e:
+                    print(f"Email Sending Error: {e}")
+                    return False
+        return False
+
+class Notifier:
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+
+    def add(self, sink):
+        self.sinks.append(sink)
+        return self
+
+    def send(self, text, subject=None):
+        # Har sink ko; ek fail ho to baaki phir bhi bhejen
+        ok = True
+        for sink in self.sinks:
+            try:
+                ok = sink.send(text, subject) is not False and ok
+            except Exception as e:
+                print(f"{type(sink).__name__} error: {e}")
+                ok = False
+        return ok
+
+def telegram(chat_id=None, token=None, parse_mode=None):
+    sink = TelegramSink(chat_id, token, parse_mode)
+    if not sink.token or not sink.chat_id:
+        # Token / chat env mein nahi; har alert pe 401/400 aur retries ki jagah sirf console
+        print("[notifier] TOKEN / TELEGRAM_CHAT_ID not set, Telegram alerts will only be printed")
+        return Notifier(PrintSink())
+    return Notifier(sink)
+
+def email(user=None, password=None, to=None, subject="Alert"):
+    return Notifier(SMTPSink(user, password, to, subject=subject))
@@ -0,0 +1,116 @@
+import os
+import zlib
+import numpy as np
+from symbol_registry import registry, normalize_symbol
+
+# === VOLUME / VOLATILITY PRIORITY TIERS ===
+# Saare symbols har cycle scan karne ki jagah ticker feed se har symbol ka score
+# (24h quote volume aur (high - low) / low range, dono ka percentile rank) nikalte hain.
+# Score rolling hai: har ticker refresh pe EWMA, taake ek spike se tier na uchhle.
+# Top tier har cycle, baaki har N-th cycle. Har symbol ka offset hash se fixed hai,
+# is liye long tail ek hi cycle pe jama nahi hota balke cycles mein bant jata hai.
+#
+#   PRIORITY_TIERS="0.2:1,0.5:3,1:10"   top 20% har cycle, agle 30% har 3rd, baaki har 10th
+PRIORITY = os.getenv("PRIORITY", "1") != "0"
+TIERS = os.getenv("PRIORITY_TIERS", "0.2:1,0.5:3,1:10")
+VOLUME_WEIGHT = float(os.getenv("PRIORITY_VOLUME_WEIGHT", 0.7))  # Baaki volatility ka
+ALPHA = 0.3  # Har naye ticker snapshot ka EWMA weight
+
+# Ticker market -> (quote volume, high, low) fields
+TICKER_FIELDS = {
+    ("mexc", "spot-ticker"): ("quoteVolume", "highPrice", "lowPrice"),
+    ("mexc", "futures-ticker"): ("amount24", "high24Price", "lower24Price"),
+}
+
+def parse_tiers(text):
+    # "0.2:1,0.5:3,1:10" -> [(0.2, 1), (0.5, 3), (1.0, 10)]
+    tiers = []
+    for part in text.split(","):
+        fraction, _, every = part.partition(":")
+        tiers.append((float(fraction), max(1, int(every or 1))))
+    tiers.sort()
+    if not tiers or tiers[-1][0] < 1:
+        tiers.append((1.0, tiers[-1][1] if tiers else 1))
+    return tiers
+
+def percentile_rank(values):
+    # 0 (sab se kam) .. 1 (sab se zyada)
+    if len(values) < 2:
+        return np.ones(len(values))
+    return values.argsort().argsort() / (len(values) - 1)
+
+class PriorityTiers:
+    def __init__(self, exchange, ticker_market, tiers=TIERS, volume_weight=VOLUME_WEIGHT):
+        self.exchange = exchange
+        self.ticker_market = ticker_market
+        self.fields = TICKER_FIELDS[(exchange, ticker_market)]
+        self.tiers = parse_tiers(tiers)
+        self.volume_weight = volume_weight
+        self.volume = {}      # normalized -> EWMA quote volume
+        self.volatility = {}  # normalized -> EWMA range
+        self.tier = {}        # normalized -> tier index
+        self.loaded_at = None
+        self.cycle = 0
+
+    def update(self):
+        # Ticker registry ke TTL pe refresh hota hai; naya snapshot aaye to hi tiers dobara
+        table = registry.table(self.exchange, self.ticker_market)
+        loaded_at = registry.loaded_at.get((self.exchange, self.ticker_market))
+        if not table or loaded_at == self.loaded_at:
+            return
+        self.loaded_at = loaded_at
+        volume_key, high_key, low_key = self.fields
+        for name, info in table.items():
+            try:
+                volume = float(info[volume_key])
+                high, low = float(info[high_key]), float(info[low_key])
+            except (KeyError, TypeError, ValueError):
+                continue
+            volatility = (high - low) / low if low > 0 else 0.0
+            if name in self.volume:
+                volume = ALPHA * volume + (1 - ALPHA) * self.volume[name]
+                volatility = ALPHA * volatility + (1 - ALPHA) * self.volatility[name]
+            self.volume[name] = volume
+            self.volatility[name] = volatility
+        for name in list(self.volume):
+            if name not in table:  # Delist / ticker se gayab
+                del self.volume[name], self.volatility[name]
+        self.rank()
+
+    def rank(self):
+        names = list(self.volume)
+        if not names:
+            self.tier = {}
+            return
+        score = (self.volume_weight * percentile_rank(np.array([self.volume[n] for n in names]))
+                 + (1 - self.volume_weight) * percentile_rank(np.array([self.volatility[n] for n in names])))
+        order = np.argsort(-score)
+        bounds = [int(np.ceil(fraction * len(names))) for fraction, _ in self.tiers]
+        self.tier = {}
+        for position, i in enumerate(order):
+            self.tier[names[i]] = next(t for t, bound in enumerate(bounds) if position < bound)
+
+    def every(self, symbol):
+        # Ticker mein nahi (naya listing / data nahi) to sab se neeche wala tier
+        tier = self.tier.get(normalize_symbol(symbol), len(self.tiers) - 1)
+        return self.tiers[tier][1]
+
+    def due(self, symbols):
+        # Is cycle mein scan hone wale symbols; har call ek cycle
+        if not PRIORITY:
+            return list(symbols)
+        self.update()
+        cycle = self.cycle
+        self.cycle += 1
+        due = []
+        for symbol in symbols:
+            every = self.every(symbol)
+            if (cycle + zlib.crc32(symbol.encode())) % every == 0:
+                due.append(symbol)
+        return due
+
+    def summary(self):
+        counts = [0] * len(self.tiers)
+        for tier in self.tier.values():
+            counts[tier] += 1
+        return ", ".join(f"every {every}: {count}" for (_, every), count in zip(self.tiers, counts))
@@ -0,0 +1,144 @@
+import os
+import time
+import asyncio
+import threading
+from urllib.parse import urlsplit
+
+# === ADAPTIVE RATE LIMITER ===
+# Har exchange + endpoint group ka apna token bucket (requests/sec in weight units).
+# 429 / rate-limit code aaye to rate aadha (aur Retry-After tak ruk jao), phir har
+# kamiyab request pe rate thora thora wapas max tak (AIMD).
+# Limits exchanges ke published per-IP, per-endpoint limits hain:
+#   MEXC spot v3: har endpoint 500 weight / 10s   (ticker/24hr bina symbol = 40, exchangeInfo = 10)
+#   MEXC contract: har endpoint 20 / 2s
+#   Bitget v1/v2 market: har endpoint 20 / s
+RATE_LIMIT = os.getenv("RATE_LIMIT", "1") != "0"
+SAFETY = float(os.getenv("RATE_LIMIT_SAFETY", 0.9))  # Max ka itna hissa hi use karo
+DECREASE = 0.5        # Limit hit pe rate * DECREASE
+INCREASE = 0.02       # Har kamiyab request pe + max ka 2%
+MIN_FRACTION = 0.05   # Rate is se neeche nahi
+RATE_LIMIT_STATUS = (429, 418)
+RATE_LIMIT_CODES = {"429", "510"}  # Bitget "429", MEXC contract 510 "Requests are too frequent"
+
+def mexc_spot_weight(path, params):
+    if path.startswith("/api/v3/ticker/24hr") and not (params or {}).get("symbol"):
+        return 40
+    if path.startswith("/api/v3/exchangeInfo"):
+        return 10
+    return 1
+
+# (host, path prefix, per-second rate, burst, weight(path, params)); prefix hi group hai,
+# "" prefix = har path ka apna bucket
+LIMITS = [
+    ("api.mexc.com", "", 50, 50, mexc_spot_weight),
+    ("contract.mexc.com", "/api/v1/contract/kline/", 10, 20, None),
+    ("contract.mexc.com", "/api/v1/contract/depth/", 10, 20, None),
+    ("contract.mexc.com", "/api/v1/contract/deals/", 10, 20, None),
+    ("contract.mexc.com", "", 10, 20, None),
+    ("api.bitget.com", "", 20, 20, None),
+]
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.max_rate = rate * SAFETY
+        self.rate = self.max_rate
+        self.capacity = capacity * SAFETY
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, weight=1):
+        # Tokens abhi kaat lo (negative = line mein), kitni der sona hai woh return
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            self.tokens -= weight
+            wait = max(0.0, -self.tokens / self.rate, self.paused_until - now)
+            return wait
+
+    def acquire(self, weight=1):
+        wait = self.reserve(weight)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, weight=1):
+        wait = self.reserve(weight)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def limited(self, retry_after=None):
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            self.rate = max(self.max_rate * MIN_FRACTION, self.rate * DECREASE)
+            self.tokens = min(self.tokens, 0.0)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self.paused_until = max(self.paused_until, now + pause)
+
+    def ok(self):
+        if self.rate < self.max_rate:
+            with self.lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * INCREASE)
+
+class RateLimiter:
+    def __init__(self, limits=LIMITS):
+        self.limits = limits
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def match(self, url, params=None):
+        parts = urlsplit(url)
+        for host, prefix, rate, burst, weight in self.limits:
+            if parts.hostname == host and parts.path.startswith(prefix):
+                key = (host, prefix or parts.path)
+                with self.lock:
+                    if key not in self.buckets:
+                        self.buckets[key] = TokenBucket(rate, burst)
+                return self.buckets[key], (weight(parts.path, params) if weight else 1)
+        return None, 0
+
+    def acquire(self, url, params=None):
+        bucket, weight = self.match(url, params)
+        return bucket.acquire(weight) if bucket else 0.0
+
+    async def acquire_async(self, url, params=None):
+        bucket, weight = self.match(url, params)
+        return await bucket.acquire_async(weight) if bucket else 0.0
+
+    def feedback(self, url, status, code=None, retry_after=None):
+        # Response ke baad: limit laga to True (caller retry kar sakta hai)
+        bucket, _ = self.match(url)
+        if bucket is None:
+            return False
+        if status in RATE_LIMIT_STATUS or (code is not None and str(code) in RATE_LIMIT_CODES):
+            bucket.limited(parse_retry_after(retry_after))
+            print(f"Rate limited ({urlsplit(url).hostname}{urlsplit(url).path}), rate -> {bucket.rate:.1f}/s")
+            return True
+        bucket.ok()
+        return False
+
+def parse_retry_after(value):
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def body_code(response):
+    # Error body ka code (Bitget "code", MEXC contract "code"). Error bodies chhoti hoti hain,
+    # bari (data wali) response dobara parse nahi karte
+    if len(response.content) > 256 or "json" not in response.headers.get("Content-Type", ""):
+        return None
+    try:
+        data = response.json()
+    except ValueError:
+        return None
+    return data.get("code") if isinstance(data, dict) else None
+
+limiter = RateLimiter() if RATE_LIMIT else None
@@ -0,0 +1,124 @@
+import re
+import numpy as np
+from candles import Candles
+
+# === LOCAL MULTI-TIMEFRAME RESAMPLING ===
+# Ek base series (jaise 1m) se bari timeframes ki candles khud banate hain,
+# exchange ke bar boundaries (UTC epoch pe aligned) ke mutabiq.
+# Row format: [timestamp_ms, open, high, low, close, volume, (extra volume columns...)]
+UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+def interval_ms(interval):
+    # "1m", "15m", "1H", "4h", "1D", MEXC contract ke "Min5", "Min60", "Hour4", "Day1"
+    text = str(interval)
+    named = re.fullmatch(r"(Min|Hour|Day|Week)(\d+)", text)
+    if named:
+        unit = {"Min": "m", "Hour": "h", "Day": "d", "Week": "w"}[named.group(1)]
+        return int(named.group(2)) * UNIT_MS[unit]
+    match = re.fullmatch(r"(\d+)([mhdwMHDW])", text)
+    if not match:
+        raise ValueError(f"Unknown interval: {interval}")
+    return int(match.group(1)) * UNIT_MS[match.group(2).lower()]
+
+def bucket_start(ts, target_ms):
+    return ts - ts % target_ms
+
+def to_row(row):
+    return [int(row[0])] + [float(x) for x in row[1:]]
+
+def merge_bar(bar, row):
+    bar[2] = max(bar[2], row[2])
+    bar[3] = min(bar[3], row[3])
+    bar[4] = row[4]
+    for i in range(5, len(bar)):
+        bar[i] += row[i]
+
+def resample(rows, base, target, drop_partial_first=True):
+    base_ms, target_ms = interval_ms(base), interval_ms(target)
+    if target_ms % base_ms:
+        raise ValueError(f"{target} is not a multiple of {base}")
+
+    bars, counts = [], []
+    for row in sorted((to_row(r) for r in rows), key=lambda r: r[0]):
+        start = bucket_start(row[0], target_ms)
+        if bars and bars[-1][0] == start:
+            merge_bar(bars[-1], row)
+            counts[-1] += 1
+        else:
+            bars.append([start] + row[1:])
+            counts.append(1)
+
+    # Pehla bucket adhoora ho sakta hai (lookback beech se shuru hua) to hata do.
+    # Aakhri bucket abhi ban raha hai, exchange ki forming candle ki tarah rehta hai.
+    if drop_partial_first and bars and counts[0] < target_ms // base_ms and len(bars) > 1:
+        bars.pop(0)
+    return bars
+
+def resample_many(rows, base, targets, limit=None):
+    out = {}
+    for target in targets:
+        bars = [to_row(r) for r in rows] if target == base else resample(rows, base, target)
+        if target == base:
+            bars.sort(key=lambda r: r[0])
+        out[target] = bars[-limit:] if limit else bars
+    return out
+
+class Resampler:
+    # Incremental: base candles ek ek karke do (forming candle dobara bhi de sakte ho),
+    # band hone wali bari candle update() return karta hai.
+    def __init__(self, base, target):
+        self.base_ms, self.target_ms = interval_ms(base), interval_ms(target)
+        if self.target_ms % self.base_ms:
+            raise ValueError(f"{target} is not a multiple of {base}")
+        self.start = None
+        self.parts = {}  # Current bucket ki base candles, timestamp -> row
+
+    def update(self, row):
+        row = to_row(row)
+        start = bucket_start(row[0], self.target_ms)
+        closed = None
+        if self.start is not None and start < self.start:
+            return None  # Purani candle, ignore
+        if self.start is not None and start > self.start:
+            closed = self.current
+            self.parts = {}
+        self.start = start
+        self.parts[row[0]] = row
+        return closed
+
+    @property
+    def current(self):
+        if not self.parts:
+            return None
+        rows = [self.parts[ts] for ts in sorted(self.parts)]
+        bar = [self.start] + rows[0][1:]
+        for row in rows[1:]:
+            merge_bar(bar, row)
+        return bar
+
+    @property
+    def complete(self):
+        return len(self.parts) == self.target_ms // self.base_ms
+
+def resample_candles(candles, base, target, drop_partial_first=True):
+    # Columnar version: reduceat se saare buckets ek saath
+    base_ms, target_ms = interval_ms(base), interval_ms(target)
+    if target_ms % base_ms:
+        raise ValueError(f"{target} is not a multiple of {base}")
+    if target_ms == base_ms or not len(candles):
+        return candles
+
+    buckets = candles.ts - candles.ts % target_ms
+    starts = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+    ends = np.r_[starts[1:], len(buckets)]
+    out = Candles(
+        buckets[starts],
+        candles.open[starts],
+        np.maximum.reduceat(candles.high, starts),
+        np.minimum.reduceat(candles.low, starts),
+        candles.close[ends - 1],
+        np.add.reduceat(candles.volume, starts),
+    )
+    if drop_partial_first and len(starts) > 1 and ends[0] - starts[0] < target_ms // base_ms:
+        out = out[1:]
+    return out
@@ -1,57 +1,37 @@
-import requests
-import time
-import pandas as pd
 import ta
 import os
-import telegram
+import market_data
+from symbol_registry import registry
+from scheduler import LastBars, closed_candles, spread, wait_for_close
+from priority import PriorityTiers
+from sharding import shard
+from alert_dedup import dedup
+import notifier
 
 # Load env variables
-MEXC_API_URL = "https://api.mexc.com"
 TELEGRAM_TOKEN = os.getenv("TOKEN")
 CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
-bot = telegram.Bot(TELEGRAM_TOKEN)
+notify = notifier.telegram(CHAT_ID, TELEGRAM_TOKEN)
+last_bars = LastBars()
+priority = PriorityTiers("mexc", "spot-ticker")  # Dead coins har cycle nahi
 
 def get_all_symbols():
-    url = f"{MEXC_API_URL}/api/v3/exchangeInfo"
-    try:
-        res = requests.get(url, timeout=10)
-        symbols = [s['symbol'] for s in res.json()['symbols'] if s['quoteAsset'] == 'USDT']
-        return symbols
-    except Exception as e:
-        print(f"Failed to fetch symbols: {e}")
-        return []
+    return registry.symbols("mexc", "spot")  # USDT pairs, TTL cache
 
+# market_data ke "mexc-spot" cache se, runtime plugin wali hi series
 def get_klines(symbol, interval='15m', limit=100):
-    url = f"{MEXC_API_URL}/api/v3/klines?symbol={symbol}&interval={interval}&limit={limit}"
-    try:
-        res = requests.get(url, timeout=10)
-        data = res.json()
-        if not isinstance(data, list):
-            return None
-        df = pd.DataFrame(data)
-        if df.shape[1] == 12:
-            df.columns = [
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'num_trades',
-                'taker_buy_base', 'taker_buy_quote', 'ignore'
-            ]
-        elif df.shape[1] == 8:
-            df.columns = [
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume'
-            ]
-        else:
-            print(f"Unexpected column count for {symbol}: {df.shape[1]}")
-            return None
-
-        df['close'] = df['close'].astype(float)
-        return df
-    except Exception as e:
-        print(f"Error fetching data for {symbol}: {e}")
+    candles = market_data.fetch_klines("mexc", "spot", symbol, interval, limit)
+    if candles is None:
         return None
+    candles = closed_candles(candles, "mexc", interval)  # Forming candle nahi
+    return candles.to_frame() if len(candles) else None
 
-def analyze_rsi(symbol):
-    df = get_klines(symbol)
+def analyze_rsi(symbol, df=None):
+    if df is None:
+        df = get_klines(symbol)
+        # Pichli scan ke baad koi nayi 15m candle band nahi hui to dobara kuch nahi
+        if df is not None and not df.empty and not last_bars.fresh(symbol, df['timestamp'].iloc[-1]):
+            return
     if df is None or df.empty:
         return
 
@@ -60,22 +40,34 @@ def analyze_rsi(symbol):
     last_close = df['close'].iloc[-1]
 
     if 20 <= latest_rsi <= 25:
+        if not dedup.allow("rsi_alert", symbol, "long", "15m"):
+            return  # Cooldown mein, dobara alert nahi
         suggestion = f"BUY signal for {symbol}\nPrice: {last_close}\nRSI: {latest_rsi:.2f}\nSuggested entries: {last_close*0.997:.3f} - {last_close*1.003:.3f}"
-        bot.send_message(CHAT_ID=TELEGRAM_CHAT_ID, text=suggestion)
+        notify.send(suggestion)
     elif 80 <= latest_rsi <= 90:
+        if not dedup.allow("rsi_alert", symbol, "short", "15m"):
+            return
         suggestion = f"SHORT signal for {symbol}\nPrice: {last_close}\nRSI: {latest_rsi:.2f}\nSuggested entries: {last_close*1.003:.3f} - {last_close*0.997:.3f}"
-        bot.send_message(CHAT_ID=TELEGRAM_CHAT_ID, text=suggestion)
+        notify.send(suggestion)
 
 def main():
     while True:
-        print("Scanning...")
-        symbols = get_all_symbols()
-        for symbol in symbols:
-            if symbol.endswith("USDT"):
-                analyze_rsi(symbol)
-                time.sleep(0.3)  # avoid rate limit
-        print("Waiting 3 minutes...")
-        time.sleep(180)  # wait before next scan
+        wait_for_close("mexc", "15m")  # 15m candle band hote hi
+        symbols = shard.mine(universe())  # Sirf is worker ke symbols
+        print(f"Scanning {len(symbols)} symbols...")
+        for symbol in spread(symbols):
+            analyze_rsi(symbol)  # Rate limit http_client ke token bucket mein
+
+# === RUNTIME PLUGIN (runtime.py) ===
+SERIES = {"klines": ("mexc", "spot", "15m", 100)}
+EVERY = 900
+
+def universe():
+    # Is cycle ke due symbols (volume / volatility tier ke hisaab se)
+    return priority.due([symbol for symbol in get_all_symbols() if symbol.endswith("USDT")])
+
+def evaluate(symbol, series):
+    analyze_rsi(symbol, series["klines"].to_frame())
 
 if __name__ == "__main__":
     main()
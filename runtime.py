@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+import market_data
+from scheduler import LastBars, closed_candles, next_wake
+from sharding import shard
+
+# === MULTI-STRATEGY RUNTIME ===
+# Saari scanner scripts ek hi process mein, plugins ki tarah. Har script batati hai:
+#   SERIES = {"name": (exchange, market, interval, limit), ...}
+#   EVERY = seconds           (har EVERY ki bar band hote hi, exchange time pe)
+#   universe() -> symbols     (exchange ke apne format mein)
+#   evaluate(symbol, series)  (series: {"name": Candles})
+#   end_cycle()               (optional, cycle ke saare evaluate ke baad, e.g. digest bhejna)
+# Har cycle jo strategies due hain un ki saari series jama karke har distinct
+# (exchange, market, symbol, interval) ek hi dafa fetch hoti hai, phir sab ko milti hai.
+# Sharding (sharding.py) on ho to har worker sirf apne hisse ke symbols leta hai.
+# Strategies ko sirf band ho chuki candles milti hain; kisi series mein nayi bar
+# band na hui ho to us (strategy, symbol) ka evaluate skip.
+#
+#   python runtime.py                       (RUNTIME_STRATEGIES wali sab)
+#   python runtime.py rsi_kdj scalp_rsi     (sirf yeh)
+DEFAULT_STRATEGIES = "Ashu_alert,rsi_alert,rsi_kdj,scalp_rsi,liq_atr,low_short,mexc_spot"
+STRATEGIES = os.getenv("RUNTIME_STRATEGIES", DEFAULT_STRATEGIES)
+CONCURRENCY = int(os.getenv("RUNTIME_CONCURRENCY", 8))
+TICK = 1
+
+def load_plugins(names):
+    plugins = []
+    for name in names:
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:
+            print(f"[runtime] {name} load nahi hua: {e}")
+            continue
+        if not all(hasattr(module, attr) for attr in ("SERIES", "EVERY", "universe", "evaluate")):
+            print(f"[runtime] {name} plugin nahi hai (SERIES/EVERY/universe/evaluate missing)")
+            continue
+        plugins.append(module)
+    return plugins
+
+def plan(plugins):
+    # (plugin, symbol, {name: key}) jobs aur har distinct key ka sab se bara limit
+    jobs, wanted = [], {}
+    for plugin in plugins:
+        try:
+            symbols = shard.mine(plugin.universe())
+        except Exception as e:
+            print(f"[runtime] {plugin.__name__} universe error: {e}")
+            continue
+        for symbol in symbols:
+            keys = {}
+            for name, (exchange, market, interval, limit) in plugin.SERIES.items():
+                key = (exchange, market, symbol, interval)
+                wanted[key] = max(wanted.get(key, 0), limit)
+                keys[name] = (key, limit)
+            jobs.append((plugin, symbol, keys))
+    return jobs, wanted
+
+def fetch_all(wanted, pool):
+    futures = {key: pool.submit(market_data.fetch_klines, *key, limit) for key, limit in wanted.items()}
+    return {key: future.result() for key, future in futures.items()}
+
+last_bars = LastBars()
+
+def run_cycle(plugins, pool):
+    start = time.time()
+    jobs, wanted = plan(plugins)
+    data = fetch_all(wanted, pool)
+    evaluated = 0
+    for plugin, symbol, keys in jobs:
+        series, fresh = {}, False
+        for name, (key, limit) in keys.items():
+            candles = data.get(key)
+            if candles is None:
+                break
+            exchange, _, _, interval = key
+            candles = closed_candles(candles, exchange, interval).tail(limit)
+            if not len(candles):
+                break
+            series[name] = candles
+            fresh |= last_bars.fresh((plugin.__name__, key), candles.ts[-1])
+        if len(series) != len(keys) or not fresh:
+            continue
+        try:
+            plugin.evaluate(symbol, series)
+            evaluated += 1
+        except Exception as e:
+            print(f"[runtime] {plugin.__name__} {symbol}: {e}")
+    for plugin in plugins:
+        if hasattr(plugin, "end_cycle"):
+            try:
+                plugin.end_cycle()
+            except Exception as e:
+                print(f"[runtime] {plugin.__name__} end_cycle error: {e}")
+    names = ", ".join(p.__name__ for p in plugins)
+    print(f"[runtime] {names}: {len(wanted)} series for {len(jobs)} jobs, "
+          f"{evaluated} evaluated in {time.time() - start:.1f}s")
+
+def main(argv=None):
+    names = argv or [n for n in STRATEGIES.split(",") if n]
+    plugins = load_plugins(names)
+    if not plugins:
+        print("[runtime] Koi strategy load nahi hui")
+        return
+    next_run = {plugin.__name__: 0.0 for plugin in plugins}
+    exchanges = {plugin.__name__: next(iter(plugin.SERIES.values()))[0] for plugin in plugins}
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        while True:
+            now = time.time()
+            due = [p for p in plugins if now >= next_run[p.__name__]]
+            if due:
+                try:
+                    run_cycle(due, pool)
+                except Exception as e:
+                    print(f"[runtime] cycle error: {e}")
+                for plugin in due:
+                    # Exchange time pe EVERY ki agli boundary, taake alag strategies ek hi cycle mein milen
+                    next_run[plugin.__name__] = next_wake(exchanges[plugin.__name__], plugin.EVERY * 1000)
+            time.sleep(TICK)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
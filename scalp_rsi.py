@@ -1,47 +1,36 @@
-import requests
-import pandas as pd
 import ta
 from datetime import datetime
 import os
 import time
+import market_data
+from symbol_registry import registry
+from scheduler import LastBars, closed_candles, spread, wait_for_close
+from priority import PriorityTiers
+from sharding import shard
+from alert_dedup import dedup
+import notifier
 
 TELEGRAM_TOKEN = os.environ.get('TOKEN')
 CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
+notify = notifier.telegram(CHAT_ID, TELEGRAM_TOKEN)
+last_bars = LastBars()
+priority = PriorityTiers("mexc", "futures-ticker")  # Liquid / volatile symbols zyada baar
 
 # Fetch active USDT futures symbols with min volume
 def get_active_symbols(min_volume=50000):
-    url = "https://contract.mexc.com/api/v1/ticker"
-    response = requests.get(url)
-    active_symbols = []
-    if response.status_code == 200:
-        data = response.json()['data']
-        for item in data:
-            if item['quoteCoin'] == 'USDT' and float(item['volume']) >= min_volume:
-                active_symbols.append(item['symbol'])
-    else:
-        print("Failed to fetch active symbols")
-    return active_symbols
-
-# Fetch candles with retry
+    return registry.symbols("mexc", "futures-ticker", where=lambda item: float(item['volume']) >= min_volume)
+
+# Fetch candles with retry (market_data ka shared cache, rsi_kdj aur runtime wali hi series)
 def fetch_candles(symbol, retries=3):
-    url = f"https://contract.mexc.com/api/v1/klines?symbol={symbol}&interval=5m&limit=100"
     for attempt in range(retries):
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json().get('data')
-                if not data:
-                    print(f"Skipping {symbol}: No candle data")
-                    return None
-                df = pd.DataFrame(data, columns=['open_time', 'open', 'high', 'low', 'close', 'volume'])
-                df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
-                df.set_index('open_time', inplace=True)
-                df = df.astype(float, errors='ignore')
-                return df
-            else:
-                print(f"Failed to fetch candles for {symbol}")
-        except Exception as e:
-            print(f"Error fetching {symbol} (Attempt {attempt + 1}): {e}")
+        candles = market_data.fetch_klines("mexc", "futures", symbol, "5m", 100)
+        if candles is not None:
+            candles = closed_candles(candles, "mexc", "5m")  # Forming candle nahi
+            if not len(candles):
+                print(f"Skipping {symbol}: No candle data")
+                return None
+            return candles_to_df(candles)
+        print(f"Failed to fetch candles for {symbol} (Attempt {attempt + 1})")
         time.sleep(1)
     return None
 
@@ -59,62 +48,75 @@ def calculate_kdj(df, length=14):
 
 def send_alert(message):
     print(message)
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    params = {'chat_id': CHAT_ID, 'text': message}
-    try:
-        response = requests.post(url, params=params)
-        if response.status_code != 200:
-            print(f"Failed to send Telegram message: {response.text}")
-    except Exception as e:
-        print(f"Error sending Telegram message: {e}")
+    notify.send(message)
 
 def check_signals():
-    symbols = get_active_symbols()
-    print(f"Fetched {len(symbols)} active symbols")
-
-    alerted_symbols = set()  # to avoid duplicate alerts in same run
-
-    for symbol in symbols:
-        if symbol in alerted_symbols:
-            continue
+    active = shard.mine(get_active_symbols())  # Sirf is worker ke symbols
+    symbols = priority.due(active)
+    print(f"Fetched {len(active)} active symbols, scanning {len(symbols)} ({priority.summary()})")
 
+    # Duplicate alerts (is run aur pichli runs ke) alert_dedup cooldown rokta hai
+    for symbol in spread(symbols):
         df = fetch_candles(symbol)
-        if df is None or len(df) < 20:
+        # Pichli scan ke baad nayi 5m candle band nahi hui to skip
+        if df is None or not len(df) or not last_bars.fresh(symbol, df.index[-1].value):
             continue
-
-        df['rsi'] = calculate_rsi(df['close'], 14)
-        df['j'] = calculate_kdj(df, 14)
-
-        avg_volume = df['volume'].iloc[:-1].mean()
-        current_volume = df['volume'].iloc[-1]
-        last_rsi = df['rsi'].iloc[-1]
-        last_j = df['j'].iloc[-1]
-        price = df['close'].iloc[-1]
-
-        print(f"{symbol} => RSI: {last_rsi:.2f}, J: {last_j:.2f}, Vol: {current_volume:.2f} vs Avg {avg_volume:.2f}")
-
-        if last_rsi >= 80 and last_j > 90:
-            tp = round(price * 0.995, 6)
-            sl = round(price * 1.005, 6)
-            msg_type = "🔥 [SHORT SIGNAL]"
-            if current_volume > 1.5 * avg_volume:
-                msg_type = "🚨 [VOLUME SPIKE SHORT]"
-
-            message = (
-                f"{msg_type} {symbol}\n"
-                f"📊 Price: {price}\n"
-                f"RSI: {last_rsi:.2f}\n"
-                f"J: {last_j:.2f}\n"
-                f"Volume: {current_volume:.2f} vs Avg {avg_volume:.2f}\n"
-                f"Entry: {price}\n"
-                f"Take Profit: {tp}\n"
-                f"Stop Loss: {sl}\n"
-                f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC"
-            )
-            send_alert(message)
-            alerted_symbols.add(symbol)
+        analyze(symbol, df)
+
+def candles_to_df(candles):
+    df = candles.to_frame().rename(columns={'timestamp': 'open_time'})
+    return df.set_index('open_time')
+
+def analyze(symbol, df):
+    if df is None or len(df) < 20:
+        return False
+
+    df['rsi'] = calculate_rsi(df['close'], 14)
+    df['j'] = calculate_kdj(df, 14)
+
+    avg_volume = df['volume'].iloc[:-1].mean()
+    current_volume = df['volume'].iloc[-1]
+    last_rsi = df['rsi'].iloc[-1]
+    last_j = df['j'].iloc[-1]
+    price = df['close'].iloc[-1]
+
+    print(f"{symbol} => RSI: {last_rsi:.2f}, J: {last_j:.2f}, Vol: {current_volume:.2f} vs Avg {avg_volume:.2f}")
+
+    if last_rsi >= 80 and last_j > 90:
+        if not dedup.allow("scalp_rsi", symbol, "short", "5m"):
+            return False  # Isi signal ka alert cooldown mein pehle hi ja chuka
+        tp = round(price * 0.995, 6)
+        sl = round(price * 1.005, 6)
+        msg_type = "🔥 [SHORT SIGNAL]"
+        if current_volume > 1.5 * avg_volume:
+            msg_type = "🚨 [VOLUME SPIKE SHORT]"
+
+        message = (
+            f"{msg_type} {symbol}\n"
+            f"📊 Price: {price}\n"
+            f"RSI: {last_rsi:.2f}\n"
+            f"J: {last_j:.2f}\n"
+            f"Volume: {current_volume:.2f} vs Avg {avg_volume:.2f}\n"
+            f"Entry: {price}\n"
+            f"Take Profit: {tp}\n"
+            f"Stop Loss: {sl}\n"
+            f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC"
+        )
+        send_alert(message)
+        return True
+    return False
+
+# === RUNTIME PLUGIN (runtime.py) ===
+SERIES = {"candles": ("mexc", "futures", "5m", 100)}
+EVERY = 300
+
+def universe():
+    return priority.due(get_active_symbols())
+
+def evaluate(symbol, series):
+    analyze(symbol, candles_to_df(series["candles"]))
 
 if __name__ == "__main__":
     while True:
+        wait_for_close("mexc", "5m")  # 5m candle band hote hi
         check_signals()
-        time.sleep(60)
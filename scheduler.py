@@ -0,0 +1,105 @@
+import os
+import time
+import zlib
+import numpy as np
+import http_client
+from resample import interval_ms
+
+# === CANDLE-CLOSE SCHEDULER ===
+# Fixed sleep ki jagah strategy ko exchange ke time pe uski timeframe ki candle
+# band hote hi (CLOSE_DELAY ke baad) jagate hain. Local clock aur exchange clock ka
+# farq ExchangeClock har CLOCK_TTL pe server time se nikalta hai.
+# Har symbol ko ek fixed (hash se) jitter milta hai taake saari requests ek hi second pe na jayen.
+CLOSE_DELAY = float(os.getenv("CLOSE_DELAY", 2))       # Exchange ko bar finalize karne ka waqt
+JITTER_MAX = float(os.getenv("SCHEDULE_JITTER", 5))    # Per-symbol spread, seconds
+CLOCK_TTL = int(os.getenv("CLOCK_TTL", 600))
+
+TIME_URLS = {
+    "mexc": "https://api.mexc.com/api/v3/time",
+    "bitget": "https://api.bitget.com/api/v2/public/time",
+}
+
+def server_time_ms(exchange, data):
+    if exchange == "mexc":
+        return int(data["serverTime"])
+    return int(data["data"]["serverTime"])
+
+class ExchangeClock:
+    def __init__(self, exchange):
+        self.exchange = exchange
+        self.offset = 0.0  # exchange time - local time, seconds
+        self.synced_at = 0.0
+
+    def sync(self):
+        url = TIME_URLS.get(self.exchange)
+        if url is None:
+            self.synced_at = time.time()
+            return
+        try:
+            sent = time.time()
+            data = http_client.get(url, timeout=5).json()
+            received = time.time()
+            self.offset = server_time_ms(self.exchange, data) / 1000 - (sent + received) / 2
+        except Exception as e:
+            print(f"Server time error ({self.exchange}): {e}")  # Purana offset hi chalta rahe
+        self.synced_at = time.time()
+
+    def now(self):
+        if time.time() - self.synced_at > CLOCK_TTL:
+            self.sync()
+        return time.time() + self.offset
+
+clocks = {}
+
+def clock(exchange):
+    if exchange not in clocks:
+        clocks[exchange] = ExchangeClock(exchange)
+    return clocks[exchange]
+
+def next_wake(exchange, period_ms, delay=CLOSE_DELAY):
+    # Agli bar boundary (exchange time) + delay, local time.time() mein
+    c = clock(exchange)
+    now_ms = c.now() * 1000
+    boundary = now_ms - now_ms % period_ms + period_ms
+    return boundary / 1000 + delay - c.offset
+
+def wait_for_close(exchange, interval, delay=CLOSE_DELAY):
+    # Agli candle band hone tak so jao; band hone wali candle ka start (ms) return
+    period = interval_ms(interval)
+    wake = next_wake(exchange, period, delay)
+    time.sleep(max(0.0, wake - time.time()))
+    now_ms = clock(exchange).now() * 1000
+    return int(now_ms - now_ms % period - period)
+
+def jitter(symbol, spread=JITTER_MAX):
+    return zlib.crc32(symbol.encode()) / 2**32 * spread
+
+def spread(symbols, spread=JITTER_MAX):
+    # Symbols apne jitter ke order mein, har ek apne slot pe (abhi se gin kar)
+    start = time.time()
+    for symbol in sorted(symbols, key=lambda s: jitter(s, spread)):
+        delay = start + jitter(symbol, spread) - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        yield symbol
+
+def closed_rows(rows, exchange, interval):
+    # Abhi ban rahi candle hata do, sirf band ho chuki
+    cutoff = clock(exchange).now() * 1000 - interval_ms(interval)
+    return [row for row in rows if int(row[0]) <= cutoff]
+
+def closed_candles(candles, exchange, interval):
+    cutoff = clock(exchange).now() * 1000 - interval_ms(interval)
+    return candles[:int(np.searchsorted(candles.ts, cutoff, side="right"))]
+
+class LastBars:
+    # Har key ki aakhri evaluate ki hui closed bar; nayi bar na ho to kaam skip
+    def __init__(self):
+        self.seen = {}
+
+    def fresh(self, key, bar_ts):
+        bar_ts = int(bar_ts)
+        if self.seen.get(key, -1) >= bar_ts:
+            return False
+        self.seen[key] = bar_ts
+        return True
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import fcntl
+import atexit
+import bisect
+import socket
+import hashlib
+import threading
+from symbol_registry import normalize_symbol
+
+# === SHARDED SYMBOL UNIVERSE ===
+# Kai workers (dynos / processes / nodes) ek hi scanner chalayen to har symbol sirf
+# ek worker ke paas: consistent hash ring (har worker ke SHARD_VNODES virtual nodes).
+# Worker aaye ya jaye to sirf us ke hisse ke symbols idhar udhar hote hain.
+#
+# Membership do tarah se:
+#   SHARD_WORKERS=4 SHARD_ID=0..3   fixed (Heroku pe SHARD_ID na ho to DYNO "scanner.2" se)
+#   SHARD_FILE=/shared/shards.json  har worker heartbeat likhta hai, jo SHARD_TIMEOUT tak
+#                                   chup rahe woh ring se bahar (join/leave khud hi)
+# Dono na hon to sharding band, har worker sab symbols scan karta hai.
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", 0))
+SHARD_ID = os.getenv("SHARD_ID")
+SHARD_FILE = os.getenv("SHARD_FILE")
+SHARD_VNODES = int(os.getenv("SHARD_VNODES", 100))
+SHARD_HEARTBEAT = int(os.getenv("SHARD_HEARTBEAT", 15))
+SHARD_TIMEOUT = int(os.getenv("SHARD_TIMEOUT", 60))
+
+def hash_key(text):
+    return int.from_bytes(hashlib.md5(text.encode()).digest()[:8], "big")
+
+class HashRing:
+    def __init__(self, nodes=(), vnodes=SHARD_VNODES):
+        self.vnodes = vnodes
+        self.nodes = tuple(sorted(set(nodes)))
+        points = sorted((hash_key(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self.hashes = [h for h, _ in points]
+        self.owners = [node for _, node in points]
+
+    def owner(self, key):
+        if not self.hashes:
+            return None
+        i = bisect.bisect(self.hashes, hash_key(key)) % len(self.hashes)
+        return self.owners[i]
+
+def dyno_index():
+    # Heroku DYNO="scanner.3" -> 2 (dyno numbers 1 se shuru)
+    _, _, number = os.getenv("DYNO", "").rpartition(".")
+    return int(number) - 1 if number.isdigit() else None
+
+def worker_name():
+    if SHARD_ID is not None:
+        return str(SHARD_ID)
+    index = dyno_index()
+    if index is not None:
+        return str(index)
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class ShardMembership:
+    def __init__(self, workers=SHARD_WORKERS, path=SHARD_FILE, name=None):
+        self.path = path
+        self.name = name or worker_name()
+        self.static = [str(i) for i in range(workers)] if workers and not path else None
+        self.ring = HashRing(self.static or ())
+        self.thread = None
+        self.lock = threading.Lock()
+        if self.static and self.name not in self.static:
+            print(f"[shard] SHARD_ID {self.name} 0..{workers - 1} mein nahi, sharding band")
+            self.static = None
+
+    @property
+    def enabled(self):
+        return bool(self.static or self.path)
+
+    # --- Coordination file (heartbeats) ---
+
+    def update_file(self, leaving=False):
+        # {"worker": last_heartbeat}; lock file pe flock taake do workers ek dusre ka likha na mitayen
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.path) as f:
+                    beats = json.load(f)
+            except (OSError, ValueError):
+                beats = {}
+            now = time.time()
+            beats = {name: ts for name, ts in beats.items() if now - ts <= SHARD_TIMEOUT}
+            if leaving:
+                beats.pop(self.name, None)
+            else:
+                beats[self.name] = now
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(beats, f)
+            os.replace(tmp, self.path)
+        return beats
+
+    def heartbeat(self):
+        try:
+            members = sorted(self.update_file())
+        except Exception as e:
+            print(f"[shard] Heartbeat error: {e}")
+            return
+        with self.lock:
+            if tuple(members) != self.ring.nodes:
+                print(f"[shard] Members: {', '.join(members)} (yeh worker: {self.name})")
+                self.ring = HashRing(members)
+
+    def heartbeat_loop(self):
+        while True:
+            time.sleep(SHARD_HEARTBEAT)
+            self.heartbeat()
+
+    def leave(self):
+        try:
+            self.update_file(leaving=True)
+        except Exception:
+            pass
+
+    def start(self):
+        if self.path and self.thread is None:
+            self.heartbeat()
+            self.thread = threading.Thread(target=self.heartbeat_loop, daemon=True)
+            self.thread.start()
+            atexit.register(self.leave)
+
+    # --- Symbols ---
+
+    def owns(self, symbol):
+        # Normalized key, taake BTC_USDT aur BTCUSDT (alag scanners) ek hi worker pe jayen
+        with self.lock:
+            ring = self.ring
+        return ring.owner(normalize_symbol(symbol)) in (self.name, None)
+
+    def mine(self, symbols):
+        if not self.enabled:
+            return list(symbols)
+        self.start()
+        return [symbol for symbol in symbols if self.owns(symbol)]
+
+shard = ShardMembership()
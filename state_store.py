@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import numpy as np
+
+# === PREVIOUS PRICE/VOLUME STATE ===
+# Har symbol ki aakhri price/volume ek memory-mapped float64 array mein,
+# taake spike comparison restart ke baad pehle hi cycle se kaam kare.
+# Row number symbol index (JSON file) se milta hai.
+STATE_DIR = os.getenv("STATE_DIR", "state")
+DEFAULT_CAPACITY = 4096
+# Is se purani value (lamba downtime) compare ke liye bekaar, warna ghalat spikes; 0 = koi limit nahi
+STATE_MAX_AGE = float(os.getenv("STATE_MAX_AGE", 3600))
+FIELDS = ("price", "volume", "updated")
+
+class PriceStateStore:
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, max_age=STATE_MAX_AGE):
+        self.max_age = max_age
+        self.data_path = path + ".dat"
+        self.index_path = path + ".idx.json"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.keys = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.keys = json.load(f)
+        self.rows = {key: i for i, key in enumerate(self.keys)}
+        self.index_dirty = False
+
+        existing = os.path.getsize(self.data_path) // (8 * len(FIELDS)) if os.path.exists(self.data_path) else 0
+        self.open(max(capacity, existing, len(self.keys)))
+
+    def open(self, capacity):
+        existing = os.path.getsize(self.data_path) // (8 * len(FIELDS)) if os.path.exists(self.data_path) else 0
+        if existing < capacity:
+            # Nayi rows NaN se bharo (NaN = abhi tak koi value nahi)
+            with open(self.data_path, "ab") as f:
+                np.full((capacity - existing, len(FIELDS)), np.nan).tofile(f)
+        self.capacity = capacity
+        self.data = np.memmap(self.data_path, dtype=np.float64, mode="r+", shape=(capacity, len(FIELDS)))
+
+    def grow(self):
+        self.data.flush()
+        del self.data
+        self.open(self.capacity * 2)
+
+    def row(self, key):
+        i = self.rows.get(key)
+        if i is None:
+            if len(self.keys) >= self.capacity:
+                self.grow()
+            i = len(self.keys)
+            self.keys.append(key)
+            self.rows[key] = i
+            # Index sirf flush pe likha jata hai; crash ke baad yeh row kisi aur symbol ki
+            # purani value rakh sakti hai, is liye nayi row khali (NaN) se shuru
+            self.data[i] = np.nan
+            self.index_dirty = True
+        return i
+
+    def rows_for(self, keys):
+        return np.array([self.row(key) for key in keys], dtype=np.int64)
+
+    @property
+    def prices(self):
+        return self.data[:, 0]
+
+    @property
+    def volumes(self):
+        return self.data[:, 1]
+
+    def age(self, rows):
+        # Aakhri set se seconds (kabhi set nahi hui to NaN)
+        return time.time() - self.data[rows, 2]
+
+    def stale(self, rows):
+        # Kabhi set nahi hui ya max_age se purani
+        age = self.age(rows)
+        if not self.max_age:
+            return np.isnan(age)
+        return ~(age <= self.max_age)
+
+    def previous(self, rows):
+        # (prices, volumes) copies, purani rows NaN
+        stale = self.stale(rows)
+        prices, volumes = self.data[rows, 0].copy(), self.data[rows, 1].copy()
+        prices[stale] = np.nan
+        volumes[stale] = np.nan
+        return prices, volumes
+
+    def get(self, key):
+        i = self.rows.get(key)
+        if i is None or np.isnan(self.data[i, 0]) or self.stale([i])[0]:
+            return None
+        return float(self.data[i, 0]), float(self.data[i, 1])
+
+    def set(self, key, price, volume=np.nan):
+        i = self.row(key)
+        self.data[i] = (price, volume, time.time())
+
+    def set_many(self, rows, prices, volumes):
+        self.data[rows, 0] = prices
+        self.data[rows, 1] = volumes
+        self.data[rows, 2] = time.time()
+
+    def flush(self):
+        self.data.flush()
+        if self.index_dirty:
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.keys, f)
+            os.replace(tmp, self.index_path)
+            self.index_dirty = False
+
+def open_store(name, capacity=DEFAULT_CAPACITY, max_age=STATE_MAX_AGE):
+    return PriceStateStore(os.path.join(STATE_DIR, name), capacity, max_age)
@@ -0,0 +1,196 @@
+import math
+from collections import deque
+
+# === STREAMING INDICATORS ===
+# Har naye closed bar pe O(1) update. preview() abhi ban rahe (forming) bar
+# ke saath value deta hai lekin state change nahi karta.
+# Values indicators.py ke batched versions se match karti hain.
+# Jab tak warmup poora na ho, value None hoti hai.
+
+class EMA:
+    # SMA seed, phir recursive; alpha=1/period do to Wilder (RMA)
+    def __init__(self, period, alpha=None):
+        self.period = period
+        self.alpha = alpha or 2 / (period + 1)
+        self.count = 0
+        self.total = 0.0
+        self.value = None
+
+    def compute(self, x):
+        count, total, value = self.count + 1, self.total, self.value
+        if count <= self.period:
+            total += x
+            if count == self.period:
+                value = total / self.period
+        else:
+            value += self.alpha * (x - value)
+        return count, total, value
+
+    def update(self, x):
+        self.count, self.total, self.value = self.compute(x)
+        return self.value
+
+    def preview(self, x):
+        return self.compute(x)[2]
+
+class RSI:
+    def __init__(self, period=14):
+        self.gain = EMA(period, 1 / period)
+        self.loss = EMA(period, 1 / period)
+        self.prev_close = None
+        self.value = None
+
+    def compute(self, close):
+        if self.prev_close is None:
+            return None, None, None
+        delta = close - self.prev_close
+        gain = self.gain.compute(max(delta, 0.0))
+        loss = self.loss.compute(max(-delta, 0.0))
+        if gain[2] is None:
+            return gain, loss, None
+        if loss[2] == 0:
+            return gain, loss, 100.0
+        return gain, loss, 100 - 100 / (1 + gain[2] / loss[2])
+
+    def update(self, close):
+        gain, loss, value = self.compute(close)
+        if gain is not None:
+            self.gain.count, self.gain.total, self.gain.value = gain
+            self.loss.count, self.loss.total, self.loss.value = loss
+        self.prev_close = close
+        self.value = value
+        return value
+
+    def preview(self, close):
+        return self.compute(close)[2]
+
+class MACD:
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = None
+
+    def compute(self, close):
+        fast, slow = self.fast.compute(close), self.slow.compute(close)
+        if fast[2] is None or slow[2] is None:
+            return fast, slow, None, None
+        line = fast[2] - slow[2]
+        signal = self.signal.compute(line)
+        if signal[2] is None:
+            return fast, slow, signal, (line, None, None)
+        return fast, slow, signal, (line, signal[2], line - signal[2])
+
+    def update(self, close):
+        fast, slow, signal, value = self.compute(close)
+        self.fast.count, self.fast.total, self.fast.value = fast
+        self.slow.count, self.slow.total, self.slow.value = slow
+        if signal is not None:
+            self.signal.count, self.signal.total, self.signal.value = signal
+        self.value = value
+        return value
+
+    def preview(self, close):
+        return self.compute(close)[3]
+
+class ATR:
+    def __init__(self, period=14):
+        self.tr = EMA(period, 1 / period)
+        self.prev_close = None
+        self.value = None
+
+    def true_range(self, high, low):
+        if self.prev_close is None:
+            return high - low
+        return max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def update(self, high, low, close):
+        self.value = self.tr.update(self.true_range(high, low))
+        self.prev_close = close
+        return self.value
+
+    def preview(self, high, low, close):
+        return self.tr.preview(self.true_range(high, low))
+
+class PandasEWM:
+    # pandas ewm(com=com, adjust=True).mean() ka ek-ek value wala version
+    def __init__(self, com):
+        self.alpha = 1 / (1 + com)
+        self.weighted = None
+        self.old_wt = 1.0
+
+    def compute(self, x):
+        weighted, old_wt = self.weighted, self.old_wt
+        observed = x is not None and not math.isnan(x)
+        if weighted is not None:
+            old_wt *= 1 - self.alpha
+            if observed:
+                weighted = (old_wt * weighted + x) / (old_wt + 1)
+                old_wt += 1
+        elif observed:
+            weighted = x
+        return weighted, old_wt
+
+    def update(self, x):
+        self.weighted, self.old_wt = self.compute(x)
+        return self.weighted
+
+    def preview(self, x):
+        return self.compute(x)[0]
+
+class KDJ:
+    def __init__(self, length=14, com=2):
+        self.length = length
+        self.index = 0
+        self.lows = deque()   # (index, low), values badhti hui -> front = min
+        self.highs = deque()  # (index, high), values ghatti hui -> front = max
+        self.k = PandasEWM(com)
+        self.d = PandasEWM(com)
+        self.value = None
+
+    def window_extreme(self, window, value, better):
+        first = self.index - self.length + 1  # Naye bar ke saath window ki pehli index
+        best = value
+        for i, v in window:
+            if i >= first:
+                if better(v, best):
+                    best = v
+                break  # Monotonic deque: pehli valid entry hi extreme hai
+        return best
+
+    def compute(self, high, low, close):
+        rsv = math.nan
+        if self.index >= self.length - 1:
+            low_min = self.window_extreme(self.lows, low, lambda a, b: a < b)
+            high_max = self.window_extreme(self.highs, high, lambda a, b: a > b)
+            if high_max != low_min:
+                rsv = (close - low_min) / (high_max - low_min) * 100
+        k = self.k.compute(rsv)
+        d = self.d.compute(k[0])
+        if k[0] is None or d[0] is None:
+            return k, d, None
+        return k, d, (k[0], d[0], 3 * k[0] - 2 * d[0])
+
+    def update(self, high, low, close):
+        k, d, value = self.compute(high, low, close)
+        self.k.weighted, self.k.old_wt = k
+        self.d.weighted, self.d.old_wt = d
+
+        first = self.index - self.length + 1
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((self.index, low))
+        while self.lows[0][0] < first:
+            self.lows.popleft()
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((self.index, high))
+        while self.highs[0][0] < first:
+            self.highs.popleft()
+
+        self.index += 1
+        self.value = value
+        return value
+
+    def preview(self, high, low, close):
+        return self.compute(high, low, close)[2]
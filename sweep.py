@@ -0,0 +1,250 @@
+import os
+import sys
+import csv
+import time
+import argparse
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import backtest
+from candle_store import CandleStore, CANDLE_DIR
+from resample import interval_ms
+
+# === PARALLEL PARAMETER SWEEP ===
+# Ek rule ke thresholds ka grid saare CPU cores pe backtest karta hai.
+# Candles aur params-independent indicators (backtest features) parent ek dafa
+# bana kar shared memory mein rakhta hai, workers sirf attach karte hain (koi pickling nahi).
+# Har (direction, tp, sl) ka per-bar outcome worker mein cache hota hai, phir har
+# combo sirf apne entries mask se us pe reduce karta hai.
+#
+#   python sweep.py --rule liq_atr
+#   python sweep.py --rule scalp_rsi --grid rsi_min=70,75,80,85 --grid tp=0.003,0.005,0.01
+#   python sweep.py --rule trade_spike --synthetic 200x20000 --top 20 --csv sweep.csv
+OUTCOME_CACHE = 8   # Worker mein kitne (direction, tp, sl) outcome matrices
+TOP = 25
+MIN_SIGNALS = 30    # Is se kam signals wale combos ranking mein neeche
+RESULT_COLUMNS = ["signals", "per_symbol_day", "hit_rate", "tp_hits", "sl_hits", "avg_pnl", "total_pnl"]
+
+GRIDS = {
+    "liq_atr": {
+        "rsi_overbought": [75, 80, 85, 90, 95],
+        "rsi_oversold": [5, 10, 15, 20, 25],
+        "atr_multiplier": [0.5, 1.0, 1.5, 2.0, 2.5, 3.0],
+        "volume_multiplier": [1.0, 1.5, 2.0, 2.5, 3.0, 4.0],
+    },
+    "scalp_rsi": {
+        "rsi_min": [70, 75, 80, 85, 90],
+        "j_min": [80, 90, 100, 110],
+        "volume_ratio": [0, 1.0, 1.5, 2.0, 3.0],
+        "tp": [0.003, 0.005, 0.0075, 0.01],
+        "sl": [0.003, 0.005, 0.0075, 0.01],
+    },
+    "rsi_kdj": {
+        "rsi_min": [30, 50, 60, 70, 80],
+        "j_min": [5, 50, 80, 100],
+        "volume_ratio": [0, 1.0, 1.5, 2.0, 3.0],
+        "tp": [0.003, 0.005, 0.0075, 0.01],
+        "sl": [0.003, 0.005, 0.0075, 0.01],
+    },
+    "low_short": {
+        "rsi_min": [65, 70, 75, 80, 85],
+        "wick_min": [0.25, 0.5, 0.75, 1.0],
+        "wick_max": [1.0, 1.5, 2.0, 3.0],
+    },
+    "ashu": {
+        "rsi_long": [15, 20, 25, 30],
+        "rsi_short": [70, 75, 80, 85],
+    },
+    "trade_spike": {
+        "price_change_threshold": [1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 7.5, 10.0],
+        "tp": [None, 0.01, 0.02],
+        "sl": [None, 0.01, 0.02],
+    },
+}
+
+# --- Shared memory ---
+
+def share(arrays):
+    blocks, specs = [], {}
+    for name, a in arrays.items():
+        a = np.ascontiguousarray(a)
+        block = shared_memory.SharedMemory(create=True, size=max(1, a.nbytes))
+        np.ndarray(a.shape, a.dtype, buffer=block.buf)[...] = a
+        blocks.append(block)
+        specs[name] = (block.name, a.shape, a.dtype.str)
+    return blocks, specs
+
+def attach(specs):
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+    return blocks, arrays
+
+# --- Worker ---
+
+WORKER = {}
+
+def init_worker(specs, rule, horizon, fee, symbol_days):
+    blocks, arrays = attach(specs)
+    WORKER.update(
+        blocks=blocks,
+        candles={k: v for k, v in arrays.items() if not k.startswith("f:")},
+        features={k[2:]: v for k, v in arrays.items() if k.startswith("f:")},
+        rule=rule, horizon=horizon, fee=fee, symbol_days=symbol_days, outcomes={},
+    )
+
+def outcomes_for(direction, tp, sl):
+    cache = WORKER["outcomes"]
+    key = (direction, tp, sl)
+    if key not in cache:
+        if len(cache) >= OUTCOME_CACHE:
+            cache.pop(next(iter(cache)))
+        c = WORKER["candles"]
+        cache[key] = backtest.bar_outcomes(c["high"], c["low"], c["close"], direction, tp, sl,
+                                           WORKER["horizon"], WORKER["fee"])
+    return cache[key]
+
+def evaluate(params):
+    p = dict(backtest.RULES[WORKER["rule"]]["params"], **params)
+    pnl, outcome = [], []
+    for leg, entries, direction, tp, sl in backtest.RULES[WORKER["rule"]]["signals"](WORKER["candles"], WORKER["features"], p):
+        leg_pnl, leg_outcome = outcomes_for(direction, tp, sl)
+        mask = entries & ~np.isnan(leg_pnl)
+        pnl.append(leg_pnl[mask])
+        outcome.append(leg_outcome[mask])
+    pnl, outcome = np.concatenate(pnl), np.concatenate(outcome)
+    n = len(pnl)
+    return dict(params, **{
+        "signals": n,
+        "per_symbol_day": n / WORKER["symbol_days"] if WORKER["symbol_days"] else 0.0,
+        "hit_rate": float((pnl > 0).mean()) if n else float("nan"),
+        "tp_hits": int((outcome == 1).sum()),
+        "sl_hits": int((outcome == -1).sum()),
+        "avg_pnl": float(pnl.mean()) if n else float("nan"),
+        "total_pnl": float(pnl.sum()),
+    })
+
+# --- Grid ---
+
+def parse_value(text):
+    if text.lower() == "none":
+        return None
+    number = float(text)
+    return int(number) if number.is_integer() and "." not in text else number
+
+def build_grid(rule, overrides):
+    grid = dict(GRIDS.get(rule, {}))
+    for item in overrides:
+        key, _, values = item.partition("=")
+        if key not in backtest.RULES[rule]["params"]:
+            raise ValueError(f"Unknown parameter for {rule}: {key}")
+        grid[key] = [parse_value(v) for v in values.split(",") if v]
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    # Same tp/sl wale combos saath rakho taake worker ka outcome cache kaam aaye
+    combos.sort(key=lambda p: (str(p.get("tp")), str(p.get("sl"))))
+    return keys, combos
+
+def rank(results, sort_by, min_signals=MIN_SIGNALS):
+    def key(row):
+        value = row[sort_by]
+        enough = row["signals"] >= min_signals
+        return (enough, -np.inf if value != value else value)
+    return sorted(results, key=key, reverse=True)
+
+def print_table(keys, rows, top):
+    header = keys + RESULT_COLUMNS
+    print("  ".join(f"{h:>14}" for h in header))
+    for row in rows[:top]:
+        cells = []
+        for h in header:
+            value = row[h]
+            if h in ("hit_rate", "avg_pnl", "total_pnl") and value == value:
+                cells.append(f"{value * 100:>13.3f}%")
+            elif isinstance(value, float):
+                cells.append(f"{value:>14.4g}")
+            else:
+                cells.append(f"{str(value):>14}")
+        print("  ".join(cells))
+
+def write_csv(path, keys, rows):
+    header = keys + RESULT_COLUMNS
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=header)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def load(args, exchange, interval):
+    if args.synthetic:
+        count, bars = (int(x) for x in args.synthetic.lower().split("x"))
+        batches = backtest.synthetic_batches(count, bars, interval, batch=count)
+    else:
+        store = CandleStore(args.store)
+        source = args.source_interval or interval
+        symbols = args.symbols.split(",") if args.symbols else store.symbols(exchange, source)
+        batches = backtest.load_batches(store, exchange, interval, source, symbols, batch=max(1, len(symbols)))
+    for _, c in batches:
+        if args.bars:
+            c = {k: v[:, -args.bars:] for k, v in c.items()}
+        return c
+    return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel threshold sweep over stored candles")
+    parser.add_argument("--rule", required=True, choices=list(backtest.RULES))
+    parser.add_argument("--grid", action="append", default=[], help="param=v1,v2,... (repeatable, default grid ko override)")
+    parser.add_argument("--exchange", help="Override rule default exchange")
+    parser.add_argument("--interval", help="Override rule default interval")
+    parser.add_argument("--source-interval", help="Stored interval to resample from (default: --interval)")
+    parser.add_argument("--symbols", help="Comma separated, default: sab stored symbols")
+    parser.add_argument("--bars", type=int, help="Sirf aakhri itni candles per symbol")
+    parser.add_argument("--horizon", type=int, default=backtest.HORIZON)
+    parser.add_argument("--fee", type=float, default=0.0, help="Per side fee fraction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--sort", default="total_pnl", choices=["total_pnl", "avg_pnl", "hit_rate", "signals"])
+    parser.add_argument("--min-signals", type=int, default=MIN_SIGNALS)
+    parser.add_argument("--top", type=int, default=TOP)
+    parser.add_argument("--csv", help="Saare results is CSV mein")
+    parser.add_argument("--store", default=CANDLE_DIR)
+    parser.add_argument("--synthetic", help="SYMBOLSxBARS random walk instead of the store")
+    args = parser.parse_args(argv)
+
+    rule = backtest.RULES[args.rule]
+    exchange, interval = args.exchange or rule["exchange"], args.interval or rule["interval"]
+    keys, combos = build_grid(args.rule, args.grid)
+
+    start = time.perf_counter()
+    c = load(args, exchange, interval)
+    if c is None:
+        print(f"No {exchange} {interval} candles to sweep")
+        return
+    features = backtest.rule_features(args.rule, c, interval)
+    symbol_days = np.count_nonzero(~np.isnan(c["close"])) * interval_ms(interval) / 86_400_000
+    print(f"{args.rule}: {c['close'].shape[0]} symbols x {c['close'].shape[1]:,} bars, "
+          f"features in {time.perf_counter() - start:.1f}s, {len(combos):,} combos on {args.workers} workers")
+
+    arrays = dict(c, **{f"f:{k}": v for k, v in features.items()})
+    blocks, specs = share(arrays)
+    del c, features, arrays
+    try:
+        chunksize = max(1, len(combos) // (args.workers * 8))
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                 initargs=(specs, args.rule, args.horizon, args.fee, symbol_days)) as pool:
+            results = list(pool.map(evaluate, combos, chunksize=chunksize))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    ranked = rank(results, args.sort, args.min_signals)
+    print(f"Swept {len(combos):,} combos in {time.perf_counter() - start:.1f}s\n")
+    print_table(keys, ranked, args.top)
+    if args.csv:
+        write_csv(args.csv, keys, ranked)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,114 @@
+import os
+import time
+import http_client
+
+# === SYMBOL REGISTRY ===
+# Har (exchange, market) ki symbol list ek hi jagah, hash index ke saath.
+# Lists har scan pe dobara nahi aati, sirf SYMBOL_TTL guzarne pe refresh hoti hain.
+SYMBOL_TTL = int(os.getenv("SYMBOL_TTL", 3600))
+SUFFIXES = ("_SPBL", "_UMCBL", "_DMCBL", "_CMCBL")
+
+def normalize_symbol(symbol):
+    # "BTCUSDT_UMCBL", "BTC_USDT", "btc-usdt" sab "BTCUSDT" ban jate hain
+    symbol = symbol.upper()
+    for suffix in SUFFIXES:
+        if symbol.endswith(suffix):
+            symbol = symbol[:-len(suffix)]
+            break
+    return symbol.replace("_", "").replace("-", "").replace("/", "")
+
+class SymbolRegistry:
+    def __init__(self, ttl=SYMBOL_TTL):
+        self.ttl = ttl
+        self.loaders = {}   # (exchange, market) -> (loader, ttl)
+        self.tables = {}    # (exchange, market) -> {normalized: info}
+        self.loaded_at = {}
+        self.index = {}     # (exchange, normalized) -> {market: info}
+
+    def register_loader(self, exchange, market, loader, ttl=None):
+        # loader() -> list of dicts, har dict mein exchange wala "symbol"
+        self.loaders[(exchange, market)] = (loader, ttl or self.ttl)
+
+    def refresh(self, exchange, market, force=False):
+        key = (exchange, market)
+        loader, ttl = self.loaders[key]
+        if not force and key in self.tables and time.time() - self.loaded_at[key] < ttl:
+            return
+        try:
+            items = loader()
+        except Exception as e:
+            print(f"Symbol fetch error ({exchange} {market}): {e}")
+            items = None
+        if not items:
+            return  # Purani list rakho, khali list se scan band nahi hona chahiye
+
+        for name in self.tables.get(key, {}):
+            self.index.get((exchange, name), {}).pop(market, None)
+        table = {}
+        for item in items:
+            name = normalize_symbol(item["symbol"])
+            table[name] = item
+            self.index.setdefault((exchange, name), {})[market] = item
+        self.tables[key] = table
+        self.loaded_at[key] = time.time()
+
+    def table(self, exchange, market):
+        self.refresh(exchange, market)
+        return self.tables.get((exchange, market), {})
+
+    def names(self, exchange, market, where=None):
+        return [name for name, info in self.table(exchange, market).items() if where is None or where(info)]
+
+    def symbols(self, exchange, market, where=None):
+        # Exchange ka apna format (BTC_USDT, BTCUSDT_UMCBL ...)
+        return [info["symbol"] for info in self.table(exchange, market).values() if where is None or where(info)]
+
+    def listings(self, exchange, markets):
+        # Har (market, symbol) ek dafa; jo symbol dono markets mein hai woh dono mein aata hai
+        return [(market, name) for market in markets for name in self.table(exchange, market)]
+
+    def has(self, exchange, market, symbol):
+        return normalize_symbol(symbol) in self.table(exchange, market)
+
+    def info(self, exchange, market, symbol):
+        return self.table(exchange, market).get(normalize_symbol(symbol))
+
+    def raw(self, exchange, market, symbol):
+        info = self.info(exchange, market, symbol)
+        return info["symbol"] if info else None
+
+    def markets_for(self, exchange, symbol):
+        return set(self.index.get((exchange, normalize_symbol(symbol)), {}))
+
+def load_bitget_spot():
+    data = http_client.get("https://api.bitget.com/api/spot/v1/public/symbols").json()
+    return data["data"]
+
+def load_bitget_futures():
+    data = http_client.get("https://api.bitget.com/api/mix/v1/market/contracts?productType=umcbl").json()
+    return data["data"]
+
+def load_mexc_spot():
+    data = http_client.get("https://api.mexc.com/api/v3/exchangeInfo").json()
+    return [s for s in data["symbols"] if s["quoteAsset"] == "USDT"]
+
+def load_mexc_futures():
+    data = http_client.get("https://contract.mexc.com/api/v1/contract/detail").json()
+    return [s for s in data["data"] if s["quoteCoin"] == "USDT"]
+
+def load_mexc_spot_tickers():
+    data = http_client.get("https://api.mexc.com/api/v3/ticker/24hr").json()
+    return [s for s in data if s["symbol"].endswith("USDT")]
+
+def load_mexc_futures_tickers():
+    data = http_client.get("https://contract.mexc.com/api/v1/ticker").json()
+    return [s for s in data["data"] if s["quoteCoin"] == "USDT"]
+
+registry = SymbolRegistry()
+registry.register_loader("bitget", "spot", load_bitget_spot)
+registry.register_loader("bitget", "futures", load_bitget_futures)
+registry.register_loader("mexc", "spot", load_mexc_spot)
+registry.register_loader("mexc", "futures", load_mexc_futures)
+# Volume filter / priority tiers ke liye tickers, is liye TTL chhota
+registry.register_loader("mexc", "futures-ticker", load_mexc_futures_tickers, ttl=300)
+registry.register_loader("mexc", "spot-ticker", load_mexc_spot_tickers, ttl=300)
@@ -0,0 +1,67 @@
+import json
+import alert_dedup
+from alert_dedup import AlertDedup
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_cooldown_expires(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(alert_dedup.time, "time", clock)
+    dedup = AlertDedup(path=None)
+    assert dedup.allow("rsi", "BTCUSDT", "long", "5m", cooldown=60)
+    assert not dedup.allow("rsi", "BTCUSDT", "long", "5m", cooldown=60)
+    # Direction / timeframe alag = alag key
+    assert dedup.allow("rsi", "BTCUSDT", "short", "5m", cooldown=60)
+    assert dedup.allow("rsi", "BTCUSDT", "long", "15m", cooldown=60)
+    assert dedup.suppressed == 1
+    clock.now += 61
+    assert dedup.allow("rsi", "BTCUSDT", "long", "5m", cooldown=60)
+
+def test_default_cooldown_from_timeframe(monkeypatch):
+    monkeypatch.setattr(alert_dedup, "ALERT_COOLDOWN", None)
+    assert alert_dedup.cooldown_for("5m") == alert_dedup.COOLDOWN_BARS * 300
+    assert alert_dedup.cooldown_for("???") == alert_dedup.DEFAULT_COOLDOWN
+
+def test_eviction_drops_expired_then_oldest(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(alert_dedup.time, "time", clock)
+    dedup = AlertDedup(path=None, max_keys=3)
+    dedup.allow("s", "A", "long", "5m", cooldown=10)
+    dedup.allow("s", "B", "long", "5m", cooldown=1000)
+    dedup.allow("s", "C", "long", "5m", cooldown=1000)
+    clock.now += 20  # A expire
+    dedup.allow("s", "D", "long", "5m", cooldown=1000)
+    assert set(dedup.expires) == {AlertDedup.key("s", x, "long", "5m") for x in "BCD"}
+    dedup.allow("s", "E", "long", "5m", cooldown=1000)  # Koi expired nahi, LRU (B) nikalta hai
+    assert len(dedup) == 3
+    assert AlertDedup.key("s", "B", "long", "5m") not in dedup.expires
+    assert not dedup.allow("s", "C", "long", "5m", cooldown=1000)
+
+def test_save_merges_other_processes(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(alert_dedup.time, "time", clock)
+    path = tmp_path / "alert_dedup.json"
+    other = AlertDedup.key("other", "ETHUSDT", "short", "1h")
+    shared = AlertDedup.key("s", "BTCUSDT", "long", "5m")
+    expired = AlertDedup.key("old", "XRPUSDT", "long", "5m")
+    path.write_text(json.dumps({other: clock.now + 500, shared: clock.now + 900, expired: clock.now - 1}))
+
+    dedup = AlertDedup(path=str(path))
+    assert not dedup.allow("s", "BTCUSDT", "long", "5m", cooldown=100)  # File se load hua
+    dedup.expires[shared] = clock.now + 100  # Is process ki purani expiry file wali ko chhota na kare
+    dedup.allow("s", "SOLUSDT", "long", "5m", cooldown=100)
+    dedup.save()
+
+    saved = json.loads(path.read_text())
+    assert saved[other] == clock.now + 500
+    assert saved[shared] == clock.now + 900
+    assert saved[AlertDedup.key("s", "SOLUSDT", "long", "5m")] == clock.now + 100
+    assert expired not in saved
+
+    # Restart ke baad bhi cooldown
+    assert not AlertDedup(path=str(path)).allow("s", "SOLUSDT", "long", "5m", cooldown=100)
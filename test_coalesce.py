@@ -0,0 +1,79 @@
+import time
+import asyncio
+import threading
+import pytest
+import coalesce
+from coalesce import Coalescer
+
+def test_concurrent_callers_share_one_fetch():
+    coalescer = Coalescer(ttl=0)
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return [1, 2, 3]
+
+    def caller():
+        results.append(coalescer.get("BTCUSDT", fetch))
+
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while coalescer.shared < 7 and time.monotonic() < deadline:
+        time.sleep(0.001)  # Baaki sab owner ke Future pe ruk jayen
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert results == [[1, 2, 3]] * 8
+
+def test_ttl_reuse_and_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(coalesce.time, "monotonic", lambda: now[0])
+    coalescer = Coalescer(ttl=2)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return [len(calls)]
+
+    assert coalescer.get("k", fetch) == [1]
+    now[0] += 1.5
+    assert coalescer.get("k", fetch) == [1]  # TTL ke andar, fetch nahi
+    now[0] += 1
+    assert coalescer.get("k", fetch) == [2]
+    assert len(calls) == 2
+
+def test_failures_not_cached():
+    coalescer = Coalescer(ttl=60)
+
+    def broken():
+        raise ValueError("boom")
+
+    assert coalescer.get("k", lambda: None) is None
+    assert coalescer.get("k", lambda: []) == []
+    with pytest.raises(ValueError):
+        coalescer.get("k", broken)
+    assert coalescer.get("k", lambda: [7]) == [7]
+    assert not coalescer.inflight
+
+def test_async_callers_share_one_fetch():
+    coalescer = Coalescer(ttl=0)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [42]
+
+    async def main():
+        return await asyncio.gather(*(coalescer.get_async("k", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == [[42]] * 5
+    assert len(calls) == 1 and coalescer.shared == 4
@@ -0,0 +1,41 @@
+from digest import Digest, MAX_MESSAGE
+
+def test_ranked_by_score_and_cut_at_top():
+    sent = []
+    digest = Digest("📉 Signals", sent.append, top=3, enabled=True)
+    for i in range(5):
+        digest.add(i, f"SYM{i}")
+    assert digest.flush() == 1
+    assert len(digest) == 0
+    lines = sent[0].split("\n")
+    assert lines[0].startswith("📉 Signals | 5 signals | ")
+    assert lines[2:] == ["SYM4", "SYM3", "SYM2", "... +2 more"]
+
+def test_split_under_telegram_limit():
+    sent = []
+    digest = Digest("Big", sent.append, top=1000, enabled=True)
+    for i in range(300):
+        digest.add(-i, f"{i:03d} " + "x" * 60)
+    count = digest.flush()
+    assert count == len(sent) > 1
+    assert all(len(message) <= MAX_MESSAGE for message in sent)
+    assert sent[0].split("\n")[0].endswith(f"(1/{count})")
+    # Sab lines, order ke saath, koi gum nahi
+    body = [line for message in sent for line in message.split("\n")[2:]]
+    assert [line[:3] for line in body] == [f"{i:03d}" for i in range(300)]
+
+def test_overlong_line_truncated():
+    sent = []
+    digest = Digest("Long", sent.append, enabled=True)
+    digest.add(1, "y" * 10000)
+    digest.flush()
+    assert len(sent) == 1 and len(sent[0]) <= MAX_MESSAGE
+    assert sent[0].endswith("...")
+
+def test_disabled_sends_each_message():
+    sent = []
+    digest = Digest("Off", sent.append, enabled=False)
+    digest.add(1, "line", "full message")
+    digest.add(2, "only line")
+    assert sent == ["full message", "only line"]
+    assert digest.flush() == 0
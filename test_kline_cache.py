@@ -0,0 +1,47 @@
+import json
+import time
+from candles import parse_mexc_contract
+from kline_cache import KlineCache
+
+# MEXC contract kline ka asli shape: columns, time seconds mein
+def contract_payload(start_sec, count, step=300):
+    times = [start_sec + i * step for i in range(count)]
+    return json.dumps({
+        "success": True,
+        "code": 0,
+        "data": {
+            "time": times,
+            "open": [1.0 + i for i in range(count)],
+            "high": [2.0 + i for i in range(count)],
+            "low": [0.5 + i for i in range(count)],
+            "close": [1.5 + i for i in range(count)],
+            "vol": [10.0 * (i + 1) for i in range(count)],
+            "amount": [100.0] * count,
+        },
+    }).encode()
+
+def test_contract_payload_through_cache():
+    base = int(time.time()) // 300 * 300 - 4 * 300  # Aakhri bar abhi wali, warna cache stale samjhe
+    starts = []
+
+    def fetch(start):
+        starts.append(start)
+        if start is None:
+            return parse_mexc_contract(contract_payload(base, 5)).rows()
+        # Incremental: last cached bar (update hua) + ek nayi bar
+        assert start == (base + 4 * 300) * 1000
+        payload = json.loads(contract_payload(base + 4 * 300, 2))
+        payload["data"]["close"][0] = 99.0
+        return parse_mexc_contract(json.dumps(payload)).rows()
+
+    cache = KlineCache(size=10, store=None)
+    cache.coalescer.ttl = 0
+    rows = cache.get("mexc", "BTC_USDT", "5m", fetch)
+    assert len(rows) == 5
+    assert rows[0][0] == base * 1000  # ms mein
+    assert rows[-1][5] == 50.0
+
+    rows = cache.get("mexc", "BTC_USDT", "5m", fetch)
+    assert starts == [None, (base + 4 * 300) * 1000]
+    assert [int(r[0]) for r in rows] == [(base + i * 300) * 1000 for i in range(6)]
+    assert rows[4][4] == 99.0  # Forming candle replace hui
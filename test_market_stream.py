@@ -0,0 +1,123 @@
+import json
+import asyncio
+import websockets
+import market_stream
+from market_stream import MarketStream, BitgetProtocol, MexcProtocol, subscriptions_for
+
+# Local stand-in server: BITGET_WS_URL / MEXC_WS_URL ki jagah ws://127.0.0.1:<port>
+async def serve(handler):
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}"
+
+async def stream_until(stream, done, timeout=10):
+    task = asyncio.create_task(stream.run())
+    try:
+        await asyncio.wait_for(done.wait(), timeout)
+    finally:
+        stream.stop()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+def test_subscribe_and_resubscribe_in_batches(monkeypatch):
+    monkeypatch.setattr(market_stream, "SUBSCRIBE_BATCH", 2)
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "DOGEUSDT"]
+    connections = []  # Har connection pe aaye subscribe messages
+
+    async def main():
+        done = asyncio.Event()
+
+        async def handler(ws):
+            messages = []
+            connections.append(messages)
+            while sum(len(m["args"]) for m in messages) < len(symbols):
+                messages.append(json.loads(await ws.recv()))
+            if len(connections) == 1:
+                await ws.close()  # Server side se band, client ko reconnect karna chahiye
+            else:
+                done.set()
+                await ws.wait_closed()
+
+        server, url = await serve(handler)
+        try:
+            stream = MarketStream(BitgetProtocol(url), subscriptions_for("ticker", "spot", symbols), lambda event: None)
+            await stream_until(stream, done)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
+    assert len(connections) == 2
+    for messages in connections:
+        assert [len(m["args"]) for m in messages] == [2, 2, 1]
+        assert all(m["op"] == "subscribe" for m in messages)
+        assert [arg["instId"] for m in messages for arg in m["args"]] == symbols
+
+def run_pushes(protocol_cls, subs, pushes, count):
+    events = []
+
+    async def main():
+        done = asyncio.Event()
+
+        async def handler(ws):
+            await ws.recv()  # Subscribe
+            for push in pushes:
+                await ws.send(json.dumps(push))
+            await ws.wait_closed()
+
+        def on_event(event):
+            events.append(event)
+            if len(events) >= count:
+                done.set()
+
+        server, url = await serve(handler)
+        try:
+            await stream_until(MarketStream(protocol_cls(url), subs, on_event), done)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
+    return events
+
+def test_bitget_pushes_reach_handler():
+    subs = (subscriptions_for("ticker", "spot", ["BTCUSDT"]) + subscriptions_for("candle1m", "futures", ["BTCUSDT"])
+            + subscriptions_for("depth", "futures", ["ETHUSDT"]))
+    pushes = [
+        {"arg": {"instType": "SPOT", "channel": "ticker", "instId": "BTCUSDT"},
+         "data": [{"lastPr": "100.5", "bidPr": "100.4", "askPr": "100.6", "baseVolume": "1234", "ts": "1700000000000"}]},
+        {"arg": {"instType": "USDT-FUTURES", "channel": "candle1m", "instId": "BTCUSDT"},
+         "data": [["1700000040000", "100", "101", "99", "100.5", "12.5", "1250", "1250"]]},
+        {"arg": {"instType": "USDT-FUTURES", "channel": "books5", "instId": "ETHUSDT"},
+         "data": [{"bids": [["2000.1", "3"], ["2000", "5"]], "asks": [["2000.2", "1"]], "ts": "1700000000001"}]},
+    ]
+    ticker, candle, depth = run_pushes(BitgetProtocol, subs, pushes, 3)
+
+    assert (ticker.kind, ticker.market, ticker.symbol) == ("ticker", "spot", "BTCUSDT")
+    assert ticker.data == {"price": 100.5, "bid": 100.4, "ask": 100.6, "volume": 1234.0, "ts": 1700000000000}
+    assert (candle.kind, candle.market) == ("candle1m", "futures")
+    assert candle.data["row"] == [1700000040000, 100.0, 101.0, 99.0, 100.5, 12.5]
+    assert (depth.kind, depth.market, depth.symbol) == ("depth", "futures", "ETHUSDT")
+    assert depth.data["bids"] == [[2000.1, 3.0], [2000.0, 5.0]]
+    assert depth.data["asks"] == [[2000.2, 1.0]]
+
+def test_mexc_pushes_reach_handler():
+    subs = (subscriptions_for("ticker", "spot", ["BTCUSDT"]) + subscriptions_for("candle5m", "spot", ["BTCUSDT"])
+            + subscriptions_for("depth", "spot", ["BTCUSDT"]))
+    pushes = [
+        {"c": "spot@public.bookTicker.v3.api@BTCUSDT", "s": "BTCUSDT", "t": 1700000000000,
+         "d": {"b": "100", "B": "2", "a": "102", "A": "1"}},
+        {"c": "spot@public.kline.v3.api@BTCUSDT@Min5", "s": "BTCUSDT", "t": 1700000000000,
+         "d": {"k": {"t": 1700000100, "o": "100", "h": "103", "l": "99", "c": "101", "v": "42", "i": "Min5"}}},
+        {"c": "spot@public.limit.depth.v3.api@BTCUSDT@5", "s": "BTCUSDT", "t": 1700000000001,
+         "d": {"bids": [{"p": "100", "v": "2"}], "asks": [{"p": "102", "v": "1"}]}},
+    ]
+    ticker, candle, depth = run_pushes(MexcProtocol, subs, pushes, 3)
+
+    assert (ticker.kind, ticker.symbol, ticker.data["price"]) == ("ticker", "BTCUSDT", 101.0)
+    assert candle.kind == "candle5m"
+    assert candle.data["row"] == [1700000100000, 100.0, 103.0, 99.0, 101.0, 42.0]
+    assert depth.data["bids"] == [[100.0, 2.0]] and depth.data["asks"] == [[102.0, 1.0]]
@@ -0,0 +1,74 @@
+import pytest
+import rate_limit
+from rate_limit import TokenBucket, RateLimiter, parse_retry_after
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+def test_burst_then_wait(clock):
+    bucket = TokenBucket(10, 5)
+    capacity = 5 * rate_limit.SAFETY
+    waits = [bucket.reserve() for _ in range(int(capacity))]
+    assert waits == [0.0] * int(capacity)
+    # Bucket khali: agla token rate ke hisaab se
+    assert bucket.reserve() == pytest.approx((1 - (capacity - int(capacity))) / bucket.rate)
+    clock[0] += 10
+    assert bucket.reserve() == 0.0
+
+def test_aimd_backoff_and_recovery(clock):
+    bucket = TokenBucket(10, 10)
+    max_rate = bucket.max_rate
+    bucket.limited()
+    assert bucket.rate == pytest.approx(max_rate * rate_limit.DECREASE)
+    bucket.limited()
+    assert bucket.rate == pytest.approx(max_rate * rate_limit.DECREASE ** 2)
+    for _ in range(20):
+        bucket.limited()
+    assert bucket.rate == pytest.approx(max_rate * rate_limit.MIN_FRACTION)  # Floor
+
+    steps = 0
+    while bucket.rate < max_rate:
+        bucket.ok()
+        steps += 1
+    assert bucket.rate == max_rate
+    assert steps == pytest.approx((1 - rate_limit.MIN_FRACTION) / rate_limit.INCREASE, abs=1)
+
+def test_retry_after_pauses_bucket(clock):
+    bucket = TokenBucket(10, 10)
+    bucket.limited(retry_after=7)
+    assert bucket.reserve() == pytest.approx(7)
+    clock[0] += 7
+    assert bucket.reserve() < 7
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+def test_endpoint_groups_and_weights(clock):
+    limiter = RateLimiter()
+    kline_a, _ = limiter.match("https://contract.mexc.com/api/v1/contract/kline/BTC_USDT?interval=Min5")
+    kline_b, _ = limiter.match("https://contract.mexc.com/api/v1/contract/kline/ETH_USDT")
+    depth, _ = limiter.match("https://contract.mexc.com/api/v1/contract/depth/BTC_USDT")
+    assert kline_a is kline_b and depth is not kline_a
+    spot_a, weight = limiter.match("https://api.mexc.com/api/v3/ticker/24hr")
+    assert weight == 40
+    assert limiter.match("https://api.mexc.com/api/v3/ticker/24hr", {"symbol": "BTCUSDT"})[1] == 1
+    spot_b, _ = limiter.match("https://api.mexc.com/api/v3/klines")
+    assert spot_a is not spot_b  # Spot pe har path ka apna bucket
+    assert limiter.match("https://example.com/x") == (None, 0)
+
+def test_feedback_limits_on_status_and_body_code(clock):
+    limiter = RateLimiter()
+    url = "https://api.bitget.com/api/v2/mix/market/candles"
+    bucket, _ = limiter.match(url)
+    assert limiter.feedback(url, 200) is False
+    assert limiter.feedback(url, 429, retry_after="2") is True
+    assert bucket.rate == pytest.approx(bucket.max_rate * rate_limit.DECREASE)
+    assert bucket.paused_until == pytest.approx(clock[0] + 2)
+    assert limiter.feedback(url, 200, code="429") is True
+    assert limiter.feedback("https://example.com/x", 429) is False
@@ -0,0 +1,44 @@
+from sharding import HashRing, ShardMembership
+
+SYMBOLS = [f"COIN{i}USDT" for i in range(2000)]
+
+def owners(ring):
+    return {symbol: ring.owner(symbol) for symbol in SYMBOLS}
+
+def test_every_symbol_has_one_owner_and_spread_is_even():
+    ring = HashRing(["0", "1", "2", "3"])
+    counts = {}
+    for owner in owners(ring).values():
+        counts[owner] = counts.get(owner, 0) + 1
+    assert set(counts) == {"0", "1", "2", "3"}
+    assert min(counts.values()) > len(SYMBOLS) / 4 * 0.6
+    assert HashRing([]).owner("BTCUSDT") is None
+
+def test_join_only_moves_symbols_to_new_node():
+    before = owners(HashRing(["0", "1", "2"]))
+    after = owners(HashRing(["0", "1", "2", "3"]))
+    moved = [symbol for symbol in SYMBOLS if before[symbol] != after[symbol]]
+    assert all(after[symbol] == "3" for symbol in moved)
+    assert len(SYMBOLS) / 4 * 0.6 < len(moved) < len(SYMBOLS) / 4 * 1.4
+
+def test_leave_only_moves_departed_nodes_symbols():
+    before = owners(HashRing(["0", "1", "2", "3"]))
+    after = owners(HashRing(["0", "1", "3"]))
+    for symbol in SYMBOLS:
+        if before[symbol] != "2":
+            assert after[symbol] == before[symbol]
+        else:
+            assert after[symbol] in ("0", "1", "3")
+
+def test_ring_independent_of_node_order():
+    assert owners(HashRing(["2", "0", "1"])) == owners(HashRing(["0", "1", "2"]))
+
+def test_static_workers_partition_universe():
+    workers = [ShardMembership(workers=3, path=None, name=str(i)) for i in range(3)]
+    mine = [set(worker.mine(SYMBOLS)) for worker in workers]
+    assert set().union(*mine) == set(SYMBOLS)
+    assert sum(len(m) for m in mine) == len(SYMBOLS)
+    # Exchange ka naam format alag ho (BTC_USDT / BTCUSDT) to bhi wohi worker
+    assert workers[0].owns("COIN7_USDT") == workers[0].owns("COIN7USDT")
+    # Sharding band ho to sab symbols
+    assert ShardMembership(workers=0, path=None).mine(SYMBOLS[:5]) == SYMBOLS[:5]
@@ -1,21 +1,25 @@
-import requests
+import http_client
 import pandas as pd
+import os
 import time
-from telegram import Bot
+import notifier
 
 # MEXC API Endpoint
 MEXC_API_URL = 'https://api.mexc.com/api/v2/market/ticker'
 
 # Telegram Bot Token & Chat ID
-TELEGRAM_BOT_TOKEN = 'TOKEN'
-CHAT_ID = 'YOUR_CHAT_ID'
+TELEGRAM_BOT_TOKEN = os.getenv("TOKEN")
+CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
 # Define the percentage change for alert trigger
 PRICE_CHANGE_THRESHOLD = 2.5  # in percentage
 
+# Ek hi notifier (pooled session), har alert pe naya Bot nahi
+notify = notifier.telegram(CHAT_ID, TELEGRAM_BOT_TOKEN)
+
 # Fetch Market Data from MEXC
 def fetch_market_data():
-    response = requests.get(MEXC_API_URL)
+    response = http_client.get(MEXC_API_URL)
     if response.status_code == 200:
         data = response.json()
         return data['data']
@@ -41,8 +45,7 @@ def detect_spike(data):
 # Send Telegram Alert
 def send_telegram_alert(symbol, price_change):
     message = f"Alert: {symbol} has shown a significant price move of {price_change:.2f}%."
-    bot = Bot(token=TELEGRAM_BOT_TOKEN)
-    bot.send_message(chat_id=CHAT_ID, text=message)
+    notify.send(message)
     print(f"Alert sent: {message}")
 
 # Main Function to Monitor Market